@@ -7,9 +7,14 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from App.services.ocr_service import get_ocr_service
+from App.utils.file_fingerprint import get_file_fingerprint
+from App.utils.config import Config
 from flask import Blueprint, request
 from flask_restx import Api, Resource, fields, Namespace
+from concurrent.futures import ThreadPoolExecutor
 import os
+import stat as stat_module
+import threading
 import uuid
 from datetime import datetime
 import traceback
@@ -43,6 +48,50 @@ ocr_request_model = api.model('OCRRequest', {
     )
 })
 
+# Çoklu isim model tanımı (tek doküman, N aday isim)
+multi_name_request_model = api.model('MultiNameOCRRequest', {
+    'pdf_path': fields.String(
+        required=True,
+        description='PDF dosyasının sunucudaki tam yolu',
+        example='C:/ShareClient/...'
+    ),
+    'candidate_names': fields.List(
+        fields.String,
+        required=True,
+        description='PDF içinde aranacak aday hasta isimleri (doküman bir kez okunur)',
+        example=['Hasta Adı Soyadı', 'Diğer Hasta Adı']
+    )
+})
+
+# Roster ile hasta tespiti model tanımı (isim verilmeden)
+identify_request_model = api.model('IdentifyRequest', {
+    'pdf_path': fields.String(
+        required=True,
+        description='PDF dosyasının sunucudaki tam yolu',
+        example='C:/ShareClient/...'
+    ),
+    'min_level': fields.String(
+        description='En düşük eşleşme seviyesi (varsayılan OCR_ROSTER_MIN_LEVEL)',
+        enum=['full', 'n-1', 'pair', 'single']
+    ),
+    'limit': fields.Integer(
+        description='En fazla sonuç sayısı (varsayılan OCR_ROSTER_MAX_RESULTS, 0 = sınırsız)'
+    )
+})
+
+roster_update_model = api.model('RosterUpdate', {
+    'mode': fields.String(
+        default='add',
+        description='add: ekle, remove: çıkar, replace: listeyle eşitle, reload: OCR_ROSTER_PATH dosyasını tekrar oku',
+        enum=['add', 'remove', 'replace', 'reload']
+    ),
+    'names': fields.List(
+        fields.String,
+        description='Hasta isimleri',
+        example=['Hasta Adı Soyadı']
+    )
+})
+
 # Batch model tanımı
 batch_request_model = api.model('BatchOCRRequest', {
     'jobs': fields.List(
@@ -58,6 +107,15 @@ batch_request_model = api.model('BatchOCRRequest', {
         default='normal',
         description='Batch priority',
         enum=['low', 'normal', 'high', 'urgent']
+    ),
+    'atomic': fields.Boolean(
+        default=False,
+        description='True ise tek bir geçersiz istek tüm batch\'i reddeder (hepsi ya da hiçbiri)'
+    ),
+    'group_by_pdf': fields.Boolean(
+        description='True ise aynı PDF\'i paylaşan istekler tek çoklu isim job\'ına gruplanır '
+                    '(verilmezse OCR_BATCH_GROUP_BY_PDF). Her isim sonucu job sonucunda '
+                    'results_by_name altında döner'
     )
 })
 
@@ -77,6 +135,8 @@ class OCRSubmitBatch(Resource):
             data = request.get_json()
             jobs_data = data.get('jobs', [])
             batch_priority = data.get('priority', 'normal')
+            atomic = bool(data.get('atomic', False))
+            group_by_pdf = bool(data.get('group_by_pdf', Config.OCR_BATCH_GROUP_BY_PDF))
 
             if not jobs_data:
                 return {
@@ -107,63 +167,127 @@ class OCRSubmitBatch(Resource):
             queue_manager = get_queue_manager()
             job_ids = []
             failed_jobs = []
+            job_index_map = {}
 
-            # Her job'ı ekle
+            # Validasyon; group_by_pdf açıksa aynı PDF'i paylaşan işler tek çoklu isim işine gruplanır
+            groups = {}  # pdf_path -> [(index, searched_name), ...]
             for i, job_data in enumerate(jobs_data):
-                try:
-                    pdf_path = job_data.get('pdf_path')
-                    searched_name = job_data.get('searched_name')
-
-                    # Validasyon
-                    if not pdf_path or not searched_name:
-                        failed_jobs.append({
-                            'index': i,
-                            'error': 'pdf_path ve searched_name gerekli'
-                        })
-                        continue
-
-                    is_valid, error_msg = validate_pdf_path(pdf_path)
-                    if not is_valid:
-                        failed_jobs.append({
-                            'index': i,
-                            'error': error_msg
-                        })
-                        continue
-
-                    # Job oluştur
-                    job = OCRJob(
-                        pdf_path=pdf_path,
-                        searched_name=searched_name,
-                        priority=priority
-                    )
-
-                    # Queue'ye ekle
-                    success = queue_manager.add_job(job)
-                    if success:
-                        job_ids.append(job.job_id)
-                    else:
-                        failed_jobs.append({
-                            'index': i,
-                            'error': 'Queue\'ye eklenemedi'
-                        })
-
-                except Exception as e:
+                if not isinstance(job_data, dict):
+                    failed_jobs.append({
+                        'index': i,
+                        'error': 'Job bir nesne olmalı ({"pdf_path": ..., "searched_name": ...})'
+                    })
+                    continue
+
+                pdf_path = job_data.get('pdf_path')
+                searched_name = job_data.get('searched_name')
+
+                if not pdf_path or not searched_name:
                     failed_jobs.append({
                         'index': i,
-                        'error': str(e)
+                        'error': 'pdf_path ve searched_name gerekli'
                     })
+                    continue
+
+                if not isinstance(pdf_path, str) or not isinstance(searched_name, str):
+                    failed_jobs.append({
+                        'index': i,
+                        'error': 'pdf_path ve searched_name metin olmalı'
+                    })
+                    continue
+
+                group_key = pdf_path if group_by_pdf else (pdf_path, i)
+                groups.setdefault(group_key, []).append((i, searched_name))
+
+            # Dosyalar eşzamanlı doğrulanır (dosya başına tek stat + parmak izi)
+            prepared = prepare_pdfs_for_jobs(
+                jobs_data[group_items[0][0]]['pdf_path'] for group_items in groups.values()
+            )
+
+            # Her grup için tek job
+            new_jobs = []  # [(job, indexes)]
+            for group_items in groups.values():
+                indexes = [index for index, _ in group_items]
+                pdf_path = jobs_data[indexes[0]]['pdf_path']
+
+                is_valid, error_msg, file_fingerprint = prepared[pdf_path]
+                if not is_valid:
+                    failed_jobs.extend({'index': index, 'error': error_msg} for index in indexes)
+                    continue
+
+                candidate_names = list(dict.fromkeys(name for _, name in group_items))
+                if len(candidate_names) > Config.OCR_MULTI_NAME_MAX_CANDIDATES:
+                    failed_jobs.extend({
+                        'index': index,
+                        'error': f'Aynı PDF için maksimum {Config.OCR_MULTI_NAME_MAX_CANDIDATES} isim işlenebilir'
+                    } for index in indexes)
+                    continue
+
+                is_multi_name = len(candidate_names) > 1
+                job = OCRJob(
+                    pdf_path=pdf_path,
+                    searched_name=', '.join(candidate_names),
+                    priority=priority,
+                    file_fingerprint=file_fingerprint,
+                    candidate_names=candidate_names if is_multi_name else None
+                )
+                new_jobs.append((job, indexes))
+
+            # atomic: tek bir geçersiz istek bile varsa hiçbir job eklenmez
+            if atomic and failed_jobs:
+                new_jobs = []
+
+            # Tüm job'lar tek transaction'da (hepsi eklenir ya da hiçbiri)
+            multi_name_jobs = 0
+            add_results = queue_manager.add_jobs([job for job, _ in new_jobs])
+            for add_result, (job, indexes) in zip(add_results, new_jobs):
+                if add_result['queued']:
+                    job_ids.append(job.job_id)
+                    multi_name_jobs += int(bool(job.candidate_names))
+                    for index in indexes:
+                        job_index_map[index] = job.job_id
+                else:
+                    failed_jobs.extend({
+                        'index': index, 'error': f"Queue'ye eklenemedi: {add_result['error']}"
+                    } for index in indexes)
+
+            # İstek index'i başına sonuç
+            errors_by_index = {failure['index']: failure['error'] for failure in failed_jobs}
+            results = [{
+                'index': index,
+                'status': 'queued' if index in job_index_map else 'rejected',
+                'job_id': job_index_map.get(index),
+                'error': None if index in job_index_map else errors_by_index.get(
+                    index, 'Batch atomik olduğu için eklenmedi (diğer istekler geçersiz)')
+            } for index in range(len(jobs_data))]
+
+            if atomic and failed_jobs:
+                return {
+                    'success': False,
+                    'error': 'Batch reddedildi: hiçbir job queue\'ye eklenmedi',
+                    'data': {
+                        'failed_jobs': len(failed_jobs),
+                        'failures': failed_jobs,
+                        'results': results
+                    },
+                    'timestamp': datetime.now().isoformat()
+                }, 400
 
             return {
                 'success': True,
                 'data': {
-                    'batch_id': f"batch_{int(datetime.time())}",
+                    'batch_id': f"batch_{int(datetime.now().timestamp())}",
                     'job_ids': job_ids,
-                    'successful_jobs': len(job_ids),
+                    'job_index_map': job_index_map,
+                    'successful_jobs': len(job_index_map),
+                    'queued_jobs': len(job_ids),
+                    'multi_name_jobs': multi_name_jobs,
                     'failed_jobs': len(failed_jobs),
                     'failures': failed_jobs if failed_jobs else None,
+                    'results': results,
                     'estimated_time': f"{len(job_ids) * 3} minutes"
                 },
-                'message': f'{len(job_ids)} job başarıyla queue\'ye eklendi',
+                'message': f'{len(job_index_map)} istek {len(job_ids)} job olarak queue\'ye eklendi',
                 'timestamp': datetime.now().isoformat()
             }, 200
 
@@ -175,33 +299,113 @@ class OCRSubmitBatch(Resource):
             }, 500
 
 # ============ YARDIMCI FONKSİYONLAR ============
-def validate_pdf_path(pdf_path):
+MAX_PDF_SIZE = 50 * 1024 * 1024  # 50 MB
+
+_validation_executor = None
+_validation_executor_lock = threading.Lock()
+
+def inspect_pdf_path(pdf_path):
     """
-    PDF dosya yolunu doğrula
+    PDF dosya yolunu tek stat çağrısıyla doğrula
+
+    Okuma izni ayrıca sorgulanmaz; dosya ilk açıldığında (parmak izi / OCR) hata döner.
+
+    DÖNEN DEĞER:
+        tuple: (geçerli mi, hata mesajı, os.stat sonucu)
     """
+    if not isinstance(pdf_path, str) or not pdf_path:
+        return False, "Dosya yolu metin olmalı", None
+
     # Path traversal koruması
     if '..' in pdf_path or '~' in pdf_path:
-        return False, "Güvenlik: Geçersiz dosya yolu"
+        return False, "Güvenlik: Geçersiz dosya yolu", None
 
     # Dosya uzantısı kontrolü
     if not pdf_path.lower().endswith('.pdf'):
-        return False, "Sadece PDF dosyaları desteklenir"
+        return False, "Sadece PDF dosyaları desteklenir", None
 
-    # Dosya varlığı kontrolü
-    if not os.path.exists(pdf_path):
-        return False, f"Dosya bulunamadı: {pdf_path}"
+    # Varlık, tür ve boyut tek stat ile
+    try:
+        stat_result = os.stat(pdf_path)
+    except FileNotFoundError:
+        return False, f"Dosya bulunamadı: {pdf_path}", None
+    except PermissionError:
+        return False, "Dosya okuma izni yok", None
+    except (OSError, ValueError) as e:  # ValueError: yolda NUL karakteri
+        return False, f"Dosyaya erişilemedi: {e}", None
 
-    # Dosya okunabilirlik kontrolü
-    if not os.access(pdf_path, os.R_OK):
-        return False, "Dosya okuma izni yok"
+    if not stat_module.S_ISREG(stat_result.st_mode):
+        return False, f"Dosya bulunamadı: {pdf_path}", None
 
     # Dosya boyutu kontrolü (maksimum 50 MB)
-    file_size = os.path.getsize(pdf_path)
-    max_size = 50 * 1024 * 1024  # 50 MB
-    if file_size > max_size:
-        return False, f"Dosya çok büyük: {file_size / 1024 / 1024:.2f} MB (Max: 50 MB)"
+    if stat_result.st_size > MAX_PDF_SIZE:
+        return False, f"Dosya çok büyük: {stat_result.st_size / 1024 / 1024:.2f} MB (Max: 50 MB)", None
+
+    return True, None, stat_result
+
+def validate_pdf_path(pdf_path):
+    """
+    PDF dosya yolunu doğrula
+    """
+    is_valid, error_msg, _ = inspect_pdf_path(pdf_path)
+    return is_valid, error_msg
+
+def fingerprint_for_job(pdf_path, stat_result=None):
+    """
+    Job'a yazılacak içerik parmak izi
+    Hesaplanamazsa None (worker tekrar dener, olmazsa yol ile duplicate kontrolü yapılır)
+    """
+    try:
+        fingerprint_info = get_file_fingerprint(pdf_path, stat_result=stat_result)
+    except OSError as e:
+        print(f"⚠️ Parmak izi hesaplanamadı: {e}")
+        return None
+
+    return {
+        'fingerprint': fingerprint_info['fingerprint'],
+        'size': fingerprint_info['size'],
+        'mtime_ns': fingerprint_info['mtime_ns']
+    }
+
+def get_validation_executor():
+    """Batch dosya doğrulaması için süreç başına tek thread havuzu"""
+    global _validation_executor
+
+    with _validation_executor_lock:
+        if _validation_executor is None:
+            _validation_executor = ThreadPoolExecutor(
+                max_workers=Config.BATCH_VALIDATION_WORKERS,
+                thread_name_prefix="batch_validate"
+            )
+        return _validation_executor
+
+def prepare_pdf_for_job(pdf_path):
+    """
+    Doğrulama + parmak izi (tek stat, dosya bir kez okunur)
+
+    Hata fırlatmaz: batch'te thread havuzunda çalışır, tek bozuk girdi tüm batch'i düşürmemeli.
+    """
+    try:
+        is_valid, error_msg, stat_result = inspect_pdf_path(pdf_path)
+        if not is_valid:
+            return False, error_msg, None
+        return True, None, fingerprint_for_job(pdf_path, stat_result)
+    except Exception as e:
+        return False, f"Dosya doğrulanamadı: {e}", None
+
+def prepare_pdfs_for_jobs(pdf_paths):
+    """
+    Birden fazla PDF'i eşzamanlı doğrula (ağ paylaşımında stat / okuma gecikmeleri örtüşür)
+
+    DÖNEN DEĞER:
+        dict: pdf_path -> (geçerli mi, hata mesajı, parmak izi)
+    """
+    unique_paths = list(dict.fromkeys(pdf_paths))
+    if len(unique_paths) <= 1:
+        return {pdf_path: prepare_pdf_for_job(pdf_path) for pdf_path in unique_paths}
 
-    return True, None
+    results = get_validation_executor().map(prepare_pdf_for_job, unique_paths)
+    return dict(zip(unique_paths, results))
 
 # ============ API ENDPOINT'LERİ ============
 @ocr_ns.route('/process')
@@ -316,6 +520,105 @@ class OCRProcess(Resource):
 
 
 
+@ocr_ns.route('/process-multi')
+class OCRProcessMultiName(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/process-multi
+    METHOD: POST
+    AMAÇ: Senkron çoklu isim OCR işlemi (tek doküman, N aday isim, tek OCR geçişi)
+    """
+
+    @api.expect(multi_name_request_model)
+    def post(self):
+        """
+        PDF'i bir kez OCR ile işle, tüm aday isimlerin eşleşme seviyesini döndür
+        """
+        try:
+            data = request.get_json()
+
+            if not data:
+                return {
+                    'success': False,
+                    'error': 'Request body boş olamaz',
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            pdf_path = data.get('pdf_path')
+            candidate_names = [name for name in (data.get('candidate_names') or []) if name and name.strip()]
+
+            if not pdf_path:
+                return {
+                    'success': False,
+                    'error': "'pdf_path' alanı zorunludur",
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            if not candidate_names:
+                return {
+                    'success': False,
+                    'error': "'candidate_names' en az 1 isim içermelidir",
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            if len(candidate_names) > Config.OCR_MULTI_NAME_MAX_CANDIDATES:
+                return {
+                    'success': False,
+                    'error': f'Maksimum {Config.OCR_MULTI_NAME_MAX_CANDIDATES} aday isim işlenebilir',
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            is_valid, error_msg = validate_pdf_path(pdf_path)
+            if not is_valid:
+                return {
+                    'success': False,
+                    'error': error_msg,
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            print(f"\n{'='*60}")
+            print(f"👥 YENİ ÇOKLU İSİM OCR İSTEĞİ")
+            print(f"{'='*60}")
+            print(f"Dosya: {pdf_path}")
+            print(f"Aday İsimler: {candidate_names}")
+            print(f"{'='*60}\n")
+
+            service_result = get_ocr_service().process_pdf_multi(
+                pdf_path=pdf_path,
+                candidate_names=candidate_names
+            )
+
+            if not service_result.get('success', False):
+                return {
+                    'success': False,
+                    'error': service_result.get('error') or 'OCR service hatası',
+                    'timestamp': datetime.now().isoformat()
+                }, 500
+
+            return {
+                'success': True,
+                'data': {
+                    'best_name': service_result['best_name'],
+                    'best_level': service_result['best_level'],
+                    'ambiguous': service_result['ambiguous'],
+                    'cached_candidates': service_result['cached_candidates'],
+                    'file_fingerprint': service_result['file_fingerprint'],
+                    'results': service_result['results']
+                },
+                'message': f'{len(candidate_names)} aday isim tek OCR geçişiyle değerlendirildi',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            error_trace = traceback.format_exc()
+            print(f"❌ Çoklu isim OCR API Hatası: {str(e)}")
+            print(f"Detaylı Hata:\n{error_trace}")
+
+            return {
+                'success': False,
+                'error': f'Sunucu hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
 @ocr_ns.route('/health')
 class HealthCheck(Resource):
     """
@@ -461,7 +764,7 @@ class OCRSubmit(Resource):
                     'timestamp': datetime.now().isoformat()
                 }, 400
 
-            is_valid, error_msg = validate_pdf_path(pdf_path)
+            is_valid, error_msg, file_fingerprint = prepare_pdf_for_job(pdf_path)
             if not is_valid:
                 return {
                     'success': False,
@@ -485,7 +788,8 @@ class OCRSubmit(Resource):
                 pdf_path=pdf_path,
                 searched_name=searched_name,
                 priority=priority,
-                user_info=data.get('user_info', {})
+                user_info=data.get('user_info', {}),
+                file_fingerprint=file_fingerprint
             )
 
             # Queue'ye ekle
@@ -670,4 +974,345 @@ class QueueStats(Resource):
                 'timestamp': datetime.now().isoformat()
             }, 500
 
+@ocr_ns.route('/workers')
+class WorkerStatus(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/workers
+    METHOD: GET
+    AMAÇ: Prefork supervisor'ların yayınladığı worker durumları (pid, job, RSS, yeniden başlatma)
+    """
+
+    def get(self):
+        """Worker süreçlerinin durumunu getir"""
+        try:
+            from App.services.redis_queue_module.supervisor import get_supervisor_statuses
+
+            supervisors = get_supervisor_statuses()
+
+            return {
+                'success': True,
+                'data': {
+                    'supervisors': supervisors,
+                    'alive_workers': sum(status['alive_workers'] for status in supervisors)
+                },
+                'message': 'Worker durumları başarıyla alındı',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Worker durumu alma hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+@ocr_ns.route('/engine/stats')
+class EngineStats(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/engine/stats
+    METHOD: GET
+    AMAÇ: OCR motoru istatistikleri (handle havuzu, advanced aşama geçidi, metin cache)
+    """
+
+    def get(self):
+        """Bu süreçteki OCR motoru sayaçlarını getir"""
+        try:
+            from App.ocr.engine_pool import get_engine_pool
+            from App.ocr.cascade_gate import get_cascade_gate
+            from App.ocr.text_cache import get_text_cache
+
+            return {
+                'success': True,
+                'data': {
+                    'engine_pool': get_engine_pool().get_stats(),
+                    'cascade_gate': get_cascade_gate().get_stats(),
+                    'text_cache': get_text_cache().get_stats(),
+                    'timestamp': datetime.now().isoformat()
+                },
+                'message': 'OCR motoru istatistikleri başarıyla alındı',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Stats alma hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+@ocr_ns.route('/cache/stats')
+class ResultCacheStats(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/cache/stats
+    METHOD: GET
+    AMAÇ: Sonuç cache'i katman bazında isabet oranları + single-flight sayaçları (bu süreç)
+    """
+
+    def get(self):
+        """L1 / L2 / L3 isabet oranlarını getir"""
+        try:
+            from App.services.result_cache import get_result_cache
+            from App.services.single_flight import get_single_flight
+
+            return {
+                'success': True,
+                'data': {
+                    'result_cache': get_result_cache().get_stats(),
+                    'single_flight': get_single_flight().get_stats(),
+                    'timestamp': datetime.now().isoformat()
+                },
+                'message': 'Cache istatistikleri başarıyla alındı',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Stats alma hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+
+@ocr_ns.route('/cache/<string:file_fingerprint>')
+class ResultCacheInvalidate(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/cache/{file_fingerprint}
+    METHOD: DELETE
+    AMAÇ: Dokümanın sonuçlarını tüm cache katmanlarında geçersiz kıl
+    """
+
+    def delete(self, file_fingerprint):
+        """Parmak izine ait isim kayıtlarını L1/L2'den sil, Postgres kayıtlarını 'invalidated' yap"""
+        try:
+            from App.services.result_cache import get_result_cache
+
+            removed, invalidated_records = get_result_cache().invalidate(file_fingerprint)
+
+            return {
+                'success': True,
+                'data': {
+                    'file_fingerprint': file_fingerprint,
+                    'removed_entries': removed,
+                    'invalidated_records': invalidated_records
+                },
+                'message': 'Cache kayıtları silindi',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Cache silme hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+@ocr_ns.route('/identify')
+class OCRIdentify(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/identify
+    METHOD: POST
+    AMAÇ: Dokümanın hastasını roster'dan tespit et (senkron, isim verilmeden)
+    """
+
+    @api.expect(identify_request_model)
+    def post(self):
+        """PDF'i bir kez oku, roster'da geçen isimleri seviyeye göre sıralı döndür"""
+        try:
+            data = request.get_json() or {}
+            pdf_path = data.get('pdf_path')
+            min_level = data.get('min_level')
+
+            if not pdf_path:
+                return {
+                    'success': False,
+                    'error': "'pdf_path' alanı zorunludur",
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            if min_level and min_level not in ('full', 'n-1', 'pair', 'single'):
+                return {
+                    'success': False,
+                    'error': "'min_level' full / n-1 / pair / single olmalıdır",
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            is_valid, error_msg = validate_pdf_path(pdf_path)
+            if not is_valid:
+                return {
+                    'success': False,
+                    'error': error_msg,
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            service_result = get_ocr_service().identify_document(
+                pdf_path=pdf_path,
+                min_level=min_level,
+                limit=data.get('limit')
+            )
+
+            if not service_result.get('success', False):
+                return {
+                    'success': False,
+                    'error': service_result.get('error', 'OCR service hatası'),
+                    'timestamp': datetime.now().isoformat()
+                }, 500
+
+            return {
+                'success': True,
+                'data': {
+                    'matches': service_result['matches'],
+                    'insurance_company': service_result['insurance_company'],
+                    'processing_info': service_result['processing_info']
+                },
+                'message': f"{len(service_result['matches'])} roster eşleşmesi bulundu",
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            print(f"❌ Identify API Hatası: {str(e)}")
+            print(f"Detaylı Hata:\n{traceback.format_exc()}")
+
+            return {
+                'success': False,
+                'error': f'Sunucu hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+
+@ocr_ns.route('/roster')
+class Roster(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/roster
+    METHOD: GET, POST
+    AMAÇ: Hasta tespiti için roster indeksi (bu süreç)
+    """
+
+    def get(self):
+        """Roster indeksi istatistiklerini getir"""
+        try:
+            from App.ocr.roster_index import get_roster_index
+
+            return {
+                'success': True,
+                'data': get_roster_index().get_stats(),
+                'message': 'Roster istatistikleri başarıyla alındı',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Stats alma hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+    @api.expect(roster_update_model)
+    def post(self):
+        """Roster'ı güncelle (sadece değişen isimlerin desenleri eklenir / çıkarılır)"""
+        try:
+            from App.ocr.roster_index import get_roster_index
+
+            data = request.get_json() or {}
+            mode = data.get('mode', 'add')
+            names = [name for name in (data.get('names') or []) if name and name.strip()]
+            roster_index = get_roster_index()
+
+            if mode == 'reload':
+                if not Config.OCR_ROSTER_PATH:
+                    return {
+                        'success': False,
+                        'error': 'OCR_ROSTER_PATH tanımlı değil',
+                        'timestamp': datetime.now().isoformat()
+                    }, 400
+                added, removed = roster_index.load_file(Config.OCR_ROSTER_PATH)
+            elif mode == 'add':
+                added, removed = roster_index.add_names(names), 0
+            elif mode == 'remove':
+                added, removed = 0, roster_index.remove_names(names)
+            elif mode == 'replace':
+                added, removed = roster_index.replace_names(names)
+            else:
+                return {
+                    'success': False,
+                    'error': "'mode' add / remove / replace / reload olmalıdır",
+                    'timestamp': datetime.now().isoformat()
+                }, 400
+
+            return {
+                'success': True,
+                'data': {
+                    'added': added,
+                    'removed': removed,
+                    'names': len(roster_index)
+                },
+                'message': f'Roster güncellendi (+{added} / -{removed})',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Roster güncelleme hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+@ocr_ns.route('/insurers')
+class InsurerTable(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/insurers
+    METHOD: GET
+    AMAÇ: Sigorta şirketi tespit tablosu bilgisi (kaynak, sürüm, anahtar sayısı) ve sayaçlar
+    """
+
+    def get(self):
+        """Derlenmiş sigorta tablosunun durumunu getir"""
+        try:
+            from App.ocr.insurer_detector import get_insurer_detector
+
+            return {
+                'success': True,
+                'data': get_insurer_detector().get_stats(),
+                'message': 'Sigorta tablosu bilgisi başarıyla alındı',
+                'timestamp': datetime.now().isoformat()
+            }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Stats alma hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
+
+@ocr_ns.route('/insurers/reload')
+class InsurerTableReload(Resource):
+    """
+    ENDPOINT: /api/v1/ocr/insurers/reload
+    METHOD: POST
+    AMAÇ: Sigorta tablosunu kaynaktan hemen yeniden derle (bu süreç; diğerleri kontrol aralığında)
+    """
+
+    def post(self):
+        """Tabloyu yeniden yükle"""
+        try:
+            from App.ocr.insurer_detector import get_insurer_detector
+
+            insurer_detector = get_insurer_detector()
+            reloaded = insurer_detector.reload()
+            stats = insurer_detector.get_stats()
+
+            return {
+                'success': reloaded,
+                'data': stats,
+                'message': 'Sigorta tablosu yeniden yüklendi' if reloaded else 'Tablo yüklenemedi, mevcut tablo kullanılıyor',
+                'timestamp': datetime.now().isoformat()
+            }, 200 if reloaded else 500
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Sigorta tablosu yükleme hatası: {str(e)}',
+                'timestamp': datetime.now().isoformat()
+            }, 500
+
 api.add_namespace(ocr_ns, path='/ocr')
\ No newline at end of file
@@ -62,6 +62,33 @@ class BaseModel(db.Model):
                 result[column.key] = value
         return result
 
+class InsuranceCompanyAlias(BaseModel):
+    """
+    Sigorta şirketi tespit tablosu (OCR_INSURER_SOURCE=database)
+    Metinde aranan anahtar kelime -> şirket adı; kod deploy'u olmadan güncellenir
+    """
+
+    __tablename__ = 'insurance_company_alias'
+
+    id = db.Column(db.Integer, primary_key=True)
+    alias = db.Column(db.String(100), unique=True, nullable=False)
+    company_name = db.Column(db.String(255), nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+
+    def __repr__(self):
+        return f"<InsuranceCompanyAlias(alias='{self.alias}', company_name='{self.company_name}')>"
+
+    @classmethod
+    def get_active_table(cls):
+        """Aktif kayıtlar: {alias: company_name}"""
+        return {record.alias: record.company_name for record in cls.query.filter_by(is_active=True).all()}
+
+    @classmethod
+    def get_version(cls):
+        """Tablo değişti mi kontrolü için (kayıt sayısı, son güncelleme)"""
+        count, last_updated = db.session.query(db.func.count(cls.id), db.func.max(cls.updated_at)).one()
+        return count, last_updated.isoformat() if last_updated else None
+
 class OCRResult(BaseModel):
 
     __tablename__ = 'ocr_result'
@@ -73,21 +100,25 @@ class OCRResult(BaseModel):
     insurance_company = db.Column(db.String(255), nullable=True, index=True)
 
     file_path = db.Column(db.Text, nullable=True)
+    # İçerik parmak izi (boyut + hash) - duplicate tespiti bununla yapılır, file_path denetim içindir
+    file_fingerprint = db.Column(db.String(160), nullable=True, index=True)
 
 
+    # processing / completed / failed / invalidated (cache geçersiz kılındı, duplicate sayılmaz)
     status = db.Column(db.String(50), default='processing', nullable=False, index=True)
 
     def __repr__(self):
         return f"<OCRResult(task_id='{self.task_id}', expected_name='{self.expected_name}', detected_name='{self.detected_name}', status='{self.status}')>"
 
     @classmethod
-    def create_processing_record(cls, task_id, expected_name, file_path=None):
+    def create_processing_record(cls, task_id, expected_name, file_path=None, file_fingerprint=None):
 
         try:
             ocr_result = cls(
                 task_id=task_id,
                 expected_name=expected_name,
                 file_path=file_path,
+                file_fingerprint=file_fingerprint,
                 status='processing'
             )
             ocr_result.save()
@@ -108,10 +139,17 @@ class OCRResult(BaseModel):
         return cls.query.order_by(cls.created_at.desc()).limit(limit).all()
 
     @classmethod
-    def find_recent_duplicate(cls, file_path, expected_name):
+    def _same_file_filter(cls, file_path, file_fingerprint):
+        """Parmak izi varsa içerikle, yoksa (dosya okunamadıysa) yolla eşleştir"""
+        if file_fingerprint:
+            return cls.file_fingerprint == file_fingerprint
+        return cls.file_path == file_path
+
+    @classmethod
+    def find_recent_duplicate(cls, file_path, expected_name, file_fingerprint=None):
 
         duplicate = cls.query.filter(
-            cls.file_path == file_path,
+            cls._same_file_filter(file_path, file_fingerprint),
             cls.expected_name == expected_name,
             cls.status == 'completed',
         ).order_by(cls.created_at.desc()).first()
@@ -119,12 +157,45 @@ class OCRResult(BaseModel):
         return duplicate
 
     @classmethod
-    def find_duplicate(cls, file_path, expected_name):
+    def find_document_results(cls, file_path, file_fingerprint=None):
+        """
+        Dokümanın tamamlanmış tüm isim kayıtları (en yeni önce)
+        - İsim karşılaştırması çağıranda (normalize edilmiş isimle) yapılır
+        """
+        return cls.query.filter(
+            cls._same_file_filter(file_path, file_fingerprint),
+            cls.status == 'completed'
+        ).order_by(cls.created_at.desc()).all()
+
+    @classmethod
+    def mark_invalidated(cls, file_fingerprint):
+        """
+        Dokümanın tamamlanmış kayıtlarını 'invalidated' yap (silinmez, duplicate sayılmaz)
+
+        DÖNEN DEĞER:
+            int: İşaretlenen kayıt sayısı
+        """
+        try:
+            count = cls.query.filter(
+                cls.file_fingerprint == file_fingerprint,
+                cls.status == 'completed'
+            ).update({'status': 'invalidated', 'updated_at': datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+            return count
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Kayıtlar geçersiz kılınamadı: {e}")
+            raise e
+
+    @classmethod
+    def find_duplicate(cls, file_path, expected_name, file_fingerprint=None):
         """
-        Tüm zamanlar için aynı dosya+isim kombinasyonu arar
+        Tüm zamanlar için aynı dosya içeriği+isim kombinasyonu arar
+        - Farklı klasöre kopyalanmış aynı tarama duplicate sayılır
+        - Yerinde üzerine yazılmış dosya yeni içerik olarak işlenir
         """
         duplicate = cls.query.filter(
-            cls.file_path == file_path,
+            cls._same_file_filter(file_path, file_fingerprint),
             cls.expected_name == expected_name,
             cls.status == 'completed'
         ).order_by(cls.created_at.desc()).first()
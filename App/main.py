@@ -7,6 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from App.utils.startup_report import timed_step, get_startup_report, print_startup_report
 from App.database.config import config
 from App.database.db_manager import setup_database
 from flask import Flask, jsonify
@@ -24,8 +25,9 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# API Blueprint'leri import et
-from App.api.ocr_api import ocr_blueprint
+# API Blueprint'leri import et (OCR motoru, Redis ve Tesseract ilk kullanımda yüklenir)
+with timed_step('api_import'):
+    from App.api.ocr_api import ocr_blueprint
 
 load_dotenv()
 
@@ -44,7 +46,8 @@ def create_app():
         app.config.from_object(config['default'])
 
     try:
-        setup_database(app)
+        with timed_step('database_setup'):
+            setup_database(app)
         print(f"✅ Database entegrasyonu tamamlandı")
     except Exception as e:
         print(f"❌ Database setup hatası: {e}")
@@ -85,7 +88,8 @@ def create_app():
     # ============ BLUEPRINT KAYDI ============
     try:
         # Sync OCR API
-        app.register_blueprint(ocr_blueprint, url_prefix='/api/v1')
+        with timed_step('blueprint_register'):
+            app.register_blueprint(ocr_blueprint, url_prefix='/api/v1')
         print("✅ Sync OCR Blueprint kaydedildi")
 
     except Exception as e:
@@ -113,6 +117,7 @@ def create_app():
                 'sync_ocr': '/api/v1/ocr/process',
                 'swagger': '/api/v1/swagger',
                 'health': '/health',
+                'startup': '/startup',
             },
             'description': 'Hastane yönetim sistemi için OCR servisi',
             'features': {
@@ -128,6 +133,11 @@ def create_app():
             'timestamp': datetime.now().isoformat()
         })
 
+    @app.route('/startup')
+    def startup():
+        """Başlatma adımları ve süreleri (ilk kullanımda yapılan başlatmalar dahil)"""
+        return jsonify(get_startup_report())
+
     # ============ ERROR HANDLER'LAR ============
     @app.errorhandler(404)
     def not_found(error):
@@ -216,7 +226,9 @@ if __name__ == '__main__':
 
     try:
         # Flask uygulamasını oluştur
-        app = create_app()
+        with timed_step('create_app'):
+            app = create_app()
+        print_startup_report('API')
 
         # Çalıştırma parametreleri
         host = os.getenv('FLASK_HOST', '0.0.0.0')
@@ -0,0 +1,51 @@
+"""ocr_result başlangıç tablosu
+
+Migration zincirinin tabanı. Tablo create_all ile zaten oluşturulmuşsa dokunulmaz;
+böylece hem boş veritabanında hem mevcut kurulumda `flask db upgrade` çalışır.
+Downgrade tabloyu silmez: tablo bu revizyondan önce de var olmuş (üretim verisi) olabilir.
+
+Revision ID: 3f8b6c1d0a72
+Revises:
+Create Date: 2026-10-17 00:40:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8b6c1d0a72'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('ocr_result'):
+        return
+
+    op.create_table(
+        'ocr_result',
+        sa.Column('task_id', sa.String(length=255), nullable=False),
+        sa.Column('expected_name', sa.String(length=255), nullable=False),
+        sa.Column('detected_name', sa.String(length=255), nullable=True),
+        sa.Column('match_status', sa.Boolean(), nullable=False),
+        sa.Column('insurance_company', sa.String(length=255), nullable=True),
+        sa.Column('file_path', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('task_id')
+    )
+    with op.batch_alter_table('ocr_result', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ocr_result_task_id'), ['task_id'], unique=True)
+        batch_op.create_index(batch_op.f('ix_ocr_result_match_status'), ['match_status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ocr_result_insurance_company'), ['insurance_company'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ocr_result_status'), ['status'], unique=False)
+
+
+def downgrade():
+    # Bilerek boş: upgrade mevcut tabloyu sahiplenmiş olabilir, silmek veriyi yok eder.
+    # Boş kurulumda tablo gerekirse elle kaldırılır (DROP TABLE ocr_result)
+    pass
@@ -0,0 +1,35 @@
+"""ocr_result tablosuna file_fingerprint kolonu ekle
+
+Duplicate tespiti dosya yolu yerine içerik parmak izi (boyut + hash) ile yapılır.
+
+Revision ID: a1f3c9d2e4b5
+Revises: 3f8b6c1d0a72
+Create Date: 2026-10-17 00:50:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c9d2e4b5'
+down_revision = '3f8b6c1d0a72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all ile kurulan veritabanında kolon zaten olabilir
+    inspector = sa.inspect(op.get_bind())
+    if 'file_fingerprint' in {column['name'] for column in inspector.get_columns('ocr_result')}:
+        return
+
+    with op.batch_alter_table('ocr_result', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('file_fingerprint', sa.String(length=160), nullable=True))
+        batch_op.create_index(batch_op.f('ix_ocr_result_file_fingerprint'), ['file_fingerprint'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ocr_result', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ocr_result_file_fingerprint'))
+        batch_op.drop_column('file_fingerprint')
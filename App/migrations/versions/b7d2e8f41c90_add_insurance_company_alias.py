@@ -0,0 +1,42 @@
+"""insurance_company_alias tablosunu ekle
+
+Sigorta şirketi tespit tablosu veritabanından yüklenebilir (OCR_INSURER_SOURCE=database).
+
+Revision ID: b7d2e8f41c90
+Revises: a1f3c9d2e4b5
+Create Date: 2026-10-17 03:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e8f41c90'
+down_revision = 'a1f3c9d2e4b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all ile kurulan veritabanında tablo zaten olabilir
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('insurance_company_alias'):
+        return
+
+    op.create_table(
+        'insurance_company_alias',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('alias', sa.String(length=100), nullable=False),
+        sa.Column('company_name', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('alias')
+    )
+
+
+def downgrade():
+    # Bilerek boş: upgrade create_all ile oluşmuş tabloyu sahiplenmiş olabilir (alias verisi kalır)
+    pass
@@ -0,0 +1,197 @@
+"""
+DOSYA: ocr/aho_corasick.py
+AMAÇ: Çoklu desen arama otomatı (Aho-Corasick) - saf Python
+- Binlerce desen metnin tek doğrusal taramasında bulunur
+- Desenler tekrar tekrar eklenebilir (referans sayacı); sayaç 0'a inince desen düşer
+- Ekleme / silme trie'yi yerinde günceller, failure linkleri bir sonraki aramada
+  (değişiklik olduysa) tek BFS ile yeniden kurulur
+- İsteğe bağlı kelime sınırı kontrolü ('ali' deseni 'alim' içinde eşleşmez)
+
+KULLANIM:
+    automaton = AhoCorasickAutomaton()
+    automaton.add('ahmet yilmaz')
+    for start, end, pattern in automaton.iter_matches(text):
+        ...
+"""
+import threading
+import time
+
+
+def is_word_char(char):
+    """Kelime sınırı kontrolü için harf / rakam"""
+    return char.isalnum() or char == '_'
+
+
+class AhoCorasickAutomaton:
+    """
+    Trie + failure / output linkleri
+
+    Düğümler paralel listelerde tutulur (düğüm başına nesne yok):
+    goto[düğüm] = {karakter: çocuk}, fail[düğüm], output[düğüm] (en yakın desen düğümü)
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [-1]
+        self._depth = [0]
+        self._pattern_at = [None]  # düğüm -> desen (desen düğümüyse)
+
+        self._refcounts = {}  # desen -> referans sayısı
+        self._dirty = False
+        self._lock = threading.RLock()
+
+        self.build_count = 0
+        self.last_build_seconds = 0.0
+
+    def __len__(self):
+        return len(self._refcounts)
+
+    def __contains__(self, pattern):
+        return pattern in self._refcounts
+
+    @property
+    def node_count(self):
+        return len(self._goto)
+
+    def add(self, pattern):
+        """
+        Deseni ekle (zaten varsa referans sayacını artır)
+
+        DÖNEN DEĞER:
+            bool: Desen otomata yeni eklendiyse True
+        """
+        if not pattern:
+            return False
+
+        with self._lock:
+            count = self._refcounts.get(pattern, 0)
+            self._refcounts[pattern] = count + 1
+            if count:
+                return False
+
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(-1)
+                    self._depth.append(self._depth[node] + 1)
+                    self._pattern_at.append(None)
+                    self._goto[node][char] = child
+                node = child
+
+            self._pattern_at[node] = pattern
+            self._dirty = True
+            return True
+
+    def remove(self, pattern):
+        """
+        Desenin referans sayacını azalt, 0'a inince desen eşleşmez
+
+        Boşalan trie dalları silinmez (yeniden eklenirse tekrar kullanılır).
+
+        DÖNEN DEĞER:
+            bool: Desen otomattan düştüyse True
+        """
+        with self._lock:
+            count = self._refcounts.get(pattern)
+            if not count:
+                return False
+
+            if count > 1:
+                self._refcounts[pattern] = count - 1
+                return False
+
+            del self._refcounts[pattern]
+            node = 0
+            for char in pattern:
+                node = self._goto[node][char]
+            self._pattern_at[node] = None
+            self._dirty = True
+            return True
+
+    def build(self):
+        """Failure ve output linklerini BFS ile (yeniden) kur"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            start_time = time.time()
+            goto, fail, output, pattern_at = self._goto, self._fail, self._output, self._pattern_at
+
+            queue = []
+            for child in goto[0].values():
+                fail[child] = 0
+                output[child] = -1
+                queue.append(child)
+
+            index = 0
+            while index < len(queue):
+                node = queue[index]
+                index += 1
+
+                for char, child in goto[node].items():
+                    state = fail[node]
+                    while state and char not in goto[state]:
+                        state = fail[state]
+                    target = goto[state].get(char, 0)
+                    fail[child] = target if target != child else 0
+
+                    # En yakın desen düğümüne kısayol (eşleşme zinciri sadece desenlerden geçer)
+                    suffix = fail[child]
+                    output[child] = suffix if pattern_at[suffix] is not None else output[suffix]
+                    queue.append(child)
+
+            self._dirty = False
+            self.build_count += 1
+            self.last_build_seconds = time.time() - start_time
+
+    def iter_matches(self, text, word_boundaries=True):
+        """
+        Metindeki tüm desen geçişlerini tek taramada bul
+
+        Tarama kilit altında yapılır (eşzamanlı ekleme / silme linkleri bozmasın diye).
+
+        DÖNEN DEĞER:
+            iterator: (başlangıç, bitiş, desen) - bitiş hariç, metin sırasıyla
+        """
+        with self._lock:
+            self.build()
+
+            goto, fail, output, depth, pattern_at = \
+                self._goto, self._fail, self._output, self._depth, self._pattern_at
+            text_length = len(text)
+            matches = []
+
+            state = 0
+            for position, char in enumerate(text):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+
+                node = state if pattern_at[state] is not None else output[state]
+                while node > 0:
+                    end = position + 1
+                    start = end - depth[node]
+                    if not word_boundaries or (
+                        (start == 0 or not is_word_char(text[start - 1])) and
+                        (end == text_length or not is_word_char(text[end]))
+                    ):
+                        matches.append((start, end, pattern_at[node]))
+                    node = output[node]
+
+        return iter(matches)
+
+    def get_stats(self):
+        """Otomat boyutu ve son kurulum süresi"""
+        with self._lock:
+            return {
+                'patterns': len(self._refcounts),
+                'nodes': len(self._goto),
+                'build_count': self.build_count,
+                'last_build_seconds': round(self.last_build_seconds, 4),
+                'dirty': self._dirty
+            }
@@ -0,0 +1,157 @@
+"""
+DOSYA: ocr/cascade_gate.py
+AMAÇ: Hızlı aşama başarısız olduğunda advanced aşamaya geçip geçmemeye karar verme
+- Hızlı aşamanın kalite sinyallerine bakılır (kelime güveni, metin uzunluğu,
+  sözlük kelimesi oranı, sigorta şirketi tespiti)
+- Metin temiz okunmuş ama isim yoksa belge büyük ihtimalle başka hastaya aittir;
+  advanced aşama (15-20s) sonucu değiştirmez
+- Modlar: off (her zaman advanced), shadow (karar sayılır ama advanced yine çalışır),
+  enforce (karar uygulanır)
+- Kararlar ve shadow modda advanced'in kararı boşa çıkardığı durumlar sayılır
+"""
+import threading
+
+from App.utils.config import Config
+
+GATE_MODES = ('off', 'shadow', 'enforce')
+
+# Türkçe + İngilizce sesli harfler (kelime benzerliği sezgisi için)
+VOWELS = set('aeıioöuüAEIİOÖUÜ')
+
+
+def is_dictionary_like(token):
+    """
+    Token gerçek bir kelimeye benziyor mu?
+
+    Sözlük dosyası taşımamak için sezgisel kontrol: en az 2 harf, sadece harf,
+    en az bir sesli harf. OCR çöpü (|||, 1l1, rnrn, tek harfler) bu testten geçmez.
+    """
+    token = token.strip('.,;:!?()[]{}"\'-/')
+    if len(token) < 2 or not token.isalpha():
+        return False
+    return any(char in VOWELS for char in token)
+
+
+class CascadeGate:
+    """
+    Advanced aşama geçit politikası
+
+    Bütün eşikler sağlanırsa geçit "skip" kararı verir; herhangi biri sağlanmazsa
+    "escalate". Shadow modda karar sadece sayılır, akış değişmez.
+    """
+
+    def __init__(self, mode=None):
+        mode = (mode or Config.OCR_GATE_MODE).lower()
+        self.mode = mode if mode in GATE_MODES else 'shadow'
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'decisions': 0,
+            'escalated': 0,
+            'skipped': 0,
+            'shadow_skips': 0,
+            'shadow_skips_overruled': 0,
+            'failed_checks': {}
+        }
+
+    @staticmethod
+    def collect_signals(stage_result, insurer_detected):
+        """Hızlı aşama sonucundan kalite sinyallerini çıkar"""
+        words = stage_result.get('words') or []
+        dictionary_words = sum(1 for word in words if is_dictionary_like(word['text']))
+
+        return {
+            'mean_confidence': stage_result.get('mean_confidence', 0.0),
+            'text_length': len(stage_result.get('text', '').strip()),
+            'dictionary_word_ratio': round(dictionary_words / len(words), 3) if words else 0.0,
+            'insurer_detected': bool(insurer_detected)
+        }
+
+    @staticmethod
+    def failed_checks(signals):
+        """Sağlanmayan eşiklerin listesi (boşsa sayfa temiz okunmuş demektir)"""
+        failed = []
+        if signals['mean_confidence'] < Config.OCR_GATE_MIN_CONFIDENCE:
+            failed.append('mean_confidence')
+        if signals['text_length'] < Config.OCR_GATE_MIN_TEXT_LENGTH:
+            failed.append('text_length')
+        if signals['dictionary_word_ratio'] < Config.OCR_GATE_MIN_DICTIONARY_RATIO:
+            failed.append('dictionary_word_ratio')
+        if Config.OCR_GATE_REQUIRE_INSURER and not signals['insurer_detected']:
+            failed.append('insurer_detected')
+        return failed
+
+    def decide(self, stage_result, insurer_detected=False):
+        """
+        Hızlı aşama isim bulamadığında advanced aşamaya geçilsin mi?
+
+        DÖNEN DEĞER:
+            dict: action ('escalate' / 'skip'), mode, would_skip, signals, failed_checks
+        """
+        if self.mode == 'off' or not stage_result:
+            return {
+                'action': 'escalate',
+                'mode': self.mode,
+                'would_skip': False,
+                'signals': None,
+                'failed_checks': []
+            }
+
+        signals = self.collect_signals(stage_result, insurer_detected)
+        failed = self.failed_checks(signals)
+        would_skip = not failed
+        action = 'skip' if would_skip and self.mode == 'enforce' else 'escalate'
+
+        with self._lock:
+            self.stats['decisions'] += 1
+            if action == 'skip':
+                self.stats['skipped'] += 1
+            else:
+                self.stats['escalated'] += 1
+            if would_skip and self.mode == 'shadow':
+                self.stats['shadow_skips'] += 1
+            for check in failed:
+                self.stats['failed_checks'][check] = self.stats['failed_checks'].get(check, 0) + 1
+
+        return {
+            'action': action,
+            'mode': self.mode,
+            'would_skip': would_skip,
+            'signals': signals,
+            'failed_checks': failed
+        }
+
+    def record_outcome(self, decision, advanced_match_found):
+        """
+        Advanced aşama sonucunu kaydet
+
+        Shadow modda "skip" denen ama advanced'in isim bulduğu sayfalar eşiklerin
+        fazla gevşek olduğunu gösterir.
+        """
+        if decision['mode'] == 'shadow' and decision['would_skip'] and advanced_match_found:
+            with self._lock:
+                self.stats['shadow_skips_overruled'] += 1
+
+    def get_stats(self):
+        """Geçit istatistiklerini getir"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['failed_checks'] = dict(self.stats['failed_checks'])
+
+        stats['mode'] = self.mode
+        stats['thresholds'] = {
+            'min_confidence': Config.OCR_GATE_MIN_CONFIDENCE,
+            'min_text_length': Config.OCR_GATE_MIN_TEXT_LENGTH,
+            'min_dictionary_ratio': Config.OCR_GATE_MIN_DICTIONARY_RATIO,
+            'require_insurer': Config.OCR_GATE_REQUIRE_INSURER
+        }
+        return stats
+
+
+# Global instance
+cascade_gate = CascadeGate()
+
+
+def get_cascade_gate():
+    """Global cascade gate instance'ını döndür"""
+    return cascade_gate
@@ -0,0 +1,130 @@
+"""
+DOSYA: ocr/dpi_policy.py
+AMAÇ: Ölçülen yazı yüksekliğine göre render DPI ve upscale kararı
+- Düşük çözünürlüklü önizlemede connected component analizi ile yazı yüksekliği ölçülür
+- Glif yüksekliği Tesseract'ın rahat okuduğu aralığa düşecek şekilde DPI seçilir
+- Küçük puntolu sayfalar büyütülür, normal/büyük puntolu sayfalar olduğu gibi bırakılır
+"""
+import time
+
+from App.utils.config import Config
+from App.ocr.pdf_render import render_page_band
+
+# ============ OPTIONAL IMPORTS ============
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+def estimate_text_height(image):
+    """
+    Sayfadaki tipik glif yüksekliğini (piksel) tahmin et
+
+    PARAMETRELER:
+        image: Gri tonlamalı PIL Image veya numpy array
+
+    DÖNEN DEĞER:
+        float veya None: Medyan glif yüksekliği (ölçülemezse None)
+    """
+    if not CV2_AVAILABLE:
+        return None
+
+    gray = np.asarray(image)
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_RGB2GRAY)
+
+    # Yazı = ön plan (beyaz), kağıt = arka plan
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+
+    if count <= 1:
+        return None
+
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+
+    # Gürültü, çizgi, tablo kenarı ve logoları ele
+    page_height = gray.shape[0]
+    is_glyph = (
+        (heights >= 2) &
+        (heights <= page_height * 0.05) &
+        (widths <= heights * 4) &
+        (heights <= widths * 6)
+    )
+    glyph_heights = heights[is_glyph]
+
+    if len(glyph_heights) < Config.OCR_TEXT_HEIGHT_MIN_GLYPHS:
+        return None
+
+    return float(np.median(glyph_heights))
+
+
+def fixed_render_settings():
+    """Ölçüm yapılamazsa kullanılan sabit politika (300 DPI + 2x upscale)"""
+    return {
+        'dpi': Config.OCR_DPI,
+        'upscale_factor': 2,
+        'policy': 'fixed',
+        'measured_text_height_px': None,
+        'estimate_seconds': 0
+    }
+
+
+def choose_render_settings(pdf_path, band_ratio=1.0, page_size=None):
+    """
+    Önizleme üzerinden render DPI ve upscale faktörünü seç
+
+    DÖNEN DEĞER:
+        dict: dpi, upscale_factor, policy, estimate_seconds,
+              measured_text_height_px (seçilen DPI ve upscale sonrası, Tesseract'ın gördüğü glif yüksekliği)
+    """
+    if not Config.OCR_ADAPTIVE_DPI or not CV2_AVAILABLE:
+        return fixed_render_settings()
+
+    estimate_start = time.time()
+    preview_dpi = Config.OCR_ADAPTIVE_PREVIEW_DPI
+
+    try:
+        preview = render_page_band(pdf_path, preview_dpi, band_ratio, page_size)
+        preview_height = estimate_text_height(preview)
+    except Exception as e:
+        print(f"⚠️ Yazı yüksekliği ölçülemedi: {e}")
+        preview_height = None
+
+    estimate_time = time.time() - estimate_start
+
+    if not preview_height:
+        settings = fixed_render_settings()
+        settings['estimate_seconds'] = estimate_time
+        return settings
+
+    # Varsayılan DPI'da beklenen glif yüksekliği
+    height_per_dpi = preview_height / preview_dpi
+    base_height = height_per_dpi * Config.OCR_DPI
+
+    if Config.OCR_TEXT_HEIGHT_MIN_PX <= base_height <= Config.OCR_TEXT_HEIGHT_MAX_PX:
+        dpi = Config.OCR_DPI
+        upscale_factor = 1
+    else:
+        needed_dpi = Config.OCR_TARGET_TEXT_HEIGHT_PX / height_per_dpi
+        dpi = int(min(max(needed_dpi, Config.OCR_MIN_DPI), Config.OCR_MAX_DPI))
+
+        # DPI tavanına takılan çok küçük yazılar için kalan oran kadar upscale
+        upscale_factor = 1
+        if needed_dpi > dpi:
+            upscale_factor = min(round(needed_dpi / dpi * 4) / 4, 2)
+
+    final_height = height_per_dpi * dpi * upscale_factor
+    print(f"📏 Yazı yüksekliği: {base_height:.1f}px @ {Config.OCR_DPI} DPI → "
+          f"{dpi} DPI x{upscale_factor} (~{final_height:.1f}px, {estimate_time:.2f}s)")
+
+    return {
+        'dpi': dpi,
+        'upscale_factor': upscale_factor,
+        'policy': 'adaptive',
+        'measured_text_height_px': round(final_height, 1),
+        'estimate_seconds': estimate_time
+    }
@@ -0,0 +1,269 @@
+"""
+DOSYA: ocr/engine_pool.py
+AMAÇ: Kalıcı Tesseract motor havuzu
+- Her worker sürecinde dil/OEM kombinasyonu başına başlatılmış Tesseract handle'ları tutar
+- PSM canlı handle üzerinde değiştirilir (traineddata tekrar yüklenmez)
+- Handle'lar thread-safe şekilde ödünç alınır / geri verilir
+- Kombinasyon başına boşta en fazla OCR_PSM_PARALLELISM handle tutulur, fazlası kapatılır
+- Kelime kutuları + güven skorları döndürülür
+- tesserocr yoksa pytesseract (her çağrıda subprocess) fallback
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import pytesseract
+from PIL import Image
+
+from App.ocr.word_data import make_word, words_from_tesseract_data, build_ocr_page
+from App.utils.config import Config
+
+# ============ OPTIONAL IMPORTS ============
+# Durum import anında değil warm() içinde (worker başlangıcında bir kez) raporlanır
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+    TESSEROCR_IMPORT_ERROR = None
+except ImportError as e:
+    TESSEROCR_AVAILABLE = False
+    TESSEROCR_IMPORT_ERROR = str(e)
+
+# Tesseract varsayılan OEM (LSTM + legacy, hangisi varsa)
+DEFAULT_OEM = 3
+
+
+def set_handle_image(api, image):
+    """
+    Görüntüyü handle'a ver
+
+    Gri tonlamalı ndarray ham byte olarak verilir; PIL'e çevirme ve
+    tesserocr'ın ara BMP kodlaması atlanır.
+    """
+    if isinstance(image, Image.Image):
+        api.SetImage(image)
+        return
+
+    height, width = image.shape[:2]
+    bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+    api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+
+class TesseractEnginePool:
+    """
+    Başlatılmış Tesseract handle havuzu
+
+    Her (dil, OEM) kombinasyonu için boşta bekleyen handle listesi tutulur.
+    Bir handle aynı anda tek bir thread tarafından kullanılır; iş bitince
+    havuza geri döner ve bir sonraki çağrıda model yüklemeden tekrar kullanılır.
+    Her handle kendi traineddata kopyasını tutar; paralel PSM patlamasından sonra
+    boşta max_idle_per_key'den fazlası kalmaz.
+    """
+
+    def __init__(self, tessdata_path=None, max_idle_per_key=None):
+        self.tessdata_path = tessdata_path
+        self.backend = "tesserocr" if TESSEROCR_AVAILABLE else "pytesseract"
+        self.max_idle_per_key = max(1, max_idle_per_key or Config.OCR_PSM_PARALLELISM)
+
+        self._idle = {}  # (lang, oem) -> [handle, ...]
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'handles_created': 0,
+            'handles_reused': 0,
+            'handles_closed': 0,
+            'recognitions': 0,
+            'init_seconds': 0.0
+        }
+
+    def _create_handle(self, lang, oem):
+        """Yeni Tesseract handle oluştur (traineddata burada yüklenir)"""
+        init_start = time.time()
+
+        kwargs = {'lang': lang, 'oem': oem}
+        if self.tessdata_path:
+            kwargs['path'] = self.tessdata_path
+        handle = tesserocr.PyTessBaseAPI(**kwargs)
+
+        init_time = time.time() - init_start
+        with self._lock:
+            self.stats['handles_created'] += 1
+            self.stats['init_seconds'] += init_time
+
+        print(f"🔧 Tesseract handle oluşturuldu: {lang} (OEM {oem}, {init_time:.2f}s)")
+        return handle
+
+    @contextmanager
+    def acquire(self, lang, oem=DEFAULT_OEM):
+        """Havuzdan handle ödünç al, iş bitince geri ver"""
+        key = (lang, oem)
+        handle = None
+
+        with self._lock:
+            idle_handles = self._idle.setdefault(key, [])
+            if idle_handles:
+                handle = idle_handles.pop()
+                self.stats['handles_reused'] += 1
+
+        if handle is None:
+            handle = self._create_handle(lang, oem)
+
+        try:
+            yield handle
+        finally:
+            handle.Clear()
+            with self._lock:
+                idle_handles = self._idle.setdefault(key, [])
+                keep = len(idle_handles) < self.max_idle_per_key
+                if keep:
+                    idle_handles.append(handle)
+                else:
+                    self.stats['handles_closed'] += 1
+            if not keep:
+                # Boşta yeterince handle var - fazlasının model belleği serbest bırakılır
+                handle.End()
+
+    def recognize_words(self, image, lang='tur+eng', psm=6, oem=DEFAULT_OEM, variables=None, timeout=0):
+        """
+        Görüntüdeki metni kelime kutuları ve güven skorlarıyla tanı
+
+        PARAMETRELER:
+            image: PIL Image veya gri tonlamalı uint8 ndarray
+            lang: Tesseract dil kodu (örn. 'tur+eng')
+            psm: Page segmentation mode
+            oem: OCR engine mode
+            variables: Çağrıya özel Tesseract değişkenleri (örn. whitelist)
+            timeout: Üst süre (saniye, 0 = sınırsız). Aşılırsa tanıma Tesseract içinde kesilir
+                     (tesserocr deadline'ı / pytesseract süreci öldürülür) ve TimeoutError fırlatılır
+
+        DÖNEN DEĞER:
+            dict: text, words, mean_confidence, median_confidence, word_count
+                  (bkz. word_data.build_ocr_page)
+        """
+        variables = variables or {}
+
+        with self._lock:
+            self.stats['recognitions'] += 1
+
+        if not TESSEROCR_AVAILABLE:
+            return self._recognize_words_subprocess(image, lang, psm, oem, variables, timeout)
+
+        with self._configured_handle(image, lang, psm, oem, variables) as api:
+            if not api.Recognize(int(timeout * 1000)):
+                # Yarım sonuç döndürülmez (text cache'e de yazılmaz)
+                raise TimeoutError(f"Tesseract tanıma {timeout:g}s içinde bitmedi (PSM {psm})")
+            text = api.GetUTF8Text()
+            return build_ocr_page(self._collect_words(api), text)
+
+    @contextmanager
+    def _configured_handle(self, image, lang, psm, oem, variables):
+        """Handle ödünç al, PSM/değişken/görüntü ayarla; çıkışta değişkenleri geri al"""
+        with self.acquire(lang, oem) as api:
+            # Çağrıya özel değişkenleri ayarla, sonra eski değerlerine döndür
+            previous_values = {}
+            for name, value in variables.items():
+                previous_values[name] = api.GetVariableAsString(name) or ''
+                api.SetVariable(name, str(value))
+
+            try:
+                api.SetPageSegMode(psm)
+                set_handle_image(api, image)
+                yield api
+            finally:
+                for name, value in previous_values.items():
+                    api.SetVariable(name, value)
+
+    @staticmethod
+    def _collect_words(api):
+        """Recognize edilmiş handle'dan kelime kayıtlarını topla"""
+        words = []
+        iterator = api.GetIterator()
+        if iterator is None:
+            return words
+
+        line = -1
+        for result in tesserocr.iterate_level(iterator, tesserocr.RIL.WORD):
+            text = (result.GetUTF8Text(tesserocr.RIL.WORD) or '').strip()
+            if result.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            if not text:
+                continue
+
+            box = result.BoundingBox(tesserocr.RIL.WORD)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            words.append(make_word(
+                text, x1, y1, x2 - x1, y2 - y1,
+                result.Confidence(tesserocr.RIL.WORD),
+                max(line, 0)
+            ))
+
+        return words
+
+    @staticmethod
+    def _subprocess_config(psm, oem, variables):
+        """pytesseract config string'i"""
+        config_parts = [f'--oem {oem}', f'--psm {psm}']
+        for name, value in variables.items():
+            config_parts.append(f'-c "{name}={value}"')
+        return ' '.join(config_parts)
+
+    def _recognize_words_subprocess(self, image, lang, psm, oem, variables, timeout=0):
+        """pytesseract fallback - tek image_to_data çağrısı, metin kelimelerden kurulur"""
+        try:
+            data = pytesseract.image_to_data(
+                image,
+                lang=lang,
+                config=self._subprocess_config(psm, oem, variables),
+                output_type=pytesseract.Output.DICT,
+                timeout=timeout
+            )
+        except RuntimeError as e:
+            # pytesseract süre aşımında tesseract sürecini öldürür ve RuntimeError fırlatır
+            if 'timeout' in str(e).lower():
+                raise TimeoutError(f"Tesseract tanıma {timeout:g}s içinde bitmedi (PSM {psm})") from e
+            raise
+        return build_ocr_page(words_from_tesseract_data(data))
+
+    def warm(self, lang, oem=DEFAULT_OEM):
+        """Handle'ı önceden oluştur (ilk job'ın model yükleme maliyetini öne çeker)"""
+        if not TESSEROCR_AVAILABLE:
+            print(f"⚠️ tesserocr kullanılamıyor: {TESSEROCR_IMPORT_ERROR}")
+            print("📝 pytesseract (subprocess) fallback aktif")
+            return False
+
+        print(f"✅ tesserocr kullanılabilir - Kalıcı Tesseract handle'ları aktif "
+              f"(boşta en fazla {self.max_idle_per_key} handle / dil)")
+
+        with self.acquire(lang, oem):
+            pass
+        return True
+
+    def close(self):
+        """Tüm handle'ları kapat"""
+        with self._lock:
+            for handles in self._idle.values():
+                for handle in handles:
+                    handle.End()
+            self._idle.clear()
+
+    def get_stats(self):
+        """Havuz istatistiklerini getir"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['backend'] = self.backend
+            stats['max_idle_per_key'] = self.max_idle_per_key
+            stats['idle_handles'] = {
+                f"{lang} (OEM {oem})": len(handles)
+                for (lang, oem), handles in self._idle.items()
+            }
+        return stats
+
+
+# Global instance
+engine_pool = TesseractEnginePool()
+
+
+def get_engine_pool():
+    """Global engine pool instance'ını döndür"""
+    return engine_pool
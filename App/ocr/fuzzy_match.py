@@ -0,0 +1,145 @@
+"""
+DOSYA: ocr/fuzzy_match.py
+AMAÇ: OCR hatalı isimler için sınırlı düzenleme mesafeli (Levenshtein) token eşleştirme
+- Metin bir kez token'lara ayrılır; her isim parçası token'larla karşılaştırılır
+- Bantlı Levenshtein: sadece köşegen etrafındaki 2k+1 hücre hesaplanır, satır minimumu
+  k'yı aşınca erken çıkılır; uzunluk farkı k'dan büyük token'lara hiç bakılmaz
+- Aynı token metinde tekrar ederse mesafe bir kez hesaplanır
+- Tam isim, parçaların ardışık token'larda (sırayla) eşleşmesiyle bulunur;
+  mesafe ve metindeki pozisyon döner
+- Kısa parçalar (OCR_FUZZY_MIN_PART_LENGTH altı) sadece birebir eşleşir ('ali' ≠ 'all')
+
+ÖRNEK:
+    'AHMFT YILMAZ' metninde 'Ahmet Yılmaz' → mesafe 1, pozisyon 0
+"""
+from App.ocr.text_analysis import TOKEN_PATTERN
+from App.utils.config import Config
+
+
+def bounded_levenshtein(source, target, max_distance):
+    """
+    İki kelime arasındaki düzenleme mesafesi, max_distance'ı aşıyorsa None
+
+    Bantlı dinamik programlama: O(len * max_distance)
+    """
+    source_length, target_length = len(source), len(target)
+    if abs(source_length - target_length) > max_distance:
+        return None
+    if source == target:
+        return 0
+
+    too_far = max_distance + 1
+    previous = [column if column <= max_distance else too_far for column in range(target_length + 1)]
+
+    for row in range(1, source_length + 1):
+        low = max(1, row - max_distance)
+        high = min(target_length, row + max_distance)
+
+        current = [too_far] * (target_length + 1)
+        current[0] = row if row <= max_distance else too_far
+        row_min = current[0]
+        source_char = source[row - 1]
+
+        for column in range(low, high + 1):
+            value = min(
+                previous[column - 1] + (source_char != target[column - 1]),
+                previous[column] + 1,
+                current[column - 1] + 1
+            )
+            current[column] = value
+            if value < row_min:
+                row_min = value
+
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    distance = previous[target_length]
+    return distance if distance <= max_distance else None
+
+
+def tokenize(normalized_text):
+    """
+    Normalize metni token'lara ayır
+
+    DÖNEN DEĞER:
+        list: [(token, karakter pozisyonu), ...]
+    """
+    return [(match.group(), match.start()) for match in TOKEN_PATTERN.finditer(normalized_text)]
+
+
+def allowed_distance(part, max_distance=None, min_part_length=None):
+    """Parça için izin verilen mesafe (kısa parçalar birebir)"""
+    max_distance = Config.OCR_FUZZY_MAX_DISTANCE if max_distance is None else max_distance
+    min_part_length = Config.OCR_FUZZY_MIN_PART_LENGTH if min_part_length is None else min_part_length
+    return max_distance if len(part) >= min_part_length else 0
+
+
+def fuzzy_find_name(tokens, name_parts, max_distance=None, min_part_length=None):
+    """
+    İsmin tüm parçalarını ardışık token'larda sınırlı mesafeyle ara
+
+    PARAMETRELER:
+        tokens: tokenize() çıktısı
+        name_parts: Normalize isim parçaları
+        max_distance: Parça başına en fazla mesafe (varsayılan OCR_FUZZY_MAX_DISTANCE)
+        min_part_length: Bu uzunluğun altındaki parçalar birebir (varsayılan OCR_FUZZY_MIN_PART_LENGTH)
+
+    DÖNEN DEĞER:
+        dict veya None: distance (toplam), position, end, matched_text,
+                        parts [{part, token, distance, position}]
+    """
+    num_parts = len(name_parts)
+    if num_parts == 0 or len(tokens) < num_parts:
+        return None
+
+    # Parça başına: token index -> mesafe (eşleşmeyenler yok)
+    part_hits = []
+    for part in name_parts:
+        limit = allowed_distance(part, max_distance, min_part_length)
+        distances = {}
+        hits = {}
+        for index, (token, _) in enumerate(tokens):
+            if token not in distances:
+                distances[token] = bounded_levenshtein(part, token, limit)
+            if distances[token] is not None:
+                hits[index] = distances[token]
+        if not hits:
+            return None
+        part_hits.append(hits)
+
+    best = None
+    first_hits = part_hits[0]
+    for start in sorted(first_hits):
+        if start + num_parts > len(tokens):
+            break
+
+        total = 0
+        for offset, hits in enumerate(part_hits):
+            distance = hits.get(start + offset)
+            if distance is None:
+                break
+            total += distance
+        else:
+            if best is None or total < best[0]:
+                best = (total, start)
+                if total == 0:
+                    break
+
+    if best is None:
+        return None
+
+    total, start = best
+    last_token, last_position = tokens[start + num_parts - 1]
+    return {
+        'distance': total,
+        'position': tokens[start][1],
+        'end': last_position + len(last_token),
+        'matched_text': ' '.join(token for token, _ in tokens[start:start + num_parts]),
+        'parts': [{
+            'part': part,
+            'token': tokens[start + offset][0],
+            'distance': part_hits[offset][start + offset],
+            'position': tokens[start + offset][1]
+        } for offset, part in enumerate(name_parts)]
+    }
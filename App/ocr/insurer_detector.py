@@ -0,0 +1,303 @@
+"""
+DOSYA: ocr/insurer_detector.py
+AMAÇ: Derlenmiş sigorta şirketi tespit motoru
+- Şirket anahtar kelimeleri ve sigorta kelimeleri tek Aho-Corasick otomatında, kelime sınırlarıyla
+  ('ray' 'muayene' içinde, 'halk' 'halka' içinde eşleşmez)
+- Her aday, en yakın sigorta kelimesine uzaklığı ve anahtarın ayırt ediciliğiyle puanlanır;
+  ilk bulunan değil en yüksek puanlı şirket döner (puanıyla birlikte)
+- Tablo kaynağı: builtin (kod içi), file (JSON) veya database (insurance_company_alias)
+- Kaynak değişince (dosya mtime / tablo sürümü) tablo yeniden derlenir, deploy gerekmez
+
+JSON DOSYA FORMATI:
+    {
+        "aliases": {"allianz": "Allianz Sigorta", "axa": "AXA Sigorta"},
+        "keywords": ["sigorta", "insurance"]
+    }
+"""
+import json
+import os
+import threading
+import time
+
+from App.ocr.aho_corasick import AhoCorasickAutomaton
+from App.ocr.text_analysis import normalize_turkish_text, analyze_text
+from App.utils.config import Config
+
+INSURER_SOURCES = ('builtin', 'file', 'database')
+
+# Anahtar kelime -> sigorta şirketi
+DEFAULT_INSURERS = {
+    "allianz": "Allianz Sigorta",
+    "allianzsigorta": "Allianz Sigorta",
+    "alli": "Allianz Sigorta",
+    "alianz": "Allianz Sigorta",
+    "alia": "Allianz Sigorta",
+    "bupa": "BUPA ACIBADEM Sigorta",
+    "acıbadem": "BUPA ACIBADEM Sigorta",
+    "axa": "AXA Sigorta",
+    "anadolu": "Anadolu Sigorta",
+    "aksigorta": "AkSigorta",
+    "mapfre": "Mapfre Sigorta",
+    "sompo": "Sompo Sigorta",
+    "zurich": "Zurich Sigorta",
+    "generali": "Generali Sigorta",
+    "groupama": "Groupama Sigorta",
+    "ray": "Ray Sigorta",
+    "vakıf": "VakıfBank Sigorta",
+    "vakıfbank": "VakıfBank Sigorta",
+    "medisa": "Medisa Sigorta",
+    "medline": "Medline Sigorta",
+    "hdi": "HDI Sigorta",
+    "ergo": "ERGO Sigorta",
+    "eureko": "Eureko Sigorta",
+    "aviva": "Aviva Sigorta",
+    "gulf": "Gulf Sigorta",
+    "neova": "Neova Sigorta",
+    "ziraat": "Ziraat Sigorta",
+    "halk": "Halk Sigorta",
+    "güneş": "Güneş Sigorta",
+    "türkiye": "TURKİYE Sigorta",
+}
+
+# Şirket adının yakınında aranan kelimeler
+DEFAULT_KEYWORDS = ["sigorta", "sigortası", "sigortaları", "sigortacılık", "insurance"]
+
+# Puan ağırlıkları
+PROXIMITY_WEIGHT = 0.6
+SPECIFICITY_WEIGHT = 0.4
+SPECIFIC_ALIAS_LENGTH = 8  # bu uzunluk ve üstü anahtarlar tam ayırt edici sayılır
+REPEAT_BONUS = 0.05  # aynı şirketin her ek geçişi (en fazla 3)
+
+
+class CompiledInsurerTable:
+    """Tek seferde derlenmiş tablo (yeniden yüklemede bütün olarak değiştirilir)"""
+
+    def __init__(self, aliases, keywords, source, version):
+        self.automaton = AhoCorasickAutomaton()
+        self.companies = {}  # normalize anahtar -> şirket
+        self.keywords = set()
+        self.alias_has_keyword = set()  # 'aksigorta' gibi kelimeyi içinde taşıyan anahtarlar
+
+        for keyword in keywords:
+            normalized = normalize_turkish_text(keyword)
+            if normalized:
+                self.keywords.add(normalized)
+                self.automaton.add(normalized)
+
+        for alias, company_name in aliases.items():
+            normalized = normalize_turkish_text(alias)
+            if not normalized or normalized in self.companies or normalized in self.keywords:
+                continue
+            self.companies[normalized] = company_name
+            self.automaton.add(normalized)
+            if any(keyword in normalized for keyword in self.keywords):
+                self.alias_has_keyword.add(normalized)
+
+        self.automaton.build()
+        self.source = source
+        self.version = version
+        self.loaded_at = time.time()
+
+
+class InsurerDetector:
+    """
+    Sigorta şirketi tespiti
+
+    Tablo OCR_INSURER_RELOAD_INTERVAL saniyede bir kaynağın sürümüyle karşılaştırılır.
+    Yükleme hata verirse mevcut tablo kullanılmaya devam eder.
+    """
+
+    def __init__(self):
+        self.source = Config.OCR_INSURER_SOURCE if Config.OCR_INSURER_SOURCE in INSURER_SOURCES else 'builtin'
+        self.table_path = Config.OCR_INSURER_TABLE_PATH
+        self.reload_interval = Config.OCR_INSURER_RELOAD_INTERVAL
+        self.proximity_window = Config.OCR_INSURER_PROXIMITY_WINDOW
+        self.min_score = Config.OCR_INSURER_MIN_SCORE
+
+        self._table = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'detections': 0,
+            'found': 0,
+            'not_found': 0,
+            'reloads': 0,
+            'reload_errors': 0,
+            'detect_seconds_total': 0.0
+        }
+
+    # ============ TABLO KAYNAKLARI ============
+    def _source_version(self):
+        """Kaynağın mevcut sürümü (değişiklik kontrolü için, tabloyu okumadan)"""
+        if self.source == 'file':
+            return os.stat(self.table_path).st_mtime_ns
+        if self.source == 'database':
+            from App.database.models import InsuranceCompanyAlias
+            return InsuranceCompanyAlias.get_version()
+        return 'builtin'
+
+    def _load_source(self):
+        """Kaynaktan (anahtarlar, sigorta kelimeleri, sürüm) oku"""
+        if self.source == 'file':
+            version = self._source_version()
+            with open(self.table_path, 'r', encoding='utf-8') as table_file:
+                data = json.load(table_file)
+            aliases = data.get('aliases', data) if isinstance(data, dict) else {}
+            return aliases, data.get('keywords', DEFAULT_KEYWORDS), version
+
+        if self.source == 'database':
+            from App.database.models import InsuranceCompanyAlias
+            version = self._source_version()
+            return InsuranceCompanyAlias.get_active_table(), DEFAULT_KEYWORDS, version
+
+        return DEFAULT_INSURERS, DEFAULT_KEYWORDS, 'builtin'
+
+    def _can_read_source(self):
+        if self.source != 'database':
+            return True
+        from flask import has_app_context
+        return has_app_context()
+
+    def reload(self, force=True):
+        """
+        Tabloyu kaynaktan yeniden derle
+
+        PARAMETRELER:
+            force: False ise sadece kaynak sürümü değiştiyse derlenir
+
+        DÖNEN DEĞER:
+            bool: Tablo değiştiyse True
+        """
+        with self._lock:
+            self._last_check = time.time()
+            if not self._can_read_source():
+                # Veritabanı app context dışında okunamaz; ilk yüklemede builtin ile başla
+                if self._table is None:
+                    self._table = CompiledInsurerTable(DEFAULT_INSURERS, DEFAULT_KEYWORDS, 'builtin', 'builtin')
+                return False
+
+            try:
+                if not force and self._table is not None and self._table.source == self.source and \
+                        self._table.version == self._source_version():
+                    return False
+
+                aliases, keywords, version = self._load_source()
+                if not aliases:
+                    raise ValueError(f"{self.source} kaynağında sigorta şirketi tanımı yok")
+
+                self._table = CompiledInsurerTable(aliases, keywords, self.source, version)
+                self.stats['reloads'] += 1
+                print(f"🏢 Sigorta tablosu yüklendi ({self.source}, {len(self._table.companies)} anahtar)")
+                return True
+
+            except Exception as e:
+                self.stats['reload_errors'] += 1
+                print(f"⚠️ Sigorta tablosu yüklenemedi ({self.source}), mevcut tablo kullanılıyor: {e}")
+                if self._table is None:
+                    self._table = CompiledInsurerTable(DEFAULT_INSURERS, DEFAULT_KEYWORDS, 'builtin', 'builtin')
+                return False
+
+    def _current_table(self):
+        if self._table is None:
+            self.reload()
+        elif self.source != 'builtin' and time.time() - self._last_check >= self.reload_interval:
+            self.reload(force=False)
+        return self._table
+
+    # ============ TESPİT ============
+    def detect(self, detected_text):
+        """
+        Metindeki sigorta şirketini puanla
+
+        DÖNEN DEĞER:
+            dict: company (None = bulunamadı), score, alias, position,
+                  candidates [{company, score, alias, position, hits}] puana göre azalan
+        """
+        start_time = time.time()
+        table = self._current_table()
+        normalized_text = analyze_text(detected_text).normalized
+
+        alias_hits = []
+        keyword_spans = []
+        for start, end, pattern in table.automaton.iter_matches(normalized_text):
+            if pattern in table.keywords:
+                keyword_spans.append((start, end))
+            else:
+                alias_hits.append((start, end, pattern))
+
+        candidates = {}  # şirket -> aday
+        for start, end, alias in alias_hits:
+            if alias in table.alias_has_keyword:
+                proximity = 1.0
+            elif keyword_spans:
+                gap = min(max(0, keyword_start - end, start - keyword_end)
+                          for keyword_start, keyword_end in keyword_spans)
+                proximity = max(0.0, 1.0 - gap / self.proximity_window)
+            else:
+                proximity = 0.0
+
+            specificity = min(1.0, len(alias) / SPECIFIC_ALIAS_LENGTH)
+            hit_score = PROXIMITY_WEIGHT * proximity + SPECIFICITY_WEIGHT * specificity
+
+            company_name = table.companies[alias]
+            candidate = candidates.get(company_name)
+            if candidate is None:
+                candidates[company_name] = candidate = {
+                    'company': company_name, 'score': 0.0, 'alias': alias, 'position': start, 'hits': 0
+                }
+            candidate['hits'] += 1
+            if hit_score > candidate['score']:
+                candidate.update(score=hit_score, alias=alias, position=start)
+
+        ranked = []
+        for candidate in candidates.values():
+            bonus = REPEAT_BONUS * min(candidate['hits'] - 1, 3)
+            candidate['score'] = round(min(1.0, candidate['score'] + bonus), 3)
+            ranked.append(candidate)
+        ranked.sort(key=lambda candidate: (-candidate['score'], candidate['position']))
+
+        best = ranked[0] if ranked and ranked[0]['score'] >= self.min_score else None
+
+        with self._lock:
+            self.stats['detections'] += 1
+            self.stats['found' if best else 'not_found'] += 1
+            self.stats['detect_seconds_total'] += time.time() - start_time
+
+        return {
+            'company': best['company'] if best else None,
+            'score': best['score'] if best else (ranked[0]['score'] if ranked else 0.0),
+            'alias': best['alias'] if best else None,
+            'position': best['position'] if best else None,
+            'candidates': ranked[:5]
+        }
+
+    def get_stats(self):
+        """Tablo bilgisi ve tespit sayaçları"""
+        table = self._current_table()
+        with self._lock:
+            stats = dict(self.stats)
+
+        detections = stats['detections']
+        stats['avg_detect_ms'] = round(stats.pop('detect_seconds_total') / detections * 1000, 3) if detections else 0.0
+        stats.update({
+            'source': table.source,
+            'configured_source': self.source,
+            'version': table.version,
+            'aliases': len(table.companies),
+            'companies': len(set(table.companies.values())),
+            'keywords': sorted(table.keywords),
+            'loaded_at': table.loaded_at,
+            'min_score': self.min_score,
+            'proximity_window': self.proximity_window
+        })
+        return stats
+
+
+# Global instance
+insurer_detector = InsurerDetector()
+
+
+def get_insurer_detector():
+    """Global sigorta şirketi dedektörünü döndür"""
+    return insurer_detector
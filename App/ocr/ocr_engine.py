@@ -2,220 +2,48 @@
 DOSYA: ocr/ocr_engine.py
 AMAÇ: Ana OCR motoru - PDF'leri işleyip metin çıkaran ana modül
 - İki aşamalı OCR sistemi: Hızlı (2-3s) → Advanced (17s, sadece gerekirse)
-- Tesseract path düzeltmesi
-- Sadece ilk sayfa işleme
+- Dijital PDF'lerde metin katmanı varsa OCR hiç çalışmaz (milisaniyeler)
+- Temiz okunmuş ama ismi içermeyen sayfalarda advanced aşama atlanabilir (geçit politikası)
+- Tesseract yolu (TESSERACT_PATH) ve kurulum / GPU kontrolleri ilk kullanımda, import anında değil
+- Kalıcı Tesseract handle havuzu (her çağrıda model yükleme yok)
+- Sadece ilk sayfa işleme (önce üst bant, gerekirse tam sayfa)
 - Entegre performance monitoring
 - Öncelikli çoklu isim arama algoritması
+- OCR hatalı isimler için sınırlı mesafeli fuzzy eşleşme (hızlı aşamada advanced'e geçmeden kabul)
+- Tek doküman + N aday isim: tek OCR geçişi, tüm adaylar tek taramada puanlanır
 """
-import pdf2image
-import re
 import os
 import time
 import psutil
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from PIL import Image
-import pytesseract
-
-# ============ OPTIONAL IMPORTS (Python 3.13 uyumlu) ============
-try:
-    import torch
-    TORCH_AVAILABLE = True
-    print("✅ PyTorch kullanılabilir")
-except ImportError as e:
-    TORCH_AVAILABLE = False
-    print(f"⚠️ PyTorch kullanılamıyor: {e}")
-
-try:
-    import cv2
-    import numpy as np
-    CV2_AVAILABLE = True
-    print("✅ OpenCV kullanılabilir - Advanced preprocessing aktif")
-except ImportError as e:
-    CV2_AVAILABLE = False
-    print(f"⚠️ OpenCV kullanılamıyor: {e}")
-    print("📝 PIL-only preprocessing aktif")
-
-# ============ PREPROCESSING FONKSİYONLARI ============
-def enhance_image_with_pil(image):
-    """
-    PIL ile basit görüntü iyileştirme (OpenCV olmadan)
-    """
-    try:
-        from PIL import ImageEnhance, ImageFilter
-
-        print("📸 PIL preprocessing başlıyor...")
-
-        # 1. Upscaling
-        width, height = image.size
-        upscaled = image.resize((width * 2, height * 2), Image.LANCZOS)
-        print(f"🔍 2x büyütme: {width}x{height} -> {width*2}x{height*2}")
-
-        # 2. Sharpness enhancement
-        enhancer = ImageEnhance.Sharpness(upscaled)
-        sharpened = enhancer.enhance(1.5)
-
-        # 3. Contrast enhancement
-        enhancer = ImageEnhance.Contrast(sharpened)
-        contrasted = enhancer.enhance(1.3)
-
-        # 4. Brightness adjustment
-        enhancer = ImageEnhance.Brightness(contrasted)
-        brightened = enhancer.enhance(1.1)
-
-        # 5. Noise reduction
-        filtered = brightened.filter(ImageFilter.MedianFilter(size=3))
-
-        print("✅ PIL preprocessing tamamlandı")
-        return filtered
-
-    except Exception as e:
-        print(f"⚠️ PIL preprocessing hatası: {e}")
-        return image
-
-def preprocess_image_advanced(image):
-    """
-    🔧 Gelişmiş görüntü ön işleme - OpenCV gerekli
-    """
-
-    if not CV2_AVAILABLE:
-        print("📸 OpenCV yok, PIL preprocessing...")
-        return enhance_image_with_pil(image)
-
-    if isinstance(image, Image.Image):
-        img_array = np.array(image)
-        if len(img_array.shape) == 3:
-            img_cv = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-        else:
-            img_cv = img_array
-    else:
-        img_cv = image
-
-    print("📸 OpenCV görüntü ön işleme başlıyor...")
-
-    # 1. Gri tonlamaya çevir
-    if len(img_cv.shape) == 3:
-        gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
-    else:
-        gray = img_cv.copy()
-
-    # 2. Gürültü azaltma (Gaussian Blur)
-    denoised = cv2.GaussianBlur(gray, (3, 3), 0)
-
-    # 3. Kontrast artırma (CLAHE)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(denoised)
-
-    # 4. Rotation detection ve correction
-    corrected = detect_and_correct_rotation(enhanced)
-
-    # 5. Deskewing (eğim düzeltme)
-    deskewed = deskew_image(corrected)
-
-    # 6. Adaptive thresholding
-    thresh = cv2.adaptiveThreshold(
-        deskewed, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-    )
-
-    # 7. Morphological operations
-    kernel = np.ones((1, 1), np.uint8)
-    cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-    cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, kernel)
-
-    print("✅ OpenCV preprocessing tamamlandı")
-
-    # OpenCV'den PIL'e geri çevir
-    processed_image = Image.fromarray(cleaned)
-    return processed_image
-
-def detect_and_correct_rotation(image):
-    """🔄 Rotation detection ve düzeltme - OpenCV gerekli"""
-    if not CV2_AVAILABLE:
-        return image
-
-    try:
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150, apertureSize=3)
-
-        # Hough Line Transform ile çizgileri tespit et
-        lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold=100)
-
-        if lines is not None:
-            angles = []
-            for rho, theta in lines[:10]:
-                angle = theta * 180 / np.pi
-                if 45 <= angle <= 135:
-                    angles.append(angle - 90)
-                elif angle < 45:
-                    angles.append(angle)
-                elif angle > 135:
-                    angles.append(angle - 180)
-
-            if angles:
-                median_angle = np.median(angles)
-                if abs(median_angle) > 0.5:
-                    print(f"🔄 Rotation düzeltiliyor: {median_angle:.1f}°")
-                    (h, w) = image.shape[:2]
-                    center = (w // 2, h // 2)
-                    M = cv2.getRotationMatrix2D(center, median_angle, 1.0)
-                    rotated = cv2.warpAffine(image, M, (w, h),
-                                             flags=cv2.INTER_CUBIC,
-                                             borderMode=cv2.BORDER_REPLICATE)
-                    return rotated
-        return image
-    except Exception as e:
-        print(f"⚠️ Rotation detection hatası: {e}")
-        return image
-
-def deskew_image(image):
-    """📐 Deskewing - OpenCV gerekli"""
-    if not CV2_AVAILABLE:
-        return image
-
+from App.ocr.engine_pool import get_engine_pool
+from App.ocr.pdf_text_layer import extract_text_layer, is_usable_text_layer
+from App.ocr.pdf_render import get_page_size_points, render_page_band
+from App.ocr.dpi_policy import choose_render_settings
+from App.ocr.preprocessing import CV2_AVAILABLE
+from App.ocr.page_context import PageContext
+from App.ocr.cascade_gate import get_cascade_gate
+from App.ocr.fuzzy_match import tokenize, fuzzy_find_name
+from App.ocr.text_analysis import normalize_turkish_text, normalized_name_parts, analyze_text, MATCH_LEVEL_SCORES
+from App.ocr.insurer_detector import get_insurer_detector
+from App.ocr.tesseract_setup import get_tesseract_status, is_tesseract_available, get_ocr_lang
+from App.utils.config import Config
+from App.utils.startup_report import record_step
+
+# ============ GPU (LAZY) ============
+# PyTorch import'u saniyeler sürebilir; sadece GPU bilgisi ilk istendiğinde yüklenir
+_gpu_status = None
+_gpu_lock = threading.Lock()
+
+def get_torch():
+    """PyTorch modülü (yoksa None)"""
     try:
-        coords = np.column_stack(np.where(image > 0))
-        if len(coords) < 4:
-            return image
-
-        angle = cv2.minAreaRect(coords)[-1]
-        if angle < -45:
-            angle = -(90 + angle)
-        else:
-            angle = -angle
-
-        if abs(angle) > 0.5:
-            print(f"📐 Deskewing: {angle:.1f}°")
-            (h, w) = image.shape[:2]
-            center = (w // 2, h // 2)
-            M = cv2.getRotationMatrix2D(center, angle, 1.0)
-            rotated = cv2.warpAffine(image, M, (w, h),
-                                     flags=cv2.INTER_CUBIC,
-                                     borderMode=cv2.BORDER_REPLICATE)
-            return rotated
-        return image
-    except Exception as e:
-        print(f"⚠️ Deskewing hatası: {e}")
-        return image
-
-def upscale_image(image, scale_factor=2):
-    """🔍 Görüntüyü büyütme - PIL ile"""
-    try:
-        if isinstance(image, Image.Image):
-            width, height = image.size
-            new_size = (width * scale_factor, height * scale_factor)
-            upscaled = image.resize(new_size, Image.LANCZOS)
-            print(f"🔍 PIL ile {scale_factor}x büyütme")
-            return upscaled
-        elif CV2_AVAILABLE:
-            # OpenCV array
-            height, width = image.shape[:2]
-            upscaled = cv2.resize(image, (width * scale_factor, height * scale_factor),
-                                  interpolation=cv2.INTER_CUBIC)
-            return upscaled
-        return image
-    except Exception as e:
-        print(f"⚠️ Upscaling hatası: {e}")
-        return image
+        import torch
+        return torch
+    except ImportError:
+        return None
 
 # ============ PERFORMANCE MONITORING ============
 class SimplePerformanceMonitor:
@@ -234,21 +62,8 @@ class SimplePerformanceMonitor:
             'avg_memory': 0
         }
 
-        self.gpu_available = False
-        if TORCH_AVAILABLE:
-            try:
-                import GPUtil
-                self.gpu_available = True
-                self.gpu_lib = "GPUtil"
-                print("✅ GPU monitoring aktif (GPUtil)")
-            except ImportError:
-                try:
-                    if torch.cuda.is_available():
-                        self.gpu_available = True
-                        self.gpu_lib = "torch"
-                        print("✅ GPU monitoring aktif (torch)")
-                except:
-                    print("⚠️ GPU monitoring devre dışı")
+        # GPU monitoring kütüphanesi süreç başına bir kez, ilk raporda belirlenir
+        self.gpu_lib = None
 
     def start_monitoring(self):
         """Performance monitoring başlat"""
@@ -289,16 +104,13 @@ class SimplePerformanceMonitor:
     def _calculate_stats(self):
         """İstatistikleri hesapla"""
         if self.stats['cpu_usage']:
-            if CV2_AVAILABLE:
-                self.stats['avg_cpu'] = np.mean(self.stats['cpu_usage'])
-                self.stats['avg_memory'] = np.mean(self.stats['memory_usage'])
-            else:
-                self.stats['avg_cpu'] = sum(self.stats['cpu_usage']) / len(self.stats['cpu_usage'])
-                self.stats['avg_memory'] = sum(self.stats['memory_usage']) / len(self.stats['memory_usage'])
+            self.stats['avg_cpu'] = sum(self.stats['cpu_usage']) / len(self.stats['cpu_usage'])
+            self.stats['avg_memory'] = sum(self.stats['memory_usage']) / len(self.stats['memory_usage'])
 
     def get_gpu_info(self):
         """GPU bilgilerini al"""
-        if not self.gpu_available or not TORCH_AVAILABLE:
+        self.gpu_lib = get_gpu_status()['monitor_lib']
+        if not self.gpu_lib:
             return None
 
         try:
@@ -315,6 +127,7 @@ class SimplePerformanceMonitor:
                         'temperature': gpu.temperature
                     }
             elif self.gpu_lib == "torch":
+                torch = get_torch()
                 if torch.cuda.is_available():
                     return {
                         'name': torch.cuda.get_device_name(0),
@@ -362,31 +175,23 @@ class SimplePerformanceMonitor:
 
         print("=" * 60)
 
-# ============ TESSERACT PATH AYARI ============
-pytesseract.pytesseract.tesseract_cmd = r'C:/Users/ahmetruchan.avci/AppData/Local/Programs/Tesseract-OCR/tesseract.exe'
-print("🔧 Tesseract path ayarlandı!")
+# ============ TESSERACT / GPU KONTROLLERİ ============
+def warm_engine_pool():
+    """Worker başlarken kullanılacak dil için Tesseract handle'ını önceden yükle"""
+    if not is_tesseract_available():
+        return False
 
-def check_tesseract_setup():
-    """Tesseract kurulumunu kontrol et"""
+    lang = get_ocr_lang()
     try:
-        version = pytesseract.get_tesseract_version()
-        print(f"✅ Tesseract {version} hazır!")
-
-        languages = pytesseract.get_languages()
-        if 'tur' in languages:
-            return True, True
-        else:
-            return True, False
-
+        return get_engine_pool().warm(lang)
     except Exception as e:
-        print(f"❌ Tesseract test hatası: {e}")
-        return False, False
-
-TESSERACT_OK, TURKISH_OK = check_tesseract_setup()
+        print(f"⚠️ Engine pool ısıtma hatası: {e}")
+        return False
 
 def check_gpu_availability():
     """GPU kullanılabilirliğini kontrol et - PyTorch varsa"""
-    if not TORCH_AVAILABLE:
+    torch = get_torch()
+    if torch is None:
         print("⚠️ PyTorch yok - GPU kontrolü atlanıyor")
         return False, None, None
 
@@ -417,30 +222,44 @@ def check_gpu_availability():
         print(f"❌ GPU kontrolünde hata: {e}")
         return False, None, None
 
-# ============ İSİM ARAMA FONKSİYONLARI ============
-def normalize_turkish_text(text):
-    """Türkçe karakterleri normalize et"""
-    if not text:
-        return ""
-
-    turkish_chars = {
-        'ç': 'c', 'Ç': 'c', 'ğ': 'g', 'Ğ': 'g',
-        'ı': 'i', 'I': 'i', 'İ': 'i', 'ö': 'o', 'Ö': 'o',
-        'ş': 's', 'Ş': 's', 'ü': 'u', 'Ü': 'u'
-    }
-
-    normalized = text.lower()
-    for turkish_char, ascii_char in turkish_chars.items():
-        normalized = normalized.replace(turkish_char.lower(), ascii_char)
+def get_gpu_status():
+    """
+    GPU durumu (ilk çağrıda kontrol edilir, OCR_GPU_ENABLED kapalıysa PyTorch hiç yüklenmez)
 
-    return re.sub(r'\s+', ' ', normalized).strip()
+    DÖNEN DEĞER:
+        dict: available, name, cuda_version, monitor_lib (GPUtil / torch / None)
+    """
+    global _gpu_status
+
+    if _gpu_status is not None:
+        return _gpu_status
+
+    with _gpu_lock:
+        if _gpu_status is None:
+            status = {'available': False, 'name': None, 'cuda_version': None, 'monitor_lib': None}
+            start = time.perf_counter()
+
+            if Config.OCR_GPU_ENABLED:
+                available, name, cuda_version = check_gpu_availability()
+                status.update(available=available, name=name, cuda_version=cuda_version)
+                if available:
+                    try:
+                        import GPUtil
+                        status['monitor_lib'] = "GPUtil"
+                    except ImportError:
+                        status['monitor_lib'] = "torch"
+                    print(f"✅ GPU monitoring aktif ({status['monitor_lib']})")
+
+            record_step('gpu_probe', time.perf_counter() - start)
+            _gpu_status = status
+        return _gpu_status
 
+# ============ İSİM ARAMA FONKSİYONLARI ============
 def search_name_tolerant(detected_text, search_name):
     """Öncelikli çoklu isim arama"""
-    normalized_text = normalize_turkish_text(detected_text)
-    normalized_search = normalize_turkish_text(search_name)
-
-    name_parts = normalized_search.split()
+    normalized_text = analyze_text(detected_text).normalized
+    name_parts = normalized_name_parts(search_name)
+    normalized_search = ' '.join(name_parts)
     num_parts = len(name_parts)
 
     print(f"\n🔎 Arama Stratejisi ({num_parts} isimli):")
@@ -489,9 +308,9 @@ def search_name_tolerant(detected_text, search_name):
 
 def search_with_priority(detected_text, search_name):
     """Hızlı öncelikli arama (early exit)"""
-    normalized_text = normalize_turkish_text(detected_text)
-    normalized_search = normalize_turkish_text(search_name)
-    name_parts = normalized_search.split()
+    normalized_text = analyze_text(detected_text).normalized
+    name_parts = normalized_name_parts(search_name)
+    normalized_search = ' '.join(name_parts)
     num_parts = len(name_parts)
 
     # Tek isim
@@ -524,68 +343,198 @@ def search_with_priority(detected_text, search_name):
 
     return False
 
-def search_insurance_company(detected_text):
-    """Sigorta şirketi arama"""
-    insurance_companies = {
-        "allianz": "Allianz Sigorta",
-        "allianzsigorta": "Allianz Sigorta",
-        "ALLİANZ": "Allianz Sigorta",
-        "alli": "Allianz Sigorta",
-        "alianz": "Allianz Sigorta",
-        "ALIANZ": "Allianz Sigorta",
-        "ALIA": "Allianz Sigorta",
-        "bupa": "BUPA ACIBADEM Sigorta",
-        "acıbadem": "BUPA ACIBADEM Sigorta",
-        "acibadem": "BUPA ACIBADEM Sigorta",
-        "axa": "AXA Sigorta",
-        "anadolu": "Anadolu Sigorta",
-        "aksigorta": "AkSigorta",
-        "mapfre": "Mapfre Sigorta",
-        "sompo": "Sompo Sigorta",
-        "zurich": "Zurich Sigorta",
-        "generali": "Generali Sigorta",
-        "groupama": "Groupama Sigorta",
-        "ray": "Ray Sigorta",
-        "vakıf": "VakıfBank Sigorta",
-        "vakif": "VakıfBank Sigorta",
-        "vakifbank": "VakıfBank Sigorta",
-        "vakıfbank": "VakıfBank Sigorta",
-        "medisa": "Medisa Sigorta",
-        "medline": "Medline Sigorta",
-        "hdi": "HDI Sigorta",
-        "ergo": "ERGO Sigorta",
-        "eureko": "Eureko Sigorta",
-        "aviva": "Aviva Sigorta",
-        "gulf": "Gulf Sigorta",
-        "neova": "Neova Sigorta",
-        "ziraat": "Ziraat Sigorta",
-        "halk": "Halk Sigorta",
-        "güneş": "Güneş Sigorta",
-        "gunes": "Güneş Sigorta",
-        "TURKİYE": "TURKİYE Sigorta",
-        "türkiye": "TURKİYE Sigorta",
-        "turkiye": "TURKİYE Sigorta",
+# Çoklu isim eşleştirme seviyeleri (search_name_tolerant ile aynı öncelik sırası)
+def name_match_level(ngrams, name_parts):
+    """
+    Tek ismin eşleşme seviyesi (kelime sınırlarında)
+
+    DÖNEN DEĞER:
+        tuple: (seviye veya None, eşleşen metin veya None)
+    """
+    num_parts = len(name_parts)
+    if num_parts == 0:
+        return None, None
+
+    full_name = ' '.join(name_parts)
+    if full_name in ngrams:
+        return 'full', full_name
+
+    if num_parts >= 3:
+        for i in range(2):
+            combo = ' '.join(name_parts[i:i + num_parts - 1])
+            if combo in ngrams:
+                return 'n-1', combo
+
+        for i in range(num_parts - 1):
+            combo = f"{name_parts[i]} {name_parts[i + 1]}"
+            if combo in ngrams:
+                return 'pair', combo
+
+    for part in name_parts:
+        if part in ngrams:
+            return 'single', part
+
+    return None, None
+
+def match_candidate_names(detected_text, candidate_names):
+    """
+    Aday isimlerin hepsini metnin tek normalize + n-gram taramasıyla puanla
+
+    DÖNEN DEĞER:
+        dict: candidates (isim başına seviye/puan), best_name, best_level, ambiguous
+    """
+    parts_by_name = {name: normalized_name_parts(name) for name in candidate_names}
+    max_n = max((len(parts) for parts in parts_by_name.values()), default=1)
+    ngrams = analyze_text(detected_text).ngrams(max_n)
+
+    candidates = []
+    for name in candidate_names:
+        level, matched_text = name_match_level(ngrams, parts_by_name[name])
+        candidates.append({
+            'name': name,
+            'match_level': level,
+            'matched_text': matched_text,
+            'score': MATCH_LEVEL_SCORES.get(level, 0.0)
+        })
+
+    best_score = max((candidate['score'] for candidate in candidates), default=0.0)
+    best = [candidate for candidate in candidates if best_score > 0 and candidate['score'] == best_score]
+
+    return {
+        'candidates': candidates,
+        'best_name': best[0]['name'] if len(best) == 1 else None,
+        'best_level': best[0]['match_level'] if best else None,
+        'ambiguous': len(best) > 1
     }
 
-    normalized_text = normalize_turkish_text(detected_text)
+def detect_insurance_company(detected_text):
+    """Sigorta şirketi tespiti (puan ve adaylarla, bkz. insurer_detector)"""
+    return get_insurer_detector().detect(detected_text)
 
-    for key, company_name in insurance_companies.items():
-        normalized_key = normalize_turkish_text(key)
-        if normalized_key in normalized_text:
-            print(f"   ✅ Sigorta şirketi bulundu: {company_name}")
-            search_area = normalized_text[max(0, normalized_text.find(normalized_key) - 50):
-                                          normalized_text.find(normalized_key) + 50]
-            if "sigorta" in search_area or "insurance" in search_area:
-                return company_name
+def search_insurance_company(detected_text):
+    """Sigorta şirketi arama (en yüksek puanlı şirket adı veya None)"""
+    detection = detect_insurance_company(detected_text)
+
+    if detection['company']:
+        print(f"   ✅ Sigorta şirketi bulundu: {detection['company']} "
+              f"(puan {detection['score']:.2f}, '{detection['alias']}')")
+        return detection['company']
 
     print("   ❌ Sigorta şirketi bulunamadı")
     return None
 
+def locate_name_words(words, search_name):
+    """
+    İsmin parçalarıyla eşleşen kelimelerin konum ve güvenini getir
+
+    DÖNEN DEĞER:
+        list: {'text', 'name_part', 'left', 'top', 'width', 'height', 'confidence', 'line'}
+    """
+    name_parts = [part for part in normalized_name_parts(search_name) if len(part) >= 2]
+    matched_words = []
+
+    for word in words:
+        normalized_word = normalize_turkish_text(word['text'])
+        for part in name_parts:
+            if part in normalized_word:
+                matched_word = dict(word)
+                matched_word['name_part'] = part
+                matched_words.append(matched_word)
+                break
+
+    return matched_words
+
+def confidence_summary(stage_result):
+    """Aşama sonucunun güven özeti (processing_info için)"""
+    if not stage_result:
+        return None
+    return {
+        'mean_confidence': stage_result['mean_confidence'],
+        'median_confidence': stage_result['median_confidence'],
+        'word_count': stage_result['word_count']
+    }
+
+def locate_fuzzy_words(words, fuzzy_match):
+    """Fuzzy eşleşmenin token'larına karşılık gelen OCR kelimeleri (name_part ile)"""
+    part_by_token = {part['token']: part['part'] for part in fuzzy_match['parts']}
+    matched_words = []
+
+    for word in words:
+        for token, _ in tokenize(normalize_turkish_text(word['text'])):
+            if token in part_by_token:
+                matched_words.append(dict(word, name_part=part_by_token[token]))
+                break
+
+    return matched_words
+
+def find_fuzzy_name_match(ocr_page, expected_name):
+    """
+    Birebir bulunamayan ismi sınırlı düzenleme mesafesiyle ara
+
+    Kabul kararı eşleşen OCR kelimelerinin ortalama güvenine göre verilir.
+
+    DÖNEN DEĞER:
+        tuple veya None: (fuzzy_find_name çıktısı + confidence / accepted, eşleşen OCR kelimeleri)
+    """
+    tokens = analyze_text(ocr_page['text']).token_positions
+    fuzzy_match = fuzzy_find_name(tokens, normalized_name_parts(expected_name))
+    if fuzzy_match is None:
+        return None
+
+    matched_words = locate_fuzzy_words(ocr_page['words'], fuzzy_match)
+    confidences = [word['confidence'] for word in matched_words]
+    fuzzy_match['confidence'] = round(sum(confidences) / len(confidences), 1) if confidences else None
+    fuzzy_match['accepted'] = fuzzy_match['confidence'] is not None and \
+        fuzzy_match['confidence'] >= Config.OCR_FUZZY_MIN_CONFIDENCE
+    return fuzzy_match, matched_words
+
+def build_stage_result(ocr_page, expected_name, method, processing_time, allow_fuzzy=False):
+    """
+    Kelime seviyesindeki OCR geçişinden aşama sonucu oluştur
+
+    allow_fuzzy: Birebir eşleşme yoksa güveni yeterli fuzzy eşleşme kabul edilir (hızlı aşama)
+    """
+    detected_text = ocr_page['text']
+    found_name = search_name_tolerant(detected_text, expected_name)
+    match_type = 'exact' if found_name else None
+    matched_words = locate_name_words(ocr_page['words'], expected_name) if found_name else []
+    fuzzy_match = None
+
+    if not found_name and allow_fuzzy and Config.OCR_FUZZY_ENABLED:
+        fuzzy_result = find_fuzzy_name_match(ocr_page, expected_name)
+        if fuzzy_result:
+            fuzzy_match, fuzzy_words = fuzzy_result
+            print(f"   🔤 Fuzzy eşleşme: '{fuzzy_match['matched_text']}' (mesafe {fuzzy_match['distance']}, "
+                  f"güven {fuzzy_match['confidence']}) - {'kabul' if fuzzy_match['accepted'] else 'red'}")
+            if fuzzy_match['accepted']:
+                found_name = expected_name
+                match_type = 'fuzzy'
+                matched_words = fuzzy_words
+
+    return {
+        'text': detected_text,
+        'found_name': found_name,
+        'match_found': (found_name == expected_name),
+        'match_type': match_type,
+        'fuzzy_match': fuzzy_match,
+        'method': method,
+        'processing_time': processing_time,
+        'text_length': len(detected_text),
+        'words': ocr_page['words'],
+        'matched_words': matched_words,
+        'mean_confidence': ocr_page['mean_confidence'],
+        'median_confidence': ocr_page['median_confidence'],
+        'word_count': ocr_page['word_count']
+    }
+
 # ============ İKİ AŞAMALI OCR SİSTEMİ ============
-def run_ocr_fast(expected_name, page):
+# Advanced aşamada Türkçe karakter whitelist'i
+TURKISH_WHITELIST = 'ABCÇDEFGĞHIİJKLMNOÖPRSŞTUÜVYZabcçdefgğhıijklmnoöprsştuüvyz0123456789 .,-'
+
+def run_ocr_fast(expected_name, page, scale_factor=2):
     """
     🚀 HIZLI OCR - İlk aşama (2-3 saniye)
-    - Basit upscaling
+    - Basit upscaling (DPI politikasının seçtiği oranda)
     - Tek PSM mode
     - Minimal preprocessing
     """
@@ -593,47 +542,176 @@ def run_ocr_fast(expected_name, page):
     fast_start_time = time.time()
 
     try:
-        # Basit upscaling (PIL ile)
-        upscaled_page = upscale_image(page, scale_factor=2)
-
-        # Hızlı OCR (tek PSM mode)
-        if TURKISH_OK:
-            detected_text = pytesseract.image_to_string(
-                upscaled_page,
-                lang='tur+eng',
-                config='--psm 6'
-            )
-            lang_used = "tur+eng (PSM 6 - Fast)"
-        else:
-            detected_text = pytesseract.image_to_string(
-                upscaled_page,
-                lang='eng',
-                config='--psm 6'
-            )
-            lang_used = "eng (PSM 6 - Fast)"
+        # Basit upscaling (sayfa bağlamında bir kez hesaplanır, advanced aşama da kullanır)
+        page_context = PageContext.ensure(page, upscale_factor=scale_factor)
+
+        # Hızlı OCR (tek PSM mode, havuzdaki kalıcı handle ile, kelime + güven)
+        lang = get_ocr_lang()
+        ocr_page = page_context.ocr_pass('upscaled', 6, lang)
+        lang_used = f"{lang} (PSM 6 - Fast)"
 
         fast_time = time.time() - fast_start_time
 
         # İsim arama
-        found_name = search_name_tolerant(detected_text, expected_name)
-        match_found = (found_name == expected_name)
+        result = build_stage_result(ocr_page, expected_name, lang_used, fast_time, allow_fuzzy=True)
 
-        print(f"⚡ Hızlı OCR sonucu: {fast_time:.1f}s, Bulunan: {'✅' if match_found else '❌'}")
+        print(f"⚡ Hızlı OCR sonucu: {fast_time:.1f}s, Güven: {result['mean_confidence']:.0f}, "
+              f"Bulunan: {'✅' if result['match_found'] else '❌'}")
 
-        return {
-            'text': detected_text,
-            'found_name': found_name,
-            'match_found': match_found,
-            'method': lang_used,
-            'processing_time': fast_time,
-            'text_length': len(detected_text)
-        }
+        return result
 
     except Exception as e:
         print(f"❌ Hızlı OCR hatası: {e}")
         return None
 
-def run_ocr_advanced(expected_name, page):
+# Advanced aşamada denenen PSM modları (öncelik sırasıyla)
+PSM_MODES = [
+    (6, "Uniform block"),
+    (1, "Auto page segmentation"),
+    (3, "Full auto segmentation"),
+    (11, "Sparse text"),
+    (12, "Sparse text with OSD"),
+    (8, "Single word")
+]
+
+_psm_executor = None
+_psm_executor_lock = threading.Lock()
+
+def get_psm_executor():
+    """PSM fan-out için süreç başına tek, sınırlı thread havuzu"""
+    global _psm_executor
+
+    with _psm_executor_lock:
+        if _psm_executor is None:
+            _psm_executor = ThreadPoolExecutor(
+                max_workers=Config.OCR_PSM_PARALLELISM,
+                thread_name_prefix="psm"
+            )
+        return _psm_executor
+
+def run_psm_attempt(page_context, psm_mode, lang, variables, cancel_event=None, timeout=0):
+    """Tek PSM denemesi - iptal edilmişse OCR'a hiç başlamaz; timeout saniyede kesilir"""
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+
+    return page_context.ocr_pass('binarized', psm_mode, lang, variables, timeout=timeout)
+
+def select_best_pass(passes):
+    """
+    Eşleşme yoksa en güvenilir geçişi seç
+    - Anlamlı metin (>10 karakter) üreten geçişler arasında ortalama kelime güveni
+    - Eşitlikte daha çok kelime, sonra PSM öncelik sırası
+    """
+    best_page = None
+    best_psm = None
+
+    for psm_mode, _ in PSM_MODES:
+        ocr_page = passes.get(psm_mode)
+        if ocr_page is None or len(ocr_page['text'].strip()) <= 10:
+            continue
+        if best_page is None or (
+            (ocr_page['mean_confidence'], ocr_page['word_count']) >
+            (best_page['mean_confidence'], best_page['word_count'])
+        ):
+            best_page = ocr_page
+            best_psm = psm_mode
+
+    return best_page, best_psm
+
+def run_psm_modes_serial(is_match, page_context, lang, variables):
+    """PSM modlarını sırayla dene, is_match(metin) doğru olunca dur"""
+    passes = {}
+
+    for psm_mode, description in PSM_MODES:
+        try:
+            ocr_page = run_psm_attempt(page_context, psm_mode, lang, variables)
+            lang_used = f"{lang} (PSM {psm_mode} - Advanced)"
+
+            text_length = len(ocr_page['text'].strip())
+
+            # Early exit if name found
+            if text_length > 10 and is_match(ocr_page['text']):
+                print(f"✅ Advanced OCR'da isim bulundu - {description}")
+                return ocr_page, f"{lang_used} - SUCCESS"
+
+            passes[psm_mode] = ocr_page
+            print(f"📊 Advanced PSM {psm_mode}: {text_length} karakter, güven {ocr_page['mean_confidence']:.0f}")
+
+        except Exception as psm_error:
+            print(f"⚠️ Advanced PSM {psm_mode} hatası: {psm_error}")
+            continue
+
+    best_page, best_psm = select_best_pass(passes)
+    if best_page is None:
+        return None, None
+    return best_page, f"{lang} (PSM {best_psm} - Advanced)"
+
+def run_psm_modes_parallel(is_match, page_context, lang, variables):
+    """
+    PSM modlarını eşzamanlı dene
+    - İlk isim eşleşmesinde henüz başlamamış denemeler iptal edilir
+    - Eşleşme yoksa serial moddaki gibi en güvenilir geçiş kazanır
+
+    SINIRLAMA: O anda çalışmakta olan Tesseract çağrıları yarıda kesilemez (tesserocr
+    dışarıdan iptal sağlamaz, thread öldürülemez); sonuçları yok sayılır ama bitene kadar
+    handle ve CPU tutarlar. Her deneme OCR_PSM_ATTEMPT_TIMEOUT ile sınırlıdır, bu süre
+    dolunca Tesseract içinde kesilir - boşa harcanan iş en fazla bu kadar olur.
+    """
+    executor = get_psm_executor()
+    cancel_event = threading.Event()
+    timeout = Config.OCR_PSM_ATTEMPT_TIMEOUT
+
+    futures = {
+        executor.submit(run_psm_attempt, page_context, psm_mode, lang, variables, cancel_event, timeout):
+            (psm_mode, description)
+        for psm_mode, description in PSM_MODES
+    }
+    passes = {}
+
+    try:
+        for future in as_completed(futures):
+            psm_mode, description = futures[future]
+            try:
+                ocr_page = future.result()
+            except Exception as psm_error:
+                print(f"⚠️ Advanced PSM {psm_mode} hatası: {psm_error}")
+                continue
+
+            if ocr_page is None:
+                continue
+
+            lang_used = f"{lang} (PSM {psm_mode} - Advanced)"
+            text_length = len(ocr_page['text'].strip())
+
+            if text_length > 10 and is_match(ocr_page['text']):
+                print(f"✅ Advanced OCR'da isim bulundu - {description} (paralel)")
+                return ocr_page, f"{lang_used} - SUCCESS"
+
+            passes[psm_mode] = ocr_page
+            print(f"📊 Advanced PSM {psm_mode}: {text_length} karakter, güven {ocr_page['mean_confidence']:.0f}")
+    finally:
+        # Henüz başlamamış denemeleri iptal et; çalışanlar kesilemez, sonuçları yok sayılır
+        # (en geç OCR_PSM_ATTEMPT_TIMEOUT'ta biterler)
+        cancel_event.set()
+        for future in futures:
+            future.cancel()
+
+    # Eşleşme yok - en güvenilir geçiş
+    best_page, best_psm = select_best_pass(passes)
+    if best_page is None:
+        return None, None
+    return best_page, f"{lang} (PSM {best_psm} - Advanced)"
+
+def run_psm_modes(is_match, page_context, lang, variables):
+    """OCR_PSM_PARALLELISM'e göre PSM modlarını sıralı veya paralel dene"""
+    if Config.OCR_PSM_PARALLELISM > 1:
+        print(f"📖 Paralel PSM stratejisi ({Config.OCR_PSM_PARALLELISM} eşzamanlı)...")
+        return run_psm_modes_parallel(is_match, page_context, lang, variables)
+
+    print("📖 Çoklu PSM stratejisi...")
+    return run_psm_modes_serial(is_match, page_context, lang, variables)
+
+def run_ocr_advanced(expected_name, page, scale_factor=2):
     """
     🔧 ADVANCED OCR - İkinci aşama (15-20 saniye)
     - Full preprocessing (OpenCV veya PIL)
@@ -648,108 +726,44 @@ def run_ocr_advanced(expected_name, page):
         print("📸 Advanced preprocessing başlıyor...")
         preprocessing_start = time.time()
 
-        # Upscaling
-        upscaled_page = upscale_image(page, scale_factor=2)
+        # Upscaling hızlı aşamadan hazır gelir; ön işleme görünümü bir kez hesaplanır
+        page_context = PageContext.ensure(page, upscale_factor=scale_factor)
 
         # Advanced preprocessing (OpenCV varsa full, yoksa PIL)
-        processed_page = preprocess_image_advanced(upscaled_page)
+        page_context.binarized()
 
         preprocessing_time = time.time() - preprocessing_start
         print(f"📸 Advanced preprocessing: {preprocessing_time:.1f}s")
 
         # Çoklu PSM strategy
-        print("📖 Çoklu PSM stratejisi...")
-        psm_modes = [
-            (6, "Uniform block"),
-            (1, "Auto page segmentation"),
-            (3, "Full auto segmentation"),
-            (11, "Sparse text"),
-            (12, "Sparse text with OSD"),
-            (8, "Single word")
-        ]
-
-        best_result = None
-        best_confidence = 0
-        successful_method = None
-
-        for psm_mode, description in psm_modes:
-            try:
-                if TURKISH_OK:
-                    config_str = f'--psm {psm_mode} -c tessedit_char_whitelist=ABCÇDEFGĞHIİJKLMNOÖPRSŞTUÜVYZabcçdefgğhıijklmnoöprsştuüvyz0123456789 .,-'
-                    detected_text = pytesseract.image_to_string(
-                        processed_page,
-                        lang='tur+eng',
-                        config=config_str
-                    )
-                    lang_used = f"tur+eng (PSM {psm_mode} - Advanced)"
-                else:
-                    detected_text = pytesseract.image_to_string(
-                        processed_page,
-                        lang='eng',
-                        config=f'--psm {psm_mode}'
-                    )
-                    lang_used = f"eng (PSM {psm_mode} - Advanced)"
-
-                text_length = len(detected_text.strip())
-
-                # Early exit if name found
-                if text_length > 10 and search_with_priority(detected_text, expected_name):
-                    print(f"✅ Advanced OCR'da isim bulundu - {description}")
-                    best_result = detected_text
-                    successful_method = f"{lang_used} - SUCCESS"
-                    break
-
-                # Keep best result
-                if text_length > best_confidence:
-                    best_result = detected_text
-                    best_confidence = text_length
-                    successful_method = lang_used
-
-                print(f"📊 Advanced PSM {psm_mode}: {text_length} karakter")
+        # Aynı dil için tek handle, PSM her denemede canlı handle üzerinde değişir
+        lang = get_ocr_lang()
+        variables = {'tessedit_char_whitelist': TURKISH_WHITELIST} if get_tesseract_status()['turkish'] else None
 
-            except Exception as psm_error:
-                print(f"⚠️ Advanced PSM {psm_mode} hatası: {psm_error}")
-                continue
+        best_page, successful_method = run_psm_modes(
+            lambda text: search_with_priority(text, expected_name), page_context, lang, variables
+        )
 
         # Fallback: Original image
-        if not best_result or len(best_result.strip()) < 10:
+        if not best_page or len(best_page['text'].strip()) < 10:
             print("🔄 Advanced preprocessing başarısız, orijinal deneniyor...")
             try:
-                if TURKISH_OK:
-                    best_result = pytesseract.image_to_string(
-                        page,
-                        lang='tur+eng',
-                        config='--psm 1'
-                    )
-                    successful_method = "tur+eng (fallback original)"
-                else:
-                    best_result = pytesseract.image_to_string(
-                        page,
-                        lang='eng',
-                        config='--psm 1'
-                    )
-                    successful_method = "eng (fallback original)"
+                best_page = page_context.ocr_pass('original', 1, lang)
+                successful_method = f"{lang} (fallback original)"
             except Exception as fallback_error:
                 print(f"❌ Advanced fallback hatası: {fallback_error}")
                 return None
 
         advanced_time = time.time() - advanced_start_time
 
-        if best_result:
-            found_name = search_name_tolerant(best_result, expected_name)
-            match_found = (found_name == expected_name)
+        if best_page and best_page['text']:
+            result = build_stage_result(best_page, expected_name, successful_method, advanced_time)
+            result['preprocessing_time'] = preprocessing_time
 
-            print(f"🔧 Advanced OCR sonucu: {advanced_time:.1f}s, Bulunan: {'✅' if match_found else '❌'}")
+            print(f"🔧 Advanced OCR sonucu: {advanced_time:.1f}s, Güven: {result['mean_confidence']:.0f}, "
+                  f"Bulunan: {'✅' if result['match_found'] else '❌'}")
 
-            return {
-                'text': best_result,
-                'found_name': found_name,
-                'match_found': match_found,
-                'method': successful_method,
-                'processing_time': advanced_time,
-                'preprocessing_time': preprocessing_time,
-                'text_length': len(best_result)
-            }
+            return result
 
         return None
 
@@ -757,6 +771,37 @@ def run_ocr_advanced(expected_name, page):
         print(f"❌ Advanced OCR hatası: {e}")
         return None
 
+def run_text_layer_stage(expected_name, pdf_path):
+    """
+    📄 METİN KATMANI - Ön aşama (milisaniyeler)
+    - PDF'in gömülü metni okunur, render/OCR yapılmaz
+    - Kullanılabilir katman yoksa None döner
+    - İsim katmanda yoksa çağıran OCR'a devam eder (katman tarayıcının zayıf OCR'ından
+      gelmiş olabilir)
+    """
+    text_layer_start = time.time()
+
+    detected_text, extraction_method = extract_text_layer(pdf_path)
+    text_layer_time = time.time() - text_layer_start
+
+    if not is_usable_text_layer(detected_text):
+        print(f"📄 Kullanılabilir metin katmanı yok ({text_layer_time:.3f}s), OCR'a geçiliyor")
+        return None
+
+    found_name = search_name_tolerant(detected_text, expected_name)
+    match_found = (found_name == expected_name)
+
+    print(f"📄 Metin katmanı sonucu: {text_layer_time:.3f}s, Bulunan: {'✅' if match_found else '❌'}")
+
+    return {
+        'text': detected_text,
+        'found_name': found_name,
+        'match_found': match_found,
+        'method': f"PDF text layer ({extraction_method})",
+        'processing_time': text_layer_time,
+        'text_length': len(detected_text)
+    }
+
 def run_ocr_with_monitoring(expected_name, pdf_path):
     """
     🎯 İKİ AŞAMALI OCR SİSTEMİ
@@ -772,7 +817,7 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
 
     try:
         # Tesseract kontrolü
-        if not TESSERACT_OK:
+        if not is_tesseract_available():
             error_msg = "Tesseract OCR bulunamadı veya çalışmıyor!"
             print(f"❌ {error_msg}")
             return {
@@ -795,30 +840,110 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF dosyası bulunamadı: {pdf_path}")
 
-        # ============ PDF'İ YÜKSEK KALİTEDE ÇEVİR ============
-        pdf_start_time = time.time()
+        # ============ AŞAMA 0: PDF METİN KATMANI ============
+        text_layer_time = 0
+        if Config.OCR_TEXT_LAYER_ENABLED:
+            print(f"\n📄 AŞAMA 0: PDF metin katmanı kontrol ediliyor...")
+            text_layer_start = time.time()
+            text_layer_result = run_text_layer_stage(expected_name, pdf_path)
+
+            if text_layer_result and not text_layer_result['match_found']:
+                # Katman tarayıcının OCR'ından gelmiş olabilir; isim yoksa sayfa yine OCR'lanır
+                print(f"📄 İsim metin katmanında yok - OCR ile tekrar denenecek")
+
+            elif text_layer_result:
+                print(f"\n🏢 Sigorta şirketi aranıyor...")
+                insurance_search_start = time.time()
+                insurance_company = search_insurance_company(text_layer_result['text'])
+                insurance_search_time = time.time() - insurance_search_start
+
+                total_time = time.time() - monitor.start_time
+
+                result = {
+                    "expected_name": expected_name,
+                    "detected_name": text_layer_result['found_name'],
+                    "match_status": text_layer_result['match_found'],
+                    "insurance_company": insurance_company if insurance_company else "Bulunamadı",
+                    "processing_info": {
+                        "pages_processed": 1,
+                        "text_length": text_layer_result['text_length'],
+                        "language_used": text_layer_result['method'],
+                        "ocr_strategy": "Native Text Layer - OCR Skipped",
+                        "extraction_path": "text_layer",
+                        "advanced_processing_used": False,
+                        "opencv_available": CV2_AVAILABLE,
+                        "timing": {
+                            "total_time_seconds": round(total_time, 2),
+                            "text_layer_seconds": round(text_layer_result['processing_time'], 3),
+                            "pdf_processing_seconds": 0,
+                            "fast_ocr_seconds": 0,
+                            "advanced_ocr_seconds": 0,
+                            "insurance_search_seconds": round(insurance_search_time, 3)
+                        }
+                    }
+                }
+
+                print(f"\n✅ METİN KATMANI KULLANILDI - OCR atlandı")
+                print(f"⚡ Toplam süre: {total_time:.3f}s")
+                if insurance_company:
+                    print(f"🏢 Sigorta Şirketi: {insurance_company}")
+
+                return result
+
+            text_layer_time = time.time() - text_layer_start
+
+        # ============ AŞAMA 1: BÖLGESEL HIZLI OCR (ROI CASCADE) ============
+        # Önce sayfanın üst bandı render edilip okunur, isim bulunamazsa bant genişletilir
+        roi_bands = Config.get_ocr_roi_bands()
 
         try:
-            images = pdf2image.convert_from_path(
-                pdf_path,
-                dpi=300,
-                first_page=1,
-                last_page=1,
-                fmt='png'
-            )
-            pdf_time = time.time() - pdf_start_time
-            print(f"📃 PDF işlendi (300 DPI, {pdf_time:.1f}s)")
+            page_size = get_page_size_points(pdf_path) if roi_bands[0] < 1.0 else None
 
+            # Yazı yüksekliğine göre DPI / upscale seçimi (ilk bandın önizlemesi üzerinden)
+            render_settings = choose_render_settings(pdf_path, roi_bands[0], page_size)
         except Exception as pdf_error:
             print(f"❌ PDF okuma hatası: {pdf_error}")
             raise pdf_error
 
-        page = images[0]  # İlk sayfa
+        render_dpi = render_settings['dpi']
+        upscale_factor = render_settings['upscale_factor']
+        print(f"\n🚀 AŞAMA 1: Hızlı OCR başlatılıyor (bantlar: {roi_bands}, {render_dpi} DPI, x{upscale_factor})...")
+
+        pdf_time = render_settings['estimate_seconds']
+        roi_stages = []
+        fast_result = None
+        page = None
 
-        # ============ AŞAMA 1: HIZLI OCR ============
-        print(f"\n🚀 AŞAMA 1: Hızlı OCR başlatılıyor...")
+        for band_ratio in roi_bands:
+            render_start = time.time()
+            try:
+                page = render_page_band(pdf_path, render_dpi, band_ratio, page_size)
+            except Exception as pdf_error:
+                print(f"❌ PDF okuma hatası: {pdf_error}")
+                raise pdf_error
+
+            render_time = time.time() - render_start
+            pdf_time += render_time
+            print(f"📃 PDF bandı render edildi (üst %{band_ratio * 100:.0f}, {page.size[0]}x{page.size[1]}, {render_time:.2f}s)")
+
+            # Bant için tek kanonik gri görüntü; PIL sayfası artık tutulmaz
+            page = PageContext(page, dpi=render_dpi, upscale_factor=upscale_factor)
+
+            fast_result = run_ocr_fast(expected_name, page)
+
+            roi_stages.append({
+                "band_ratio": band_ratio,
+                "render_seconds": round(render_time, 3),
+                "ocr_seconds": round(fast_result['processing_time'], 3) if fast_result else None,
+                "mean_confidence": fast_result['mean_confidence'] if fast_result else None,
+                "match_found": bool(fast_result and fast_result['match_found']),
+                "match_type": fast_result['match_type'] if fast_result else None
+            })
+
+            if fast_result and fast_result['match_found']:
+                break
 
-        fast_result = run_ocr_fast(expected_name, page)
+        fast_ocr_time = sum(stage["ocr_seconds"] or 0 for stage in roi_stages)
 
         if fast_result and fast_result['match_found']:
             # ✅ HIZLI OCR BAŞARILI
@@ -840,13 +965,30 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
                     "pages_processed": 1,
                     "text_length": fast_result['text_length'],
                     "language_used": fast_result['method'],
-                    "ocr_strategy": "Fast OCR - Single Pass",
+                    "ocr_strategy": "Fast OCR - Single Pass" if fast_result['match_type'] == 'exact' else "Fast OCR - Fuzzy Match Accepted",
+                    "name_match_type": fast_result['match_type'],
+                    "fuzzy_match": fast_result['fuzzy_match'],
+                    "roi_band_used": roi_stages[-1]["band_ratio"],
                     "advanced_processing_used": False,
                     "opencv_available": CV2_AVAILABLE,
+                    "ocr_backend": get_engine_pool().backend,
+                    "extraction_path": "ocr",
+                    "ocr_confidence": confidence_summary(fast_result),
+                    "matched_words": fast_result['matched_words'],
+                    "ocr_cache_hits": page.cache_hits,
+                    "roi_stages": roi_stages,
+                    "render_policy": {
+                        "policy": render_settings['policy'],
+                        "dpi": render_dpi,
+                        "upscale_factor": upscale_factor,
+                        "measured_text_height_px": render_settings['measured_text_height_px']
+                    },
                     "timing": {
                         "total_time_seconds": round(total_time, 2),
+                        "text_layer_seconds": round(text_layer_time, 3),
                         "pdf_processing_seconds": round(pdf_time, 2),
-                        "fast_ocr_seconds": round(fast_result['processing_time'], 2),
+                        "fast_ocr_seconds": round(fast_ocr_time, 2),
+                        "page_view_seconds": page.view_timings,
                         "advanced_ocr_seconds": 0,
                         "search_processing_seconds": 0.1,
                         "insurance_search_seconds": round(insurance_search_time, 3)
@@ -855,17 +997,29 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
             }
 
             print(f"\n✅ HIZLI OCR BAŞARILI! İsim bulundu: {fast_result['found_name']}")
-            print(f"⚡ Toplam süre: {total_time:.2f}s (PDF: {pdf_time:.1f}s, Hızlı OCR: {fast_result['processing_time']:.1f}s)")
+            print(f"⚡ Toplam süre: {total_time:.2f}s (PDF: {pdf_time:.1f}s, Hızlı OCR: {fast_ocr_time:.1f}s)")
             if insurance_company:
                 print(f"🏢 Sigorta Şirketi: {insurance_company}")
 
             return result
 
-        # ============ AŞAMA 2: ADVANCED OCR ============
-        print(f"\n🔧 AŞAMA 2: Advanced OCR başlatılıyor (hızlı OCR başarısız)...")
-        print(f"   Hızlı OCR sonucu: {fast_result['text_length'] if fast_result else 0} karakter, İsim: {'❌ Bulunamadı' if fast_result else 'Hata'}")
+        # ============ GEÇİT: ADVANCED AŞAMA GEREKLİ Mİ? ============
+        fast_insurance_company = search_insurance_company(fast_result['text']) if fast_result else None
+        gate_decision = get_cascade_gate().decide(fast_result, insurer_detected=fast_insurance_company is not None)
+
+        if gate_decision['would_skip']:
+            print(f"🚦 Geçit: hızlı aşama temiz okundu ({gate_decision['signals']}) - "
+                  f"{'advanced atlanıyor' if gate_decision['action'] == 'skip' else 'shadow mod, advanced yine çalışıyor'}")
 
-        advanced_result = run_ocr_advanced(expected_name, page)
+        if gate_decision['action'] == 'skip':
+            advanced_result = None
+        else:
+            # ============ AŞAMA 2: ADVANCED OCR ============
+            print(f"\n🔧 AŞAMA 2: Advanced OCR başlatılıyor (hızlı OCR başarısız)...")
+            print(f"   Hızlı OCR sonucu: {fast_result['text_length'] if fast_result else 0} karakter, İsim: {'❌ Bulunamadı' if fast_result else 'Hata'}")
+
+            advanced_result = run_ocr_advanced(expected_name, page)
+            get_cascade_gate().record_outcome(gate_decision, bool(advanced_result and advanced_result['match_found']))
 
         if advanced_result and advanced_result['match_found']:
             # ✅ ADVANCED OCR BAŞARILI
@@ -891,10 +1045,26 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
                     "advanced_processing_used": True,
                     "fast_ocr_failed": True,
                     "opencv_available": CV2_AVAILABLE,
+                    "ocr_backend": get_engine_pool().backend,
+                    "extraction_path": "ocr",
+                    "ocr_confidence": confidence_summary(advanced_result),
+                    "matched_words": advanced_result['matched_words'],
+                    "ocr_cache_hits": page.cache_hits,
+                    "roi_stages": roi_stages,
+                    "render_policy": {
+                        "policy": render_settings['policy'],
+                        "dpi": render_dpi,
+                        "upscale_factor": upscale_factor,
+                        "measured_text_height_px": render_settings['measured_text_height_px']
+                    },
+                    "orientation": page.orientation,
+                    "cascade_gate": gate_decision,
                     "timing": {
                         "total_time_seconds": round(total_time, 2),
+                        "text_layer_seconds": round(text_layer_time, 3),
                         "pdf_processing_seconds": round(pdf_time, 2),
-                        "fast_ocr_seconds": round(fast_result['processing_time'] if fast_result else 0, 2),
+                        "fast_ocr_seconds": round(fast_ocr_time, 2),
+                        "page_view_seconds": page.view_timings,
                         "advanced_ocr_seconds": round(advanced_result['processing_time'], 2),
                         "preprocessing_seconds": round(advanced_result.get('preprocessing_time', 0), 2),
                         "search_processing_seconds": 0.1,
@@ -904,7 +1074,7 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
             }
 
             print(f"\n✅ ADVANCED OCR BAŞARILI! İsim bulundu: {advanced_result['found_name']}")
-            print(f"🔧 Toplam süre: {total_time:.2f}s (Hızlı: {fast_result['processing_time'] if fast_result else 0:.1f}s + Advanced: {advanced_result['processing_time']:.1f}s)")
+            print(f"🔧 Toplam süre: {total_time:.2f}s (Hızlı: {fast_ocr_time:.1f}s + Advanced: {advanced_result['processing_time']:.1f}s)")
             if insurance_company:
                 print(f"🏢 Sigorta Şirketi: {insurance_company}")
 
@@ -917,7 +1087,10 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
         best_result = advanced_result if advanced_result else fast_result
 
         if best_result:
-            insurance_company = search_insurance_company(best_result['text'])
+            if best_result is fast_result:
+                insurance_company = fast_insurance_company
+            else:
+                insurance_company = search_insurance_company(best_result['text'])
             total_time = time.time() - monitor.start_time
 
             result = {
@@ -929,13 +1102,30 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
                     "pages_processed": 1,
                     "text_length": best_result['text_length'],
                     "language_used": best_result['method'],
-                    "ocr_strategy": "Two-Pass OCR - Both Failed",
-                    "advanced_processing_used": True,
+                    "ocr_strategy": "Fast OCR - Advanced Skipped by Gate" if gate_decision['action'] == 'skip' else "Two-Pass OCR - Both Failed",
+                    "advanced_processing_used": gate_decision['action'] != 'skip',
                     "opencv_available": CV2_AVAILABLE,
+                    "ocr_backend": get_engine_pool().backend,
+                    "extraction_path": "ocr",
+                    "ocr_confidence": confidence_summary(best_result),
+                    "matched_words": best_result['matched_words'],
+                    "fuzzy_match": best_result.get('fuzzy_match'),
+                    "ocr_cache_hits": page.cache_hits,
+                    "roi_stages": roi_stages,
+                    "render_policy": {
+                        "policy": render_settings['policy'],
+                        "dpi": render_dpi,
+                        "upscale_factor": upscale_factor,
+                        "measured_text_height_px": render_settings['measured_text_height_px']
+                    },
+                    "orientation": page.orientation,
+                    "cascade_gate": gate_decision,
                     "timing": {
                         "total_time_seconds": round(total_time, 2),
+                        "text_layer_seconds": round(text_layer_time, 3),
                         "pdf_processing_seconds": round(pdf_time, 2),
-                        "fast_ocr_seconds": round(fast_result['processing_time'] if fast_result else 0, 2),
+                        "fast_ocr_seconds": round(fast_ocr_time, 2),
+                        "page_view_seconds": page.view_timings,
                         "advanced_ocr_seconds": round(advanced_result['processing_time'] if advanced_result else 0, 2),
                         "search_processing_seconds": 0.1,
                         "insurance_search_seconds": 0.1
@@ -984,8 +1174,215 @@ def run_ocr_with_monitoring(expected_name, pdf_path):
         monitor.stop_monitoring()
         monitor.print_summary()
 
-# GPU check (optional)
-try:
-    GPU_AVAILABLE, GPU_NAME, CUDA_VERSION = check_gpu_availability()
-except:
-    GPU_AVAILABLE, GPU_NAME, CUDA_VERSION = False, None, None
\ No newline at end of file
+def has_full_candidate_match(detected_text, candidate_names):
+    """Adaylardan en az biri metinde tam geçiyor mu"""
+    return any(
+        candidate['match_level'] == 'full'
+        for candidate in match_candidate_names(detected_text, candidate_names)['candidates']
+    )
+
+def build_multi_name_result(candidate_names, detected_text, insurance_company, processing_info):
+    """Tek metin üzerinden tüm adayların isim başına sonucunu oluştur"""
+    name_matches = match_candidate_names(detected_text, candidate_names)
+
+    results = []
+    for candidate in name_matches['candidates']:
+        # Tek isimli akışla aynı anlam: herhangi bir seviyede eşleşme = bulundu
+        matched = candidate['match_level'] is not None
+        results.append({
+            "expected_name": candidate['name'],
+            "detected_name": candidate['name'] if matched else None,
+            "match_status": matched,
+            "matched_text": candidate['matched_text'],
+            "match_level": candidate['match_level'],
+            "match_score": candidate['score']
+        })
+
+    return {
+        "candidate_names": list(candidate_names),
+        "results": results,
+        "best_name": name_matches['best_name'],
+        "best_level": name_matches['best_level'],
+        "ambiguous": name_matches['ambiguous'],
+        "insurance_company": insurance_company if insurance_company else "Bulunamadı",
+        "processing_info": processing_info
+    }
+
+def read_document_text(pdf_path, is_match, strategy_name):
+    """
+    📄 Dokümanı bir kez oku (isim listesinden bağımsız)
+    - Metin katmanı varsa ve is_match doğruysa OCR yapılmaz (eşleşme yoksa OCR'a geçilir)
+    - ROI bantları hızlı OCR ile okunur, is_match(metin) doğru olunca durulur
+    - Hiçbir bantta eşleşme yoksa advanced PSM döngüsü (aynı is_match ile)
+
+    DÖNEN DEĞER:
+        tuple: (metin, processing_info)
+    """
+    start_time = time.time()
+    lang = get_ocr_lang()
+
+    # ============ AŞAMA 0: PDF METİN KATMANI ============
+    if Config.OCR_TEXT_LAYER_ENABLED:
+        text_layer_start = time.time()
+        detected_text, extraction_method = extract_text_layer(pdf_path)
+        text_layer_time = time.time() - text_layer_start
+
+        if is_usable_text_layer(detected_text) and not is_match(detected_text):
+            print(f"📄 Metin katmanında eşleşme yok ({text_layer_time:.3f}s) - OCR ile tekrar denenecek")
+
+        elif is_usable_text_layer(detected_text):
+            print(f"📄 Metin katmanı kullanıldı ({text_layer_time:.3f}s) - OCR atlandı")
+            return detected_text, {
+                "pages_processed": 1,
+                "text_length": len(detected_text),
+                "language_used": f"PDF text layer ({extraction_method})",
+                "ocr_strategy": "Native Text Layer - OCR Skipped",
+                "extraction_path": "text_layer",
+                "advanced_processing_used": False,
+                "timing": {
+                    "total_time_seconds": round(time.time() - start_time, 2),
+                    "text_layer_seconds": round(text_layer_time, 3),
+                    "pdf_processing_seconds": 0,
+                    "fast_ocr_seconds": 0,
+                    "advanced_ocr_seconds": 0
+                }
+            }
+
+    # ============ AŞAMA 1: BÖLGESEL HIZLI OCR ============
+    roi_bands = Config.get_ocr_roi_bands()
+    page_size = get_page_size_points(pdf_path) if roi_bands[0] < 1.0 else None
+    render_settings = choose_render_settings(pdf_path, roi_bands[0], page_size)
+
+    pdf_time = render_settings['estimate_seconds']
+    fast_ocr_time = 0
+    roi_stages = []
+    page = None
+    ocr_page = None
+
+    for band_ratio in roi_bands:
+        render_start = time.time()
+        page = render_page_band(pdf_path, render_settings['dpi'], band_ratio, page_size)
+        pdf_time += time.time() - render_start
+
+        page = PageContext(page, dpi=render_settings['dpi'], upscale_factor=render_settings['upscale_factor'])
+
+        fast_start = time.time()
+        ocr_page = page.ocr_pass('upscaled', 6, lang)
+        fast_ocr_time += time.time() - fast_start
+
+        match_found = is_match(ocr_page['text'])
+        roi_stages.append({
+            "band_ratio": band_ratio,
+            "mean_confidence": ocr_page['mean_confidence'],
+            "match_found": match_found
+        })
+        print(f"⚡ Bant %{band_ratio * 100:.0f}: Güven {ocr_page['mean_confidence']:.0f}, "
+              f"Tam eşleşme: {'✅' if match_found else '❌'}")
+
+        if match_found:
+            break
+
+    method = f"{lang} (PSM 6 - Fast)"
+    advanced_time = 0
+
+    # ============ AŞAMA 2: ADVANCED OCR (hiçbir bantta eşleşme yoksa) ============
+    if not roi_stages[-1]['match_found']:
+        print(f"\n🔧 Hızlı aşamada tam eşleşme yok, advanced OCR başlatılıyor...")
+        advanced_start = time.time()
+        try:
+            variables = {'tessedit_char_whitelist': TURKISH_WHITELIST} if get_tesseract_status()['turkish'] else None
+            page.binarized()
+            advanced_page, advanced_method = run_psm_modes(is_match, page, lang, variables)
+
+            if advanced_page and (is_match(advanced_page['text']) or
+                                  advanced_page['mean_confidence'] > ocr_page['mean_confidence']):
+                ocr_page, method = advanced_page, advanced_method
+        except Exception as advanced_error:
+            print(f"❌ Advanced OCR hatası (hızlı aşama sonucu kullanılıyor): {advanced_error}")
+        advanced_time = time.time() - advanced_start
+
+    return ocr_page['text'], {
+        "pages_processed": 1,
+        "text_length": len(ocr_page['text']),
+        "language_used": method,
+        "ocr_strategy": strategy_name,
+        "extraction_path": "ocr",
+        "advanced_processing_used": advanced_time > 0,
+        "opencv_available": CV2_AVAILABLE,
+        "ocr_backend": get_engine_pool().backend,
+        "ocr_confidence": confidence_summary(ocr_page),
+        "ocr_cache_hits": page.cache_hits,
+        "roi_stages": roi_stages,
+        "timing": {
+            "total_time_seconds": round(time.time() - start_time, 2),
+            "pdf_processing_seconds": round(pdf_time, 2),
+            "fast_ocr_seconds": round(fast_ocr_time, 2),
+            "page_view_seconds": page.view_timings,
+            "advanced_ocr_seconds": round(advanced_time, 2)
+        }
+    }
+
+def run_ocr_multi_name(candidate_names, pdf_path):
+    """
+    👥 ÇOKLU İSİM - Tek doküman, N aday isim
+    - Doküman bir kez okunur (metin katmanı → ROI bantları → gerekirse advanced)
+    - Tüm adaylar aynı normalize metnin tek n-gram taramasıyla puanlanır
+    - Herhangi bir aday tam eşleşince sonraki aşamalar çalışmaz
+    """
+    monitor = SimplePerformanceMonitor()
+    monitor.start_monitoring()
+
+    try:
+        if not is_tesseract_available():
+            error_msg = "Tesseract OCR bulunamadı veya çalışmıyor!"
+            print(f"❌ {error_msg}")
+            return {
+                "candidate_names": list(candidate_names),
+                "results": [],
+                "error": error_msg
+            }
+
+        print(f"📄 PDF işleniyor (çoklu isim): {pdf_path}")
+        print(f"👥 Aday isimler ({len(candidate_names)}): {candidate_names}")
+
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF dosyası bulunamadı: {pdf_path}")
+
+        detected_text, processing_info = read_document_text(
+            pdf_path,
+            lambda text: has_full_candidate_match(text, candidate_names),
+            "Multi-Name OCR - Single Pass"
+        )
+
+        insurance_search_start = time.time()
+        insurance_company = search_insurance_company(detected_text)
+        processing_info['timing']['insurance_search_seconds'] = round(time.time() - insurance_search_start, 3)
+
+        result = build_multi_name_result(candidate_names, detected_text, insurance_company, processing_info)
+
+        print(f"\n👥 Çoklu isim sonucu: en iyi aday {result['best_name'] or '-'} "
+              f"({result['best_level'] or 'eşleşme yok'}{', belirsiz' if result['ambiguous'] else ''})")
+        print(f"⏱️ Toplam süre: {time.time() - monitor.start_time:.2f}s")
+
+        return result
+
+    except Exception as e:
+        error_msg = f"OCR işlemi hatası: {str(e)}"
+        print(f"❌ {error_msg}")
+        import traceback
+        print(f"Detaylı hata:\n{traceback.format_exc()}")
+
+        return {
+            "candidate_names": list(candidate_names),
+            "results": [],
+            "error": error_msg,
+            "processing_info": {
+                "total_time_seconds": round(time.time() - monitor.start_time, 2) if monitor.start_time else 0,
+                "failed": True,
+                "ocr_strategy": "Multi-Name OCR - Exception"
+            }
+        }
+
+    finally:
+        monitor.stop_monitoring()
+        monitor.print_summary()
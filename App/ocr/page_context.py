@@ -0,0 +1,150 @@
+"""
+DOSYA: ocr/page_context.py
+AMAÇ: Sayfa başına tek kanonik görüntü + memoize edilmiş türev görünümler
+- Render edilen sayfa bir kez gri tonlamalı uint8 ndarray'e çevrilir
+- Upscale, iyileştirme, eğim düzeltme ve threshold ilk ihtiyaçta bir kez hesaplanır
+- Hızlı aşama, advanced aşama ve tüm PSM denemeleri aynı nesneyi kullanır
+- Görünüm + PSM başına OCR geçişi (kelime kutuları, güven) bir kez yapılır
+- OCR geçişleri sayfa hash'iyle içerik adresli cache'ten okunur / cache'e yazılır
+"""
+import time
+
+from PIL import Image
+
+from App.ocr.engine_pool import get_engine_pool, DEFAULT_OEM
+from App.ocr.preprocessing import (
+    CV2_AVAILABLE, PREPROCESSING_PROFILE_VERSION, enhance_image_with_pil,
+    correct_orientation, upscale_image
+)
+from App.ocr.text_cache import get_text_cache, make_cache_key, hash_image_bytes
+
+if CV2_AVAILABLE:
+    import cv2
+    import numpy as np
+    from App.ocr.preprocessing import enhance_gray, binarize_gray
+
+
+def to_gray_array(image):
+    """PIL Image veya ndarray'i C-contiguous gri tonlamalı uint8 ndarray'e çevir"""
+    if isinstance(image, Image.Image):
+        if image.mode != 'L':
+            image = image.convert('L')
+        return np.array(image, dtype=np.uint8)
+
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    return np.ascontiguousarray(image, dtype=np.uint8)
+
+
+class PageContext:
+    """
+    Tek sayfanın OCR boyunca paylaşılan görüntü durumu
+
+    OpenCV yoksa kanonik görüntü gri tonlamalı PIL Image olarak tutulur ve
+    türev görünümler PIL ile üretilir.
+    """
+
+    def __init__(self, image, dpi=None, upscale_factor=2):
+        self.dpi = dpi
+        self.upscale_factor = upscale_factor
+
+        if CV2_AVAILABLE:
+            self.gray = to_gray_array(image)
+            self.height, self.width = self.gray.shape
+        else:
+            self.gray = image if image.mode == 'L' else image.convert('L')
+            self.width, self.height = self.gray.size
+
+        self._views = {}
+        self.view_timings = {}
+        self.orientation = None
+        self.ocr_passes = {}
+        self.cache_hits = 0
+        self._image_hash = None
+
+    @classmethod
+    def ensure(cls, page, upscale_factor=2):
+        """PageContext verilmişse aynen döndür, PIL sayfa verilmişse sar"""
+        if isinstance(page, cls):
+            return page
+        return cls(page, upscale_factor=upscale_factor)
+
+    def _view(self, name, builder):
+        """Görünümü ilk istekte hesapla, sonra hep aynı nesneyi döndür"""
+        if name not in self._views:
+            view_start = time.time()
+            self._views[name] = builder()
+            self.view_timings[name] = round(time.time() - view_start, 3)
+        return self._views[name]
+
+    @property
+    def image_hash(self):
+        """Render edilmiş sayfa piksellerinin hash'i (ilk ihtiyaçta bir kez)"""
+        if self._image_hash is None:
+            if CV2_AVAILABLE:
+                self._image_hash = hash_image_bytes(self.gray.tobytes(), self.gray.shape)
+            else:
+                self._image_hash = hash_image_bytes(self.gray.tobytes(), self.gray.size)
+        return self._image_hash
+
+    def original(self):
+        """Render edilmiş sayfa (gri tonlamalı, büyütülmemiş)"""
+        return self.gray
+
+    def upscaled(self):
+        """DPI politikasının seçtiği oranda büyütülmüş sayfa (hızlı aşama girdisi)"""
+        return self._view('upscaled', lambda: upscale_image(self.gray, self.upscale_factor))
+
+    def enhanced(self):
+        """Gürültü azaltma + CLAHE uygulanmış büyütülmüş sayfa"""
+        return self._view('enhanced', lambda: enhance_gray(self.upscaled()))
+
+    def deskewed(self):
+        """Rotasyon ve eğimi düzeltilmiş sayfa (açılar küçük maskeden, tek warp)"""
+        def build():
+            corrected, self.orientation = correct_orientation(self.enhanced())
+            return corrected
+        return self._view('deskewed', build)
+
+    def binarized(self):
+        """Advanced aşama girdisi: tam ön işlemden geçmiş, threshold uygulanmış sayfa"""
+        if not CV2_AVAILABLE:
+            return self._view('binarized', lambda: enhance_image_with_pil(self.upscaled()))
+        return self._view('binarized', lambda: binarize_gray(self.deskewed()))
+
+    def ocr_pass(self, view_name, psm, lang, variables=None, timeout=0):
+        """
+        Görünüm üzerinde kelime seviyesinde OCR (aynı görünüm + PSM tekrar OCR'lanmaz)
+
+        PARAMETRELER:
+            view_name: 'original', 'upscaled', 'enhanced', 'deskewed' veya 'binarized'
+            psm: Page segmentation mode
+            lang: Tesseract dil kodu
+            variables: Tesseract değişkenleri (örn. whitelist)
+            timeout: Tanıma üst süresi (saniye, 0 = sınırsız; aşılırsa TimeoutError, cache'e yazılmaz)
+
+        DÖNEN DEĞER:
+            dict: word_data.build_ocr_page sonucu
+        """
+        key = (view_name, psm, lang, tuple(sorted((variables or {}).items())))
+        if key in self.ocr_passes:
+            return self.ocr_passes[key]
+
+        text_cache = get_text_cache()
+        cache_key = make_cache_key(
+            self.image_hash, view_name, PREPROCESSING_PROFILE_VERSION,
+            self.dpi, self.upscale_factor, lang, psm, DEFAULT_OEM, variables
+        )
+
+        ocr_page = text_cache.get(cache_key)
+        if ocr_page is not None:
+            self.cache_hits += 1
+        else:
+            image = getattr(self, view_name)()
+            ocr_page = get_engine_pool().recognize_words(
+                image, lang=lang, psm=psm, variables=variables, timeout=timeout
+            )
+            text_cache.put(cache_key, ocr_page)
+
+        self.ocr_passes[key] = ocr_page
+        return ocr_page
@@ -0,0 +1,66 @@
+"""
+DOSYA: ocr/pdf_render.py
+AMAÇ: PDF sayfasını rasterize ederken bölge kırpma (region of interest)
+- Poppler pdftoppm'in -x/-y/-W/-H seçenekleriyle sadece istenen bant render edilir
+- Sayfanın üst bandı (hasta adı, sigorta başlığı) tam sayfaya göre çok daha ucuzdur
+- Çıktı doğrudan gri tonlamalı PIL Image olarak döner
+"""
+import io
+import subprocess
+
+import pdf2image
+from PIL import Image
+
+POINTS_PER_INCH = 72
+
+
+def get_page_size_points(pdf_path, timeout=10):
+    """
+    İlk sayfanın boyutunu (point cinsinden, rotasyon uygulanmış) getir
+
+    DÖNEN DEĞER:
+        tuple: (genişlik, yükseklik)
+    """
+    info = pdf2image.pdfinfo_from_path(pdf_path, timeout=timeout)
+
+    # Örnek: "595.276 x 841.89 pts (A4)"
+    size_parts = info['Page size'].split()
+    width, height = float(size_parts[0]), float(size_parts[2])
+
+    rotation = int(info.get('Page rot', 0) or 0)
+    if rotation % 180 == 90:
+        width, height = height, width
+
+    return width, height
+
+
+def render_page_band(pdf_path, dpi, band_ratio=1.0, page_size=None, timeout=60):
+    """
+    İlk sayfanın üstten band_ratio kadarlık kısmını render et
+
+    PARAMETRELER:
+        pdf_path: PDF dosya yolu
+        dpi: Render çözünürlüğü
+        band_ratio: Sayfa yüksekliğinin render edilecek oranı (1.0 = tam sayfa)
+        page_size: get_page_size_points sonucu (tekrar pdfinfo çağırmamak için)
+
+    DÖNEN DEĞER:
+        PIL.Image: Gri tonlamalı sayfa (bandı)
+    """
+    command = ['pdftoppm', '-f', '1', '-l', '1', '-r', str(dpi), '-gray', '-png', '-singlefile']
+
+    if band_ratio < 1.0:
+        width_pts, height_pts = page_size or get_page_size_points(pdf_path)
+        width_px = int(round(width_pts / POINTS_PER_INCH * dpi))
+        height_px = int(round(height_pts / POINTS_PER_INCH * dpi * band_ratio))
+        command.extend(['-x', '0', '-y', '0', '-W', str(width_px), '-H', str(height_px)])
+
+    command.append(pdf_path)
+
+    completed = subprocess.run(command, capture_output=True, timeout=timeout)
+    if completed.returncode != 0:
+        raise RuntimeError(f"pdftoppm hatası: {completed.stderr.decode('utf-8', errors='replace').strip()}")
+
+    image = Image.open(io.BytesIO(completed.stdout))
+    image.load()
+    return image
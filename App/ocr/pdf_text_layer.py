@@ -0,0 +1,78 @@
+"""
+DOSYA: ocr/pdf_text_layer.py
+AMAÇ: Dijital üretilmiş PDF'lerde gömülü metin katmanını okuma
+- Rasterize + OCR'dan önce çalışan ön aşama
+- Önce poppler pdftotext (pdf2image ile aynı poppler kurulumu), yoksa pypdf
+- Metin katmanının kullanılabilir olup olmadığını basit sinyallerle kontrol eder
+"""
+import shutil
+import subprocess
+
+from App.utils.config import Config
+
+# ============ OPTIONAL IMPORTS ============
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+PDFTOTEXT_AVAILABLE = shutil.which('pdftotext') is not None
+
+
+def extract_text_with_pdftotext(pdf_path, page_number=1, timeout=10):
+    """Poppler pdftotext ile tek sayfanın metin katmanını çıkar"""
+    completed = subprocess.run(
+        ['pdftotext', '-f', str(page_number), '-l', str(page_number),
+         '-enc', 'UTF-8', pdf_path, '-'],
+        capture_output=True,
+        timeout=timeout
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.decode('utf-8', errors='replace').strip())
+
+    return completed.stdout.decode('utf-8', errors='replace')
+
+
+def extract_text_with_pypdf(pdf_path, page_number=1):
+    """pypdf ile tek sayfanın metin katmanını çıkar"""
+    reader = PdfReader(pdf_path)
+    if len(reader.pages) < page_number:
+        return ""
+    return reader.pages[page_number - 1].extract_text() or ""
+
+
+def extract_text_layer(pdf_path, page_number=1):
+    """
+    PDF sayfasının gömülü metin katmanını getir
+
+    DÖNEN DEĞER:
+        tuple: (metin veya None, kullanılan yöntem)
+    """
+    try:
+        if PDFTOTEXT_AVAILABLE:
+            return extract_text_with_pdftotext(pdf_path, page_number), "pdftotext"
+        if PYPDF_AVAILABLE:
+            return extract_text_with_pypdf(pdf_path, page_number), "pypdf"
+    except Exception as e:
+        print(f"⚠️ Metin katmanı okunamadı: {e}")
+
+    return None, None
+
+
+def is_usable_text_layer(text):
+    """
+    Metin katmanı isim araması için yeterli mi?
+
+    Taranmış PDF'lerde katman ya hiç yoktur ya da birkaç karakterden ibarettir;
+    bozuk font encoding'inde ise harf oranı düşer.
+    """
+    if not text:
+        return False
+
+    stripped = ''.join(text.split())
+    if len(stripped) < Config.OCR_TEXT_LAYER_MIN_CHARS:
+        return False
+
+    letter_count = sum(1 for char in stripped if char.isalpha())
+    return letter_count / len(stripped) >= Config.OCR_TEXT_LAYER_MIN_LETTER_RATIO
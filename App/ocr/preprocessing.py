@@ -0,0 +1,280 @@
+"""
+DOSYA: ocr/preprocessing.py
+AMAÇ: OCR öncesi görüntü ön işleme fonksiyonları
+- OpenCV varsa: gri tonlama, gürültü azaltma, CLAHE, rotasyon/eğim düzeltme, threshold
+- OpenCV yoksa: PIL ile basit iyileştirme
+- Adımlar tek tek de çağrılabilir (PageContext her adımı bir kez hesaplar)
+"""
+import time
+
+from PIL import Image
+
+# ============ OPTIONAL IMPORTS ============
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# ============ PREPROCESSING FONKSİYONLARI ============
+def enhance_image_with_pil(image):
+    """
+    PIL ile basit görüntü iyileştirme (OpenCV olmadan)
+    """
+    try:
+        from PIL import ImageEnhance, ImageFilter
+
+        print("📸 PIL preprocessing başlıyor...")
+
+        # 1. Upscaling
+        width, height = image.size
+        upscaled = image.resize((width * 2, height * 2), Image.LANCZOS)
+        print(f"🔍 2x büyütme: {width}x{height} -> {width*2}x{height*2}")
+
+        # 2. Sharpness enhancement
+        enhancer = ImageEnhance.Sharpness(upscaled)
+        sharpened = enhancer.enhance(1.5)
+
+        # 3. Contrast enhancement
+        enhancer = ImageEnhance.Contrast(sharpened)
+        contrasted = enhancer.enhance(1.3)
+
+        # 4. Brightness adjustment
+        enhancer = ImageEnhance.Brightness(contrasted)
+        brightened = enhancer.enhance(1.1)
+
+        # 5. Noise reduction
+        filtered = brightened.filter(ImageFilter.MedianFilter(size=3))
+
+        print("✅ PIL preprocessing tamamlandı")
+        return filtered
+
+    except Exception as e:
+        print(f"⚠️ PIL preprocessing hatası: {e}")
+        return image
+
+def preprocess_image_advanced(image):
+    """
+    🔧 Gelişmiş görüntü ön işleme - OpenCV gerekli
+    """
+
+    if not CV2_AVAILABLE:
+        print("📸 OpenCV yok, PIL preprocessing...")
+        return enhance_image_with_pil(image)
+
+    if isinstance(image, Image.Image):
+        img_array = np.array(image)
+        if len(img_array.shape) == 3:
+            img_cv = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+        else:
+            img_cv = img_array
+    else:
+        img_cv = image
+
+    print("📸 OpenCV görüntü ön işleme başlıyor...")
+
+    # 1. Gri tonlamaya çevir
+    if len(img_cv.shape) == 3:
+        gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = img_cv
+
+    # 2-3. Gürültü azaltma + kontrast artırma
+    enhanced = enhance_gray(gray)
+
+    # 4-5. Rotation + deskew (küçük maske üzerinde tahmin, tek warp)
+    deskewed, _ = correct_orientation(enhanced)
+
+    # 6. Adaptive thresholding
+    thresh = binarize_gray(deskewed)
+
+    print("✅ OpenCV preprocessing tamamlandı")
+
+    # OpenCV'den PIL'e geri çevir
+    processed_image = Image.fromarray(thresh)
+    return processed_image
+
+def enhance_gray(gray):
+    """Gaussian blur ile gürültü azaltma + CLAHE ile kontrast artırma"""
+    denoised = cv2.GaussianBlur(gray, (3, 3), 0)
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return clahe.apply(denoised)
+
+def binarize_gray(gray):
+    """Adaptive Gaussian threshold"""
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+
+# Ön işleme adımları değiştiğinde artırılır (OCR metin cache anahtarının parçası)
+PREPROCESSING_PROFILE_VERSION = 2
+
+# Açı tahmini bu boyuta küçültülmüş maske üzerinde yapılır
+ANGLE_ESTIMATION_MAX_SIDE = 1000
+MIN_CORRECTION_ANGLE = 0.5
+
+def build_foreground_mask(image, max_side=ANGLE_ESTIMATION_MAX_SIDE):
+    """
+    Açı tahmini için küçültülmüş, ters çevrilmiş ön plan maskesi
+    - Yazı pikselleri beyaz (255), kağıt siyah (0)
+    - CLAHE sonrası neredeyse her piksel sıfırdan büyük olduğu için
+      doğrudan gri görüntü üzerinde tahmin yapılmaz
+    """
+    height, width = image.shape[:2]
+    scale = min(1.0, max_side / max(height, width))
+    if scale < 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    _, mask = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return mask
+
+def estimate_rotation_angle(mask):
+    """Hough çizgileri ile rotasyon açısı (düzeltme için uygulanacak açı, derece)"""
+    edges = cv2.Canny(mask, 50, 150, apertureSize=3)
+    lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold=100)
+
+    if lines is None:
+        return 0.0
+
+    angles = []
+    for rho, theta in lines[:10, 0]:
+        angle = theta * 180 / np.pi
+        if 45 <= angle <= 135:
+            angles.append(angle - 90)
+        elif angle < 45:
+            angles.append(angle)
+        elif angle > 135:
+            angles.append(angle - 180)
+
+    return float(np.median(angles)) if angles else 0.0
+
+def estimate_skew_angle(mask):
+    """minAreaRect ile eğim açısı (düzeltme için uygulanacak açı, derece)"""
+    points = cv2.findNonZero(mask)
+    if points is None or len(points) < 4:
+        return 0.0
+
+    angle = cv2.minAreaRect(points)[-1]
+
+    # OpenCV sürümüne göre açı [-90, 0) veya [0, 90) aralığında gelir
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+
+    return float(angle)
+
+def rotate_image(image, angle):
+    """Görüntüyü merkez etrafında döndür (tek warpAffine)"""
+    (h, w) = image.shape[:2]
+    center = (w // 2, h // 2)
+    M = cv2.getRotationMatrix2D(center, angle, 1.0)
+    return cv2.warpAffine(image, M, (w, h),
+                          flags=cv2.INTER_CUBIC,
+                          borderMode=cv2.BORDER_REPLICATE)
+
+def correct_orientation(image):
+    """
+    🔄📐 Rotasyon + eğim düzeltme tek adımda - OpenCV gerekli
+    - Her iki açı da küçük ön plan maskesi üzerinde tahmin edilir
+    - Eğim, rotasyonu düzeltilmiş maske üzerinde ölçülür (kalan açı)
+    - Toplam açı tam çözünürlüklü görüntüye tek warp olarak uygulanır
+
+    DÖNEN DEĞER:
+        tuple: (düzeltilmiş görüntü, açı/süre bilgisi)
+    """
+    info = {
+        'rotation_angle': 0.0,
+        'skew_angle': 0.0,
+        'angle_estimation_seconds': 0.0,
+        'warp_seconds': 0.0
+    }
+
+    if not CV2_AVAILABLE:
+        return image, info
+
+    try:
+        estimation_start = time.time()
+
+        mask = build_foreground_mask(image)
+        rotation_angle = estimate_rotation_angle(mask)
+        if abs(rotation_angle) <= MIN_CORRECTION_ANGLE:
+            rotation_angle = 0.0
+        else:
+            mask = rotate_image(mask, rotation_angle)
+
+        skew_angle = estimate_skew_angle(mask)
+        if abs(skew_angle) <= MIN_CORRECTION_ANGLE:
+            skew_angle = 0.0
+
+        info['rotation_angle'] = round(rotation_angle, 2)
+        info['skew_angle'] = round(skew_angle, 2)
+        info['angle_estimation_seconds'] = round(time.time() - estimation_start, 3)
+
+        total_angle = rotation_angle + skew_angle
+        if total_angle == 0.0:
+            return image, info
+
+        print(f"🔄 Rotasyon + eğim düzeltiliyor: {rotation_angle:.1f}° + {skew_angle:.1f}°")
+        warp_start = time.time()
+        corrected = rotate_image(image, total_angle)
+        info['warp_seconds'] = round(time.time() - warp_start, 3)
+        return corrected, info
+
+    except Exception as e:
+        print(f"⚠️ Açı düzeltme hatası: {e}")
+        return image, info
+
+def detect_and_correct_rotation(image):
+    """🔄 Rotation detection ve düzeltme - OpenCV gerekli"""
+    if not CV2_AVAILABLE:
+        return image
+
+    try:
+        median_angle = estimate_rotation_angle(build_foreground_mask(image))
+        if abs(median_angle) > MIN_CORRECTION_ANGLE:
+            print(f"🔄 Rotation düzeltiliyor: {median_angle:.1f}°")
+            return rotate_image(image, median_angle)
+        return image
+    except Exception as e:
+        print(f"⚠️ Rotation detection hatası: {e}")
+        return image
+
+def deskew_image(image):
+    """📐 Deskewing - OpenCV gerekli"""
+    if not CV2_AVAILABLE:
+        return image
+
+    try:
+        angle = estimate_skew_angle(build_foreground_mask(image))
+        if abs(angle) > MIN_CORRECTION_ANGLE:
+            print(f"📐 Deskewing: {angle:.1f}°")
+            return rotate_image(image, angle)
+        return image
+    except Exception as e:
+        print(f"⚠️ Deskewing hatası: {e}")
+        return image
+
+def upscale_image(image, scale_factor=2):
+    """🔍 Görüntüyü büyütme - PIL ile (scale_factor 1 ise kopya yapılmaz)"""
+    if scale_factor == 1:
+        return image
+
+    try:
+        if isinstance(image, Image.Image):
+            width, height = image.size
+            new_size = (int(width * scale_factor), int(height * scale_factor))
+            upscaled = image.resize(new_size, Image.LANCZOS)
+            print(f"🔍 PIL ile {scale_factor}x büyütme")
+            return upscaled
+        elif CV2_AVAILABLE:
+            # OpenCV array
+            height, width = image.shape[:2]
+            upscaled = cv2.resize(image, (int(width * scale_factor), int(height * scale_factor)),
+                                  interpolation=cv2.INTER_CUBIC)
+            return upscaled
+        return image
+    except Exception as e:
+        print(f"⚠️ Upscaling hatası: {e}")
+        return image
@@ -0,0 +1,332 @@
+"""
+DOSYA: ocr/roster_index.py
+AMAÇ: Hasta listesi (roster) üzerinden isim tespiti - çağıran isim vermeden
+- Her isim ve alt kombinasyonları (tam, n-1, 2'li, tek) tek bir Aho-Corasick otomatına yüklenir
+- OCR metninin tek taramasıyla listedeki tüm geçen isimler bulunur, eşleşme seviyesine göre sıralanır
+- Seviyeler search_name_tolerant ile aynı öncelik sırasında: full > n-1 > pair > single
+- Liste değişince sadece eklenen / çıkarılan isimlerin desenleri güncellenir
+  (ortak desenler referans sayacıyla paylaşılır)
+- Kelime sınırı kontrolü: 'ali' deseni 'alim' içinde eşleşmez
+
+KULLANIM:
+    from App.ocr.roster_index import get_roster_index
+    index = get_roster_index()
+    index.add_names(['Ahmet Yılmaz', 'Ayşe Kaya'])
+    index.identify(ocr_text)
+
+BENCHMARK:
+    python -m App.ocr.roster_index --names 20000
+"""
+import threading
+import time
+
+from App.ocr.aho_corasick import AhoCorasickAutomaton
+from App.ocr.text_analysis import normalize_turkish_text, analyze_text, MATCH_LEVEL_SCORES
+from App.utils.config import Config
+
+MATCH_LEVELS = ('full', 'n-1', 'pair', 'single')
+
+
+def name_variants(name_parts):
+    """
+    İsmin aranacak desenleri ve seviyeleri (search_name_tolerant sırasıyla)
+
+    DÖNEN DEĞER:
+        dict: desen -> seviye (aynı desen birden fazla seviyede çıkarsa en yükseği)
+    """
+    variants = {}
+
+    def add(pattern, level):
+        if pattern not in variants:
+            variants[pattern] = level
+
+    num_parts = len(name_parts)
+    if num_parts == 0:
+        return variants
+
+    add(' '.join(name_parts), 'full')
+
+    if num_parts >= 3:
+        for i in range(2):
+            add(' '.join(name_parts[i:i + num_parts - 1]), 'n-1')
+        for i in range(num_parts - 1):
+            add(f"{name_parts[i]} {name_parts[i + 1]}", 'pair')
+
+    if num_parts >= 2:
+        for part in name_parts:
+            add(part, 'single')
+
+    return variants
+
+
+class RosterIndex:
+    """
+    Roster isim indeksi
+
+    İsimler normalize hâlleriyle tekilleştirilir; desen -> {isim: seviye} eşlemesi
+    otomatın bulduğu her desenin hangi isimlere hangi seviyede ait olduğunu verir.
+    """
+
+    def __init__(self):
+        self.automaton = AhoCorasickAutomaton()
+        self.max_results = Config.OCR_ROSTER_MAX_RESULTS
+        self.min_level = Config.OCR_ROSTER_MIN_LEVEL
+
+        self._names = {}  # normalize isim -> görünen isim
+        self._pattern_names = {}  # desen -> {normalize isim: seviye}
+        self._lock = threading.RLock()
+
+        self.loaded_from = None
+        self.stats = {
+            'identify_calls': 0,
+            'identify_seconds_total': 0.0,
+            'names_added': 0,
+            'names_removed': 0
+        }
+
+    def __len__(self):
+        return len(self._names)
+
+    def add_names(self, names):
+        """
+        İsimleri indekse ekle (zaten olanlar atlanır)
+
+        DÖNEN DEĞER:
+            int: Yeni eklenen isim sayısı
+        """
+        added = 0
+        with self._lock:
+            for name in names:
+                normalized = normalize_turkish_text(name)
+                if not normalized or normalized in self._names:
+                    continue
+
+                self._names[normalized] = name.strip()
+                for pattern, level in name_variants(normalized.split()).items():
+                    self._pattern_names.setdefault(pattern, {})[normalized] = level
+                    self.automaton.add(pattern)
+                added += 1
+
+            self.stats['names_added'] += added
+        return added
+
+    def remove_names(self, names):
+        """
+        İsimleri indeksten çıkar
+
+        DÖNEN DEĞER:
+            int: Çıkarılan isim sayısı
+        """
+        removed = 0
+        with self._lock:
+            for name in names:
+                normalized = normalize_turkish_text(name)
+                if normalized not in self._names:
+                    continue
+
+                del self._names[normalized]
+                for pattern in name_variants(normalized.split()):
+                    owners = self._pattern_names.get(pattern)
+                    if owners is not None:
+                        owners.pop(normalized, None)
+                        if not owners:
+                            del self._pattern_names[pattern]
+                    self.automaton.remove(pattern)
+                removed += 1
+
+            self.stats['names_removed'] += removed
+        return removed
+
+    def replace_names(self, names):
+        """
+        Roster'ı verilen listeyle eşitle (sadece farklar eklenir / çıkarılır)
+
+        DÖNEN DEĞER:
+            tuple: (eklenen, çıkarılan)
+        """
+        wanted = {normalize_turkish_text(name): name for name in names if normalize_turkish_text(name)}
+        with self._lock:
+            stale = [self._names[normalized] for normalized in self._names if normalized not in wanted]
+            removed = self.remove_names(stale)
+            added = self.add_names(wanted.values())
+        return added, removed
+
+    def load_file(self, roster_path):
+        """
+        Roster dosyasını yükle (UTF-8, satır başına bir isim, # ile başlayan satırlar yorum)
+
+        DÖNEN DEĞER:
+            tuple: (eklenen, çıkarılan)
+        """
+        with open(roster_path, 'r', encoding='utf-8') as roster_file:
+            names = [line.strip() for line in roster_file if line.strip() and not line.startswith('#')]
+
+        added, removed = self.replace_names(names)
+        self.loaded_from = roster_path
+        self.automaton.build()
+        print(f"📇 Roster yüklendi: {roster_path} ({len(self)} isim, +{added} / -{removed})")
+        return added, removed
+
+    def identify(self, detected_text, min_level=None, limit=None):
+        """
+        Metinde geçen roster isimlerini tek taramada bul
+
+        PARAMETRELER:
+            detected_text: OCR / metin katmanı çıktısı
+            min_level: En düşük kabul edilen seviye (varsayılan OCR_ROSTER_MIN_LEVEL)
+            limit: En fazla sonuç (varsayılan OCR_ROSTER_MAX_RESULTS, 0 = sınırsız)
+
+        DÖNEN DEĞER:
+            list: [{name, match_level, score, matched_text, position}, ...] puana göre azalan
+        """
+        start_time = time.time()
+        min_score = MATCH_LEVEL_SCORES[min_level or self.min_level]
+        limit = self.max_results if limit is None else limit
+
+        normalized_text = analyze_text(detected_text).normalized
+        best = {}  # normalize isim -> (puan, seviye, desen, pozisyon)
+
+        with self._lock:
+            for start, _, pattern in self.automaton.iter_matches(normalized_text):
+                for normalized, level in self._pattern_names[pattern].items():
+                    score = MATCH_LEVEL_SCORES[level]
+                    if score < min_score:
+                        continue
+                    current = best.get(normalized)
+                    if current is None or score > current[0]:
+                        best[normalized] = (score, level, pattern, start)
+
+            ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[1][3]))
+            if limit:
+                ranked = ranked[:limit]
+
+            results = [{
+                'name': self._names[normalized],
+                'match_level': level,
+                'score': score,
+                'matched_text': pattern,
+                'position': position
+            } for normalized, (score, level, pattern, position) in ranked]
+
+            self.stats['identify_calls'] += 1
+            self.stats['identify_seconds_total'] += time.time() - start_time
+
+        return results
+
+    def has_full_match(self, detected_text):
+        """Roster'dan en az bir isim metinde tam geçiyor mu (erken çıkış için)"""
+        return bool(self.identify(detected_text, min_level='full', limit=1))
+
+    def get_stats(self):
+        """İndeks boyutu ve ortalama tespit süresi"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['names'] = len(self._names)
+            stats['loaded_from'] = self.loaded_from
+            stats['automaton'] = self.automaton.get_stats()
+
+        calls = stats['identify_calls']
+        stats['avg_identify_ms'] = round(stats.pop('identify_seconds_total') / calls * 1000, 3) if calls else 0.0
+        return stats
+
+
+# Global instance (OCR_ROSTER_PATH verildiyse ilk kullanımda yüklenir)
+roster_index = None
+_roster_index_lock = threading.Lock()
+
+
+def get_roster_index():
+    """Global roster indeksini döndür"""
+    global roster_index
+
+    with _roster_index_lock:
+        if roster_index is None:
+            roster_index = RosterIndex()
+            if Config.OCR_ROSTER_PATH:
+                try:
+                    roster_index.load_file(Config.OCR_ROSTER_PATH)
+                except OSError as e:
+                    print(f"⚠️ Roster dosyası okunamadı ({Config.OCR_ROSTER_PATH}): {e}")
+        return roster_index
+
+
+# ============ BENCHMARK ============
+def run_benchmark(name_count=20000, repeats=5, seed=42):
+    """
+    Otomat ile mevcut isim başına döngüyü (search_with_priority) karşılaştır
+
+    Sentetik roster: Türkçe ad / soyad havuzundan rastgele 2-3 parçalı isimler.
+    Metin: tipik bir sayfa uzunluğunda dolgu + roster'dan bir isim.
+    """
+    import random
+    from App.ocr.ocr_engine import search_with_priority
+
+    first_names = ['Ahmet', 'Mehmet', 'Ayşe', 'Fatma', 'Mustafa', 'Emine', 'Ali', 'Hatice', 'Hüseyin',
+                   'Zeynep', 'İbrahim', 'Elif', 'Hasan', 'Şükrü', 'Gülşen', 'Ömer', 'Çağla', 'Rüçhan',
+                   'Yusuf', 'Özlem', 'Murat', 'Esra', 'Emre', 'Merve', 'Burak', 'Büşra', 'Serkan']
+    last_names = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın',
+                  'Özdemir', 'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt',
+                  'Özkan', 'Şimşek', 'Polat', 'Korkmaz', 'Avcı', 'Güneş', 'Erdoğan', 'Aktaş', 'Ünal']
+
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < name_count:
+        parts = [rng.choice(first_names)]
+        if rng.random() < 0.4:
+            parts.append(rng.choice(first_names))
+        parts.append(rng.choice(last_names))
+        parts.append(str(len(names)))  # benzersizlik için hasta no benzeri son ek
+        names.add(' '.join(parts))
+    names = sorted(names)
+
+    target = names[len(names) // 2]
+    filler = ("Sayın Hasta Bilgileri Poliçe No 123456 Tarih 01.01.2026 Sigorta Şirketi Allianz "
+              "Muayene Tetkik Tedavi Hastane Kurumu Epikriz Rapor ") * 20
+    text = f"{filler}HASTA ADI SOYADI: {target.upper()} {filler}"
+
+    print(f"📇 Roster benchmark: {name_count} isim, metin {len(text)} karakter, {repeats} tekrar")
+
+    index = RosterIndex()
+    build_start = time.time()
+    index.add_names(names)
+    index.automaton.build()
+    build_seconds = time.time() - build_start
+    automaton_stats = index.automaton.get_stats()
+    print(f"   Kurulum: {build_seconds:.2f}s ({automaton_stats['patterns']} desen, {automaton_stats['nodes']} düğüm)")
+
+    start = time.time()
+    for _ in range(repeats):
+        identified = index.identify(text, min_level='full', limit=0)
+    automaton_ms = (time.time() - start) / repeats * 1000
+
+    start = time.time()
+    for _ in range(repeats):
+        looped = [name for name in names if search_with_priority(text, name)]
+    loop_ms = (time.time() - start) / repeats * 1000
+
+    print(f"   Otomat:  {automaton_ms:9.2f} ms/metin  (tam eşleşme: {[item['name'] for item in identified]})")
+    print(f"   Döngü:   {loop_ms:9.2f} ms/metin  (herhangi seviye: {len(looped)} isim)")
+    print(f"   Hızlanma: x{loop_ms / automaton_ms:.0f}" if automaton_ms else "")
+
+    incremental_start = time.time()
+    index.add_names(['Yeni Hasta Test 999999'])
+    index.identify(text, limit=1)
+    print(f"   Tek isim ekleme + ilk arama: {(time.time() - incremental_start) * 1000:.1f} ms")
+
+    return {
+        'names': name_count,
+        'build_seconds': build_seconds,
+        'automaton_ms': automaton_ms,
+        'loop_ms': loop_ms
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Roster indeksi benchmark')
+    parser.add_argument('--names', type=int, default=20000, help='Sentetik roster boyutu')
+    parser.add_argument('--repeats', type=int, default=5, help='Metin başına tekrar')
+    args = parser.parse_args()
+
+    run_benchmark(args.names, args.repeats)
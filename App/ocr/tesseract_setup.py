@@ -0,0 +1,88 @@
+"""
+DOSYA: ocr/tesseract_setup.py
+AMAÇ: Tesseract yolunun ayarlanması ve kurulum kontrolü (ilk kullanımda, süreç başına bir kez)
+- Yol TESSERACT_PATH'ten gelir; boşsa PATH'teki 'tesseract' kullanılır
+- Bulunamazsa Windows varsayılan kurulum yolları denenir
+- Sürüm / dil kontrolü (iki tesseract süreci) import anında değil ilk OCR'da çalışır;
+  sonuç önbelleklenir, eşzamanlı ilk çağrılar tek kontrol yapar
+"""
+import os
+import threading
+import time
+
+import pytesseract
+
+from App.utils.config import Config
+from App.utils.startup_report import record_step
+
+# TESSERACT_PATH çalışmazsa denenecek yollar
+FALLBACK_PATHS = [
+    r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+    r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
+]
+
+_status = None
+_lock = threading.Lock()
+
+
+def _probe(tesseract_cmd):
+    """Verilen yolla Tesseract sürümünü ve dillerini oku"""
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    version = pytesseract.get_tesseract_version()
+    languages = pytesseract.get_languages()
+    return str(version), 'tur' in languages
+
+
+def check_tesseract_setup():
+    """
+    Tesseract kurulumunu kontrol et (önbelleksiz)
+
+    DÖNEN DEĞER:
+        dict: available, turkish, version, path
+    """
+    candidates = [Config.TESSERACT_PATH or pytesseract.pytesseract.tesseract_cmd]
+    if os.name == 'nt':
+        candidates += [path for path in FALLBACK_PATHS if path not in candidates]
+
+    last_error = None
+    for tesseract_cmd in candidates:
+        try:
+            version, turkish = _probe(tesseract_cmd)
+            print(f"✅ Tesseract {version} hazır! ({tesseract_cmd})")
+            if not turkish:
+                print("⚠️ Türkçe dil paketi yok - 'eng' kullanılacak")
+            return {'available': True, 'turkish': turkish, 'version': version, 'path': tesseract_cmd}
+        except Exception as e:
+            last_error = e
+
+    print(f"❌ Tesseract test hatası: {last_error}")
+    print("❌ Tesseract bulunamadı. Lütfen kurun veya TESSERACT_PATH ayarlayın: "
+          "https://github.com/UB-Mannheim/tesseract/wiki")
+    return {'available': False, 'turkish': False, 'version': None, 'path': candidates[0],
+            'error': str(last_error)}
+
+
+def get_tesseract_status():
+    """Tesseract kontrol sonucu (ilk çağrıda kontrol edilir)"""
+    global _status
+
+    if _status is not None:
+        return _status
+
+    with _lock:
+        if _status is None:
+            start = time.perf_counter()
+            status = check_tesseract_setup()
+            record_step('tesseract_probe', time.perf_counter() - start,
+                        'ok' if status['available'] else 'error', status.get('error'))
+            _status = status
+        return _status
+
+
+def is_tesseract_available():
+    return get_tesseract_status()['available']
+
+
+def get_ocr_lang():
+    """OCR dili: Türkçe paket varsa 'tur+eng'"""
+    return 'tur+eng' if get_tesseract_status()['turkish'] else 'eng'
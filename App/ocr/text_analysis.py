@@ -0,0 +1,196 @@
+"""
+DOSYA: ocr/text_analysis.py
+AMAÇ: OCR çıktısının tek seferlik analizi - tüm eşleştiriciler aynı yapıyı kullanır
+- Türkçe normalizasyon: ASCII metinde sadece lower(), diğerlerinde sadece geçen karakterler
+  değiştirilir; boşluk sadeleştirme regex yerine split/join
+- AnalyzedDocument: normalize metin, token dizisi, token pozisyonları, n-gram kümesi (gerektiğinde)
+- analyze_text aynı metin için aynı nesneyi döndürür (isim arama, PSM denemeleri,
+  sigorta şirketi arama aynı sayfa metnini tekrar normalize etmez)
+- İsim sorguları da (normalize parçalar) önbelleklenir
+
+BENCHMARK:
+    python -m App.ocr.text_analysis --pages 200
+"""
+import re
+from functools import lru_cache
+
+# Küçük harfe çevrildikten sonra kalan Türkçe karakterler (sıra önemli:
+# 'İ'.lower() ayrık noktalı i üretir, 'ı' ondan önce değiştirilir)
+TURKISH_REPLACEMENTS = (
+    ('ç', 'c'), ('ğ', 'g'), ('ı', 'i'), ('i\u0307', 'i'),
+    ('ö', 'o'), ('ş', 's'), ('ü', 'u')
+)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# İsim eşleşme seviyeleri ve puanları (tek isim, çoklu aday ve roster eşleştirmesi ortak)
+MATCH_LEVEL_SCORES = {
+    'full': 1.0,
+    'n-1': 0.75,
+    'pair': 0.5,
+    'single': 0.25
+}
+
+ANALYSIS_CACHE_SIZE = 64
+NAME_CACHE_SIZE = 4096
+
+
+def normalize_turkish_text(text):
+    """Türkçe karakterleri normalize et (küçük harf, ASCII, tek boşluk)"""
+    if not text:
+        return ""
+
+    normalized = text.lower()
+    if not normalized.isascii():
+        # Sadece metinde geçen karakterler için replace (ASCII metinde hiç geçiş yok)
+        for turkish_char, ascii_char in TURKISH_REPLACEMENTS:
+            if turkish_char in normalized:
+                normalized = normalized.replace(turkish_char, ascii_char)
+
+    return ' '.join(normalized.split())
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalized_name_parts(name):
+    """İsmin normalize parçaları (tuple, önbellekli)"""
+    return tuple(normalize_turkish_text(name).split())
+
+
+class AnalyzedDocument:
+    """
+    Bir OCR çıktısının analiz edilmiş hâli
+
+    tokens / offsets normalize metin üzerindedir; n-gram kümesi ilk istendiğinde
+    kurulur ve daha uzun n-gram istenirse genişletilir.
+    """
+
+    def __init__(self, text):
+        self.text = text or ''
+        self.normalized = normalize_turkish_text(self.text)
+
+        self.tokens = []
+        self.offsets = []
+        for match in TOKEN_PATTERN.finditer(self.normalized):
+            self.tokens.append(match.group())
+            self.offsets.append(match.start())
+
+        self._ngrams = set()
+        self._ngram_max_n = 0
+
+    @property
+    def token_positions(self):
+        """[(token, pozisyon), ...]"""
+        return list(zip(self.tokens, self.offsets))
+
+    def ngrams(self, max_n):
+        """1..max_n uzunluklu tüm ardışık token gruplarının kümesi (kelime sınırlarında)"""
+        if max_n > self._ngram_max_n:
+            tokens = self.tokens
+            ngrams = self._ngrams
+            for n in range(self._ngram_max_n + 1, max_n + 1):
+                for i in range(len(tokens) - n + 1):
+                    ngrams.add(' '.join(tokens[i:i + n]))
+            self._ngram_max_n = max_n
+        return self._ngrams
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyze_text(text):
+    """Metnin analizini getir (aynı metin için aynı nesne)"""
+    return AnalyzedDocument(text)
+
+
+# ============ BENCHMARK ============
+def legacy_normalize(text):
+    """Önceki uygulama (zincirleme replace + regex) - sadece karşılaştırma için"""
+    if not text:
+        return ""
+
+    turkish_chars = {
+        'ç': 'c', 'Ç': 'c', 'ğ': 'g', 'Ğ': 'g',
+        'ı': 'i', 'I': 'i', 'İ': 'i', 'ö': 'o', 'Ö': 'o',
+        'ş': 's', 'Ş': 's', 'ü': 'u', 'Ü': 'u'
+    }
+
+    normalized = text.lower()
+    for turkish_char, ascii_char in turkish_chars.items():
+        normalized = normalized.replace(turkish_char.lower(), ascii_char)
+
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+def run_benchmark(pages=200, psm_attempts=6):
+    """
+    Sayfa başına isim + sigorta eşleştirme maliyeti
+
+    Önceki akış: isim araması 1 + PSM denemesi başına 1 + sigorta araması 1 metin
+    normalizasyonu, ayrıca her sigorta aramasında ~40 anahtar normalizasyonu.
+    Yeni akış: mevcut eşleştiriciler (sayfa başına tek analiz).
+    """
+    import contextlib
+    import io
+    import time
+    from App.ocr.ocr_engine import (
+        search_name_tolerant, search_with_priority, search_insurance_company, match_candidate_names
+    )
+    from App.ocr.insurer_detector import DEFAULT_INSURERS
+
+    base_text = ("SAYIN HASTA BİLGİLERİ  Poliçe No: 123456  Tarih: 01.01.2026\n"
+                 "Hasta Adı Soyadı: AHMET RÜÇHAN YILMAZ   TC: 12345678901\n"
+                 "ALLİANZ SİGORTA A.Ş. Muayene / Tetkik / Tedavi  Epikriz Raporu\n") * 15
+    page_texts = [f"{base_text} Sayfa {page}" for page in range(pages)]
+    name = 'Ahmet Rüçhan Yılmaz'
+    candidates = [name, 'Mehmet Ali Kaya', 'Ayşe Kaya', 'Zeynep Şahin']
+
+    print(f"🔤 Metin analizi benchmark: {pages} sayfa, {len(base_text)} karakter/sayfa, {psm_attempts} PSM denemesi")
+
+    start = time.perf_counter()
+    for text in page_texts:
+        for _ in range(2 + psm_attempts):
+            legacy_normalize(text)
+        for key in DEFAULT_INSURERS:
+            legacy_normalize(key)
+    legacy_ms = (time.perf_counter() - start) / pages * 1000
+
+    analyze_text.cache_clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for text in page_texts:
+            search_name_tolerant(text, name)
+            for _ in range(psm_attempts):
+                search_with_priority(text, name)
+            match_candidate_names(text, candidates)
+            search_insurance_company(text)
+        current_ms = (time.perf_counter() - start) / pages * 1000
+
+    start = time.perf_counter()
+    for text in page_texts:
+        normalize_turkish_text(text)
+    normalize_ms = (time.perf_counter() - start) / pages * 1000
+
+    start = time.perf_counter()
+    for text in page_texts:
+        legacy_normalize(text)
+    legacy_single_ms = (time.perf_counter() - start) / pages * 1000
+
+    print(f"   Tek normalizasyon:  yeni {normalize_ms:.3f} ms  |  önceki {legacy_single_ms:.3f} ms")
+    print(f"   Sayfa başına:       önceki akış (sadece normalizasyon) {legacy_ms:.3f} ms")
+    print(f"                       mevcut akış (tüm eşleştiriciler)   {current_ms:.3f} ms")
+
+    return {
+        'normalize_ms': normalize_ms,
+        'legacy_single_ms': legacy_single_ms,
+        'legacy_page_ms': legacy_ms,
+        'current_page_ms': current_ms
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Metin analizi mikro benchmark')
+    parser.add_argument('--pages', type=int, default=200, help='Sayfa sayısı')
+    parser.add_argument('--psm-attempts', type=int, default=6, help='Sayfa başına PSM denemesi')
+    args = parser.parse_args()
+
+    run_benchmark(args.pages, args.psm_attempts)
@@ -0,0 +1,285 @@
+"""
+DOSYA: ocr/text_cache.py
+AMAÇ: İçerik adresli OCR metin cache'i (Tesseract çağrılarının önünde)
+- Anahtar: render edilmiş sayfa piksellerinin hash'i + görünüm (ön işleme profili)
+  + DPI / upscale + dil + PSM + OEM + Tesseract değişkenleri
+- Aynı sayfa tekrar geldiğinde (retry, farklı isimle tekrar gönderim, config
+  değişikliği sonrası yeniden işleme) OCR yapılmaz; isim/sigorta araması cache'teki metinle çalışır
+- L1: süreç içi LRU (bayt limitli)
+- L2 (opsiyonel): Redis (TTL + Redis maxmemory politikası) veya yerel disk (boyut limitli)
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from App.utils.config import Config
+from App.utils.redis_client import get_redis_client
+
+REDIS_KEY_PREFIX = "ocr_text:"
+
+
+def make_cache_key(image_hash, view_name, profile_version, dpi, upscale_factor, lang, psm, oem, variables=None):
+    """OCR geçişinin içerik adresli anahtarı (sha256 hex)"""
+    parts = [
+        image_hash,
+        f"view={view_name}@{profile_version}",
+        f"dpi={dpi}",
+        f"upscale={upscale_factor}",
+        f"lang={lang}",
+        f"psm={psm}",
+        f"oem={oem}",
+        json.dumps(sorted((variables or {}).items()), ensure_ascii=False)
+    ]
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+class RedisTextStore:
+    """Paylaşılan L2: Redis (eviction Redis'in maxmemory politikasına bırakılır)"""
+
+    name = "redis"
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+
+    def get(self, key):
+        client = get_redis_client()
+        if client is None:
+            return None
+        return client.get(f"{REDIS_KEY_PREFIX}{key}")
+
+    def put(self, key, payload):
+        client = get_redis_client()
+        if client is None:
+            return False
+        client.set(f"{REDIS_KEY_PREFIX}{key}", payload, ex=self.ttl)
+        return True
+
+
+class DiskTextStore:
+    """
+    Yerel L2: dizin altında anahtar başına bir JSON dosyası
+
+    Toplam boyut limiti aşılınca en eski erişilen dosyalar silinir (limitin %90'ına kadar).
+    """
+
+    name = "disk"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._approx_bytes = None
+        self.evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                payload = cache_file.read()
+        except FileNotFoundError:
+            return None
+
+        # Erişim zamanını güncelle (eviction sırası)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return payload
+
+    def put(self, key, payload):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            cache_file.write(payload)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._directory_size()
+            else:
+                self._approx_bytes += len(payload.encode('utf-8'))
+
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+        return True
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as scanner:
+            for entry in scanner:
+                if entry.is_file() and entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _directory_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """En eski dosyaları limitin %90'ına inene kadar sil"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                continue
+
+        self._approx_bytes = total
+
+
+class OCRTextCache:
+    """
+    İki katmanlı OCR metin cache'i
+
+    Değerler word_data.build_ocr_page sözlükleridir (metin + kelime kutuları + güven).
+    L1'deki sözlükler çağıranlarla paylaşılır; değiştirilmemelidir.
+    """
+
+    def __init__(self):
+        self.enabled = Config.OCR_TEXT_CACHE_ENABLED
+        self.max_memory_bytes = Config.OCR_TEXT_CACHE_MEMORY_MB * 1024 * 1024
+
+        self._entries = OrderedDict()  # key -> (ocr_page, size_bytes)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'l1_hits': 0,
+            'l2_hits': 0,
+            'misses': 0,
+            'puts': 0,
+            'l1_evictions': 0,
+            'l2_errors': 0
+        }
+
+        self.shared_store = self._create_shared_store()
+
+    @staticmethod
+    def _create_shared_store():
+        backend = Config.OCR_TEXT_CACHE_BACKEND.lower()
+        try:
+            if backend == 'redis':
+                return RedisTextStore(Config.OCR_TEXT_CACHE_TTL)
+            if backend == 'disk':
+                return DiskTextStore(Config.OCR_TEXT_CACHE_DIR, Config.OCR_TEXT_CACHE_DISK_MB * 1024 * 1024)
+        except Exception as e:
+            print(f"⚠️ OCR metin cache L2 ({backend}) başlatılamadı: {e}")
+        return None
+
+    def _remember(self, key, ocr_page, size_bytes):
+        """L1'e ekle ve bayt limitini aşan en eski kayıtları çıkar"""
+        with self._lock:
+            if key in self._entries:
+                self._memory_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (ocr_page, size_bytes)
+            self._memory_bytes += size_bytes
+
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self.stats['l1_evictions'] += 1
+
+    def get(self, key):
+        """Cache'teki OCR geçişini getir (yoksa None)"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['l1_hits'] += 1
+                return entry[0]
+
+        if self.shared_store is not None:
+            try:
+                payload = self.shared_store.get(key)
+            except Exception as e:
+                payload = None
+                with self._lock:
+                    self.stats['l2_errors'] += 1
+                print(f"⚠️ OCR metin cache L2 okuma hatası: {e}")
+
+            if payload:
+                ocr_page = json.loads(payload)
+                self._remember(key, ocr_page, len(payload))
+                with self._lock:
+                    self.stats['l2_hits'] += 1
+                return ocr_page
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key, ocr_page):
+        """OCR geçişini cache'e yaz (L1 + varsa L2)"""
+        if not self.enabled:
+            return
+
+        payload = json.dumps(ocr_page, ensure_ascii=False)
+        self._remember(key, ocr_page, len(payload))
+
+        with self._lock:
+            self.stats['puts'] += 1
+
+        if self.shared_store is not None:
+            try:
+                self.shared_store.put(key, payload)
+            except Exception as e:
+                with self._lock:
+                    self.stats['l2_errors'] += 1
+                print(f"⚠️ OCR metin cache L2 yazma hatası: {e}")
+
+    def clear(self):
+        """L1'i boşalt (L2'ye dokunulmaz)"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self):
+        """Cache istatistiklerini getir"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['l1_entries'] = len(self._entries)
+            stats['l1_bytes'] = self._memory_bytes
+
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['l1_hits'] + stats['l2_hits']) / lookups, 3) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['shared_backend'] = self.shared_store.name if self.shared_store else None
+        if isinstance(self.shared_store, DiskTextStore):
+            stats['l2_evictions'] = self.shared_store.evictions
+        return stats
+
+
+# Global instance
+text_cache = OCRTextCache()
+
+
+def get_text_cache():
+    """Global OCR metin cache instance'ını döndür"""
+    return text_cache
+
+
+def hash_image_bytes(data, shape):
+    """Render edilmiş sayfa piksellerinin hash'i"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr(tuple(shape)).encode('ascii'))
+    digest.update(data)
+    return digest.hexdigest()
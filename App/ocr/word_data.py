@@ -0,0 +1,103 @@
+"""
+DOSYA: ocr/word_data.py
+AMAÇ: Kelime seviyesinde OCR çıktısı (metin + konum + güven)
+- Tesseract'ın kelime kutuları ve güven skorları tek bir sözlük yapısında toplanır
+- Geçiş başına ortalama / medyan güven hesaplanır
+- Metin, satır bilgisi korunarak kelimelerden yeniden kurulabilir
+"""
+from statistics import median
+
+
+def make_word(text, left, top, width, height, confidence, line):
+    """Tek kelime kaydı (koordinatlar OCR yapılan görüntünün pikselleri)"""
+    return {
+        'text': text,
+        'left': int(left),
+        'top': int(top),
+        'width': int(width),
+        'height': int(height),
+        'confidence': round(float(confidence), 1),
+        'line': line
+    }
+
+
+def words_from_tesseract_data(data):
+    """
+    pytesseract image_to_data (Output.DICT) çıktısını kelime listesine çevir
+
+    Boş kutular ve kelime olmayan seviyeler (conf = -1) atlanır.
+    """
+    words = []
+    line_keys = {}
+
+    for index, text in enumerate(data.get('text', [])):
+        text = (text or '').strip()
+        confidence = float(data['conf'][index])
+        if not text or confidence < 0:
+            continue
+
+        line_key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+        line = line_keys.setdefault(line_key, len(line_keys))
+
+        words.append(make_word(
+            text,
+            data['left'][index],
+            data['top'][index],
+            data['width'][index],
+            data['height'][index],
+            confidence,
+            line
+        ))
+
+    return words
+
+
+def text_from_words(words):
+    """Kelimelerden satır yapısını koruyarak metin kur"""
+    lines = []
+    current_line = None
+
+    for word in words:
+        if word['line'] != current_line:
+            lines.append([])
+            current_line = word['line']
+        lines[-1].append(word['text'])
+
+    return '\n'.join(' '.join(line) for line in lines)
+
+
+def summarize_confidence(words):
+    """
+    Geçişin güven özetini hesapla
+
+    DÖNEN DEĞER:
+        dict: mean_confidence, median_confidence, word_count (kelime yoksa güven 0)
+    """
+    confidences = [word['confidence'] for word in words]
+    if not confidences:
+        return {'mean_confidence': 0.0, 'median_confidence': 0.0, 'word_count': 0}
+
+    return {
+        'mean_confidence': round(sum(confidences) / len(confidences), 1),
+        'median_confidence': round(float(median(confidences)), 1),
+        'word_count': len(confidences)
+    }
+
+
+def build_ocr_page(words, text=None):
+    """
+    Tek OCR geçişinin sonucu
+
+    PARAMETRELER:
+        words: make_word kayıtları
+        text: Motorun ürettiği düz metin (yoksa kelimelerden kurulur)
+
+    DÖNEN DEĞER:
+        dict: text, words, mean_confidence, median_confidence, word_count
+    """
+    page = {
+        'text': text if text is not None else text_from_words(words),
+        'words': words
+    }
+    page.update(summarize_confidence(words))
+    return page
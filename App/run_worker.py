@@ -10,20 +10,41 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import argparse
 import time
-from App.services.redis_queue_module.worker import create_worker
+from App.utils.config import Config
 
 def main():
     parser = argparse.ArgumentParser(description='OCR Background Worker')
     parser.add_argument('--worker-id', type=str, help='Worker ID (opsiyonel)')
     parser.add_argument('--workers', type=int, default=1, help='Worker sayısı (default: 1)')
     parser.add_argument('--verbose', action='store_true', help='Detaylı log')
+    parser.add_argument('--prefork', action='store_true',
+                        help='Her worker ayrı süreç (supervisor: bir kez hazırla, fork, izle, yeniden başlat)')
+    parser.add_argument('--max-jobs', type=int, default=Config.WORKER_MAX_JOBS,
+                        help='Prefork: worker bu kadar job sonra yenilenir (0 = sınırsız)')
+    parser.add_argument('--max-rss-mb', type=int, default=Config.WORKER_MAX_RSS_MB,
+                        help='Prefork: RSS bu sınırı aşan worker yenilenir (0 = sınırsız)')
 
     args = parser.parse_args()
 
     print(f"🚀 OCR Worker Launcher")
     print(f"Worker sayısı: {args.workers}")
 
+    if args.prefork:
+        from App.services.redis_queue_module.supervisor import WorkerSupervisor
+
+        supervisor = WorkerSupervisor(
+            args.workers,
+            worker_prefix=args.worker_id or 'worker',
+            max_jobs=args.max_jobs,
+            max_rss_mb=args.max_rss_mb
+        )
+        supervisor.run()
+        sys.exit(0)
+
+    from App.services.redis_queue_module.worker import create_worker
+
     workers = []
+    threads = []
 
     try:
         # Multiple worker başlat
@@ -47,12 +68,13 @@ def main():
 
                 thread = threading.Thread(target=run_worker, args=(worker,), daemon=True)
                 thread.start()
+                threads.append(thread)
                 print(f"✅ Worker başlatıldı: {worker_id}")
 
         if args.workers > 1:
             print(f"🔄 {args.workers} worker çalışıyor. Ctrl+C ile durdurun.")
-            # Ana thread'i canlı tut
-            while True:
+            # Ana thread'i canlı tut (sinyalle tüm worker'lar durunca çık)
+            while any(thread.is_alive() for thread in threads):
                 time.sleep(1)
 
     except KeyboardInterrupt:
@@ -1,9 +1,19 @@
 import uuid
-import pytesseract
+import time
 import os
-from App.ocr.ocr_engine import run_ocr_with_monitoring
+import threading
+from App.ocr.roster_index import get_roster_index
+from App.ocr.text_analysis import MATCH_LEVEL_SCORES
+from App.ocr.tesseract_setup import get_tesseract_status, is_tesseract_available
 from App.database.models import OCRResult
 from App.database.db_manager import get_db_manager
+from App.utils.file_fingerprint import get_file_fingerprint
+from App.utils.startup_report import timed_step
+from App.services.result_cache import get_result_cache, entry_from_record, make_result_key
+from App.services.single_flight import get_single_flight
+
+# OCR motoru (OpenCV, Tesseract havuzu) ilk OCR isteğinde import edilir;
+# OCR yapmayan endpoint'ler ve API açılışı bu maliyeti ödemez
 
 class OCRService:
 
@@ -11,42 +21,12 @@ class OCRService:
         self.db_manager = get_db_manager()
         print("🔧 OCRService oluşturuldu")
 
-        # Tesseract path'ini environment'tan al veya varsayılan kullan
-        tesseract_path = os.getenv('TESSERACT_PATH', r'C:\Program Files\Tesseract-OCR\tesseract.exe')
-
-        # pytesseract'a path'i set et
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        print(f"🔧 Tesseract path set: {tesseract_path}")
+    @property
+    def tesseract_available(self):
+        """Tesseract kontrolü ilk OCR isteğinde yapılır (TESSERACT_PATH, gerekirse varsayılan yollar)"""
+        return is_tesseract_available()
 
-        # Test et
-        try:
-            version = pytesseract.get_tesseract_version()
-            print(f"✅ Tesseract {version} başarıyla test edildi!")
-            self.tesseract_available = True
-        except Exception as e:
-            print(f"❌ Tesseract test hatası: {e}")
-
-            # Alternative paths dene
-            alt_paths = [
-                r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-                r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-            ]
-
-            self.tesseract_available = False
-            for alt_path in alt_paths:
-                try:
-                    pytesseract.pytesseract.tesseract_cmd = alt_path
-                    version = pytesseract.get_tesseract_version()
-                    print(f"✅ Tesseract bulundu: {alt_path}")
-                    self.tesseract_available = True
-                    break
-                except:
-                    continue
-
-            if not self.tesseract_available:
-                print(f"❌ Tesseract bulunamadı. Lütfen kurun: https://github.com/UB-Mannheim/tesseract/wiki")
-
-    def process_pdf(self, pdf_path, searched_name, user_info=None):
+    def process_pdf(self, pdf_path, searched_name, user_info=None, file_fingerprint=None):
         # ============ TESSERACT KONTROL ============
         if not self.tesseract_available:
             print("❌ Tesseract kullanılamıyor!")
@@ -64,36 +44,95 @@ class OCRService:
         print(f"Dosya: {pdf_path}")
         print(f"Aranan İsim: {searched_name}")
 
-        # Duplicate kontrol et
+        # İçerik parmak izi (submit anında hesaplandıysa ve dosya değişmediyse tekrar hash'lenmez)
+        fingerprint = None
+        fingerprint_seconds = 0
+        try:
+            fingerprint_info = get_file_fingerprint(pdf_path, known=file_fingerprint)
+            fingerprint = fingerprint_info['fingerprint']
+            fingerprint_seconds = fingerprint_info['seconds']
+            print(f"🧬 Parmak izi: {fingerprint[:40]}... ({fingerprint_info['source']}, {fingerprint_seconds:.3f}s)")
+        except OSError as e:
+            print(f"⚠️ Parmak izi hesaplanamadı, yol ile kontrol edilecek: {e}")
+
+        # Duplicate kontrol et (L1 süreç içi → L2 Redis → L3 Postgres)
         print(f"🔍 Duplicate kontrol ediliyor...")
-        duplicate_record = OCRResult.find_duplicate(
-            file_path=pdf_path,
-            expected_name=searched_name
+        lookup_start = time.time()
+        cached_entry, cache_tier = get_result_cache().lookup(
+            searched_name,
+            file_fingerprint=fingerprint,
+            file_path=pdf_path
         )
+        lookup_seconds = round(time.time() - lookup_start, 4)
 
-        if duplicate_record:
-            print(f"✅ DUPLICATE BULUNDU!")
-            print(f"   Mevcut Task ID: {duplicate_record.task_id}")
-            print(f"   İlk İşlem Zamanı: {duplicate_record.created_at}")
-            print(f"🚀 Cache'den sonuç döndürülüyor...")
+        if cached_entry:
+            print(f"✅ DUPLICATE BULUNDU! ({cache_tier.upper()}, {lookup_seconds:.4f}s)")
+            return self._cached_response(
+                cached_entry, cache_tier, searched_name, fingerprint,
+                {'fingerprint_seconds': fingerprint_seconds, 'cache_lookup_seconds': lookup_seconds}
+            )
 
-            return {
-                'task_id': duplicate_record.task_id,
-                'success': True,
-                'duplicate': True,
-                'ocr_result': {
-                    'expected_name': duplicate_record.expected_name,
-                    'detected_name': duplicate_record.detected_name,
-                    'match_status': duplicate_record.match_status,
-                    'insurance_company': duplicate_record.insurance_company,
-                    'processing_info': {
-                        'cached': True,
-                        'original_processing_time': getattr(duplicate_record, 'processing_time_seconds', None),
-                        'cache_hit': True
-                    }
+        # ============ SINGLE-FLIGHT: AYNI İŞ ŞU AN İŞLENİYOR MU? ============
+        single_flight = get_single_flight()
+        flight_key = make_result_key(fingerprint or f"path:{pdf_path}", searched_name)
+        is_leader, lease_token = single_flight.acquire(flight_key)
+
+        if not is_leader:
+            print(f"⏳ Aynı doküman + isim şu an işleniyor, sonucu bekleniyor...")
+            wait_start = time.time()
+            cached_entry, cache_tier = single_flight.wait_for_leader(
+                flight_key,
+                lambda: get_result_cache().lookup(searched_name, file_fingerprint=fingerprint, file_path=pdf_path)
+            )
+            wait_seconds = round(time.time() - wait_start, 3)
+
+            if cached_entry:
+                print(f"✅ Liderin sonucu alındı ({wait_seconds:.1f}s bekleme)")
+                response = self._cached_response(
+                    cached_entry, cache_tier, searched_name, fingerprint,
+                    {'fingerprint_seconds': fingerprint_seconds, 'single_flight_wait_seconds': wait_seconds}
+                )
+                response['ocr_result']['processing_info']['coalesced'] = True
+                return response
+
+            print(f"⚠️ Lider sonucu gelmedi ({wait_seconds:.1f}s), normal işleme devam ediliyor")
+
+        try:
+            return self._process_new_document(pdf_path, searched_name, fingerprint, fingerprint_seconds)
+        finally:
+            if is_leader:
+                single_flight.release(flight_key, lease_token)
+
+    def _cached_response(self, cached_entry, cache_tier, searched_name, fingerprint, timing):
+        """Cache'ten (veya liderden) gelen tamamlanmış sonucu servis cevabına çevir"""
+        print(f"   Mevcut Task ID: {cached_entry['task_id']}")
+        print(f"   İlk İşlem Zamanı: {cached_entry['created_at']}")
+        print(f"🚀 Cache'den sonuç döndürülüyor...")
+
+        return {
+            'task_id': cached_entry['task_id'],
+            'success': True,
+            'duplicate': True,
+            'ocr_result': {
+                'expected_name': searched_name,
+                'detected_name': cached_entry['detected_name'],
+                'match_status': cached_entry['match_status'],
+                'match_level': cached_entry.get('match_level'),
+                'insurance_company': cached_entry['insurance_company'],
+                'processing_info': {
+                    'cached': True,
+                    'original_processing_time': cached_entry.get('processing_time_seconds'),
+                    'cache_hit': True,
+                    'cache_tier': cache_tier,
+                    'original_file_path': cached_entry['file_path'],
+                    'file_fingerprint': fingerprint,
+                    'timing': timing
                 }
             }
+        }
 
+    def _process_new_document(self, pdf_path, searched_name, fingerprint, fingerprint_seconds):
+        """Cache'te olmayan (doküman, isim) için OCR + DB kaydı"""
         print(f"✅ Yeni kombinasyon, OCR işlemi başlatılıyor...")
         # ============ DUPLICATE KONTROL BİTTİ ============
 
@@ -113,7 +152,8 @@ class OCRService:
             ocr_record = OCRResult.create_processing_record(
                 task_id=task_id,
                 expected_name=searched_name,
-                file_path=pdf_path
+                file_path=pdf_path,
+                file_fingerprint=fingerprint
             )
 
             # Dosya boyutunu kaydet
@@ -131,8 +171,9 @@ class OCRService:
         try:
             print(f"🚀 OCR Engine başlatılıyor...")
 
-            # Tesseract path'ini tekrar force et (safety)
-            print(f"🔧 Tesseract path kontrol: {pytesseract.pytesseract.tesseract_cmd}")
+            from App.ocr.ocr_engine import run_ocr_with_monitoring
+
+            print(f"🔧 Tesseract path kontrol: {get_tesseract_status()['path']}")
 
             ocr_result = run_ocr_with_monitoring(
                 expected_name=searched_name,
@@ -141,6 +182,11 @@ class OCRService:
 
             print(f"✅ OCR işlemi tamamlandı")
 
+            # Parmak izi süresini timing'e ekle
+            processing_info = ocr_result.setdefault('processing_info', {})
+            processing_info['file_fingerprint'] = fingerprint
+            processing_info.setdefault('timing', {})['fingerprint_seconds'] = fingerprint_seconds
+
         except Exception as e:
             error_msg = f"OCR işlemi hatası: {str(e)}"
             print(f"❌ {error_msg}")
@@ -166,6 +212,12 @@ class OCRService:
                 ocr_record.update_with_ocr_result(ocr_result)
                 print(f"✅ Database kaydı güncellendi")
 
+                # Sonraki istekler DB'ye gitmeden L1/L2'den cevaplansın
+                result_entry = entry_from_record(ocr_record)
+                result_entry['processing_time_seconds'] = ocr_result.get('processing_info', {}) \
+                    .get('timing', {}).get('total_time_seconds')
+                get_result_cache().store(result_entry, file_fingerprint=fingerprint, file_path=pdf_path)
+
                 # Task ID'yi OCR sonucuna ekle
                 ocr_result['task_id'] = task_id
 
@@ -205,6 +257,222 @@ class OCRService:
             'error': 'Bilinmeyen hata oluştu'
         }
 
+    def process_pdf_multi(self, pdf_path, candidate_names, file_fingerprint=None):
+        """
+        Tek doküman + N aday isim: doküman bir kez OCR'lanır, tüm adaylar aynı metinde puanlanır
+
+        Cache'te sonucu olan adaylar için OCR yapılmaz; hepsi cache'teyse doküman hiç okunmaz.
+        Her aday için ayrı OCRResult kaydı oluşturulur (tek isimli işlerle aynı duplicate anahtarı).
+        """
+        if not self.tesseract_available:
+            print("❌ Tesseract kullanılamıyor!")
+            return {
+                'success': False,
+                'error': 'Tesseract OCR not available. Please install Tesseract.',
+                'results': []
+            }
+
+        # Aynı isim iki kez gelirse bir kez işlenir
+        candidate_names = list(dict.fromkeys(candidate_names))
+
+        print(f"\n{'=' * 60}")
+        print(f"👥 ÇOKLU İSİM OCR SERVİS İŞLEMİ BAŞLADI")
+        print(f"{'=' * 60}")
+        print(f"Dosya: {pdf_path}")
+        print(f"Aday İsimler ({len(candidate_names)}): {candidate_names}")
+
+        fingerprint = None
+        fingerprint_seconds = 0
+        try:
+            fingerprint_info = get_file_fingerprint(pdf_path, known=file_fingerprint)
+            fingerprint = fingerprint_info['fingerprint']
+            fingerprint_seconds = fingerprint_info['seconds']
+        except OSError as e:
+            print(f"⚠️ Parmak izi hesaplanamadı, yol ile kontrol edilecek: {e}")
+
+        results_by_name = {}
+        pending_names = []
+        for name in candidate_names:
+            cached_entry, cache_tier = get_result_cache().lookup(
+                name, file_fingerprint=fingerprint, file_path=pdf_path
+            )
+            if cached_entry:
+                results_by_name[name] = self._cached_response(
+                    cached_entry, cache_tier, name, fingerprint, {'fingerprint_seconds': fingerprint_seconds}
+                )
+            else:
+                pending_names.append(name)
+
+        print(f"🔍 Cache: {len(results_by_name)} aday hazır, {len(pending_names)} aday OCR bekliyor")
+
+        multi_result = None
+        if pending_names:
+            from App.ocr.ocr_engine import run_ocr_multi_name
+
+            multi_result = run_ocr_multi_name(pending_names, pdf_path)
+
+            if multi_result.get('error'):
+                print(f"❌ Çoklu isim OCR hatası: {multi_result['error']}")
+                for name in pending_names:
+                    results_by_name[name] = {
+                        'task_id': None,
+                        'success': False,
+                        'error': multi_result['error'],
+                        'ocr_result': None
+                    }
+            else:
+                processing_info = multi_result['processing_info']
+                processing_info['file_fingerprint'] = fingerprint
+                processing_info['timing']['fingerprint_seconds'] = fingerprint_seconds
+                processing_info['multi_name_candidates'] = len(pending_names)
+
+                for name_result in multi_result['results']:
+                    ocr_result = dict(name_result)
+                    ocr_result['insurance_company'] = multi_result['insurance_company']
+                    ocr_result['processing_info'] = processing_info
+                    results_by_name[name_result['expected_name']] = self._save_name_result(
+                        pdf_path, fingerprint, ocr_result
+                    )
+
+        results = [results_by_name[name] for name in candidate_names]
+        # En iyi aday cache'ten gelenler dahil tüm adaylar arasından seçilir
+        ranking = self._rank_candidate_results(candidate_names, results)
+
+        return {
+            'success': all(result['success'] for result in results),
+            'file_fingerprint': fingerprint,
+            'results': results,
+            'best_name': ranking['best_name'],
+            'best_level': ranking['best_level'],
+            'ambiguous': ranking['ambiguous'],
+            'cached_candidates': len(candidate_names) - len(pending_names),
+            'error': multi_result.get('error') if multi_result else None
+        }
+
+    @staticmethod
+    def _rank_candidate_results(candidate_names, results):
+        """
+        Aday sonuçlarını (cache + yeni OCR) eşleşme seviyesine göre karşılaştır
+
+        Seviyesi bilinmeyen eşleşme (tek isimli akıştan veya DB'den gelen cache kaydı)
+        en düşük seviye ('single') sayılır.
+
+        DÖNEN DEĞER:
+            dict: best_name (tek en iyi aday yoksa None), best_level, ambiguous
+        """
+        scored = []
+        for name, result in zip(candidate_names, results):
+            ocr_result = result.get('ocr_result') or {}
+            level = ocr_result.get('match_level')
+            if level is None and result.get('success') and ocr_result.get('match_status'):
+                level = 'single'
+            scored.append((name, level, MATCH_LEVEL_SCORES.get(level, 0.0)))
+
+        best_score = max((score for _, _, score in scored), default=0.0)
+        best = [(name, level) for name, level, score in scored if best_score > 0 and score == best_score]
+
+        return {
+            'best_name': best[0][0] if len(best) == 1 else None,
+            'best_level': best[0][1] if best else None,
+            'ambiguous': len(best) > 1
+        }
+
+    def identify_document(self, pdf_path, min_level=None, limit=None):
+        """
+        İsim verilmeden dokümanın hastasını roster'dan tespit et
+
+        Doküman bir kez okunur; roster'dan bir isim tam eşleşince sonraki aşamalar çalışmaz.
+        """
+        if not self.tesseract_available:
+            print("❌ Tesseract kullanılamıyor!")
+            return {
+                'success': False,
+                'error': 'Tesseract OCR not available. Please install Tesseract.',
+                'matches': []
+            }
+
+        roster_index = get_roster_index()
+        if not len(roster_index):
+            return {
+                'success': False,
+                'error': 'Roster boş - önce isim listesi yüklenmeli',
+                'matches': []
+            }
+
+        print(f"\n{'=' * 60}")
+        print(f"📇 ROSTER İLE HASTA TESPİTİ ({len(roster_index)} isim)")
+        print(f"{'=' * 60}")
+        print(f"Dosya: {pdf_path}")
+
+        from App.ocr.ocr_engine import read_document_text, search_insurance_company
+
+        try:
+            detected_text, processing_info = read_document_text(
+                pdf_path, roster_index.has_full_match, "Roster Identify - Single Pass"
+            )
+        except Exception as e:
+            print(f"❌ Doküman okunamadı: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'matches': []
+            }
+
+        identify_start = time.time()
+        matches = roster_index.identify(detected_text, min_level=min_level, limit=limit)
+        processing_info['timing']['identify_seconds'] = round(time.time() - identify_start, 4)
+
+        insurance_company = search_insurance_company(detected_text)
+
+        if matches:
+            print(f"📇 {len(matches)} roster eşleşmesi, en iyi: {matches[0]['name']} ({matches[0]['match_level']})")
+        else:
+            print(f"📇 Roster'dan eşleşen isim yok")
+
+        return {
+            'success': True,
+            'matches': matches,
+            'insurance_company': insurance_company if insurance_company else "Bulunamadı",
+            'processing_info': processing_info
+        }
+
+    def _save_name_result(self, pdf_path, fingerprint, ocr_result):
+        """Çoklu isim sonucundaki tek adayı DB'ye ve sonuç cache'ine yaz"""
+        task_id = str(uuid.uuid4())
+        ocr_result['task_id'] = task_id
+
+        try:
+            ocr_record = OCRResult.create_processing_record(
+                task_id=task_id,
+                expected_name=ocr_result['expected_name'],
+                file_path=pdf_path,
+                file_fingerprint=fingerprint
+            )
+            ocr_record.update_with_ocr_result(ocr_result)
+
+            result_entry = entry_from_record(ocr_record)
+            result_entry['processing_time_seconds'] = ocr_result['processing_info']['timing'].get('total_time_seconds')
+            result_entry['match_level'] = ocr_result.get('match_level')
+            get_result_cache().store(result_entry, file_fingerprint=fingerprint, file_path=pdf_path)
+
+        except Exception as e:
+            error_msg = f"Database güncelleme hatası: {str(e)}"
+            print(f"❌ {error_msg}")
+            ocr_result['database_warning'] = error_msg
+
+            return {
+                'task_id': task_id,
+                'success': True,
+                'ocr_result': ocr_result,
+                'warning': 'OCR başarılı ama database güncellenemedi'
+            }
+
+        return {
+            'task_id': task_id,
+            'success': True,
+            'ocr_result': ocr_result
+        }
+
     def get_result_by_task_id(task_id):
 
         try:
@@ -233,9 +501,18 @@ class OCRService:
             print(f"❌ Son sonuç getirilemedi: {e}")
             return []
 
-ocr_service = OCRService()
+ocr_service = None
+_ocr_service_lock = threading.Lock()
 
 def get_ocr_service():
+    """Global OCRService (ilk çağrıda oluşturulur)"""
+    global ocr_service
+
+    if ocr_service is None:
+        with _ocr_service_lock:
+            if ocr_service is None:
+                with timed_step('ocr_service'):
+                    ocr_service = OCRService()
     return ocr_service
 
 
@@ -18,15 +18,22 @@ class JobPriority(Enum):
 
 class OCRJob:
 
-    def __init__(self, pdf_path, searched_name, priority=JobPriority.NORMAL, user_info=None):
+    def __init__(self, pdf_path, searched_name, priority=JobPriority.NORMAL, user_info=None, file_fingerprint=None,
+                 candidate_names=None):
         self.job_id = str(uuid.uuid4())
         self.pdf_path = pdf_path
         self.searched_name = searched_name
         self.priority = priority
         self.user_info = user_info or {}
+        # Submit anında hesaplanan içerik parmak izi ({'fingerprint', 'size', 'mtime_ns'})
+        self.file_fingerprint = file_fingerprint
+        # Çoklu isim işi: aynı PDF için aday isimler (tek OCR geçişi); None ise tek isimli iş
+        self.candidate_names = candidate_names
 
         self.status = JobStatus.PENDING
         self.created_at = datetime.datetime.now()
+        # Pending queue'ye (son) giriş zamanı, unix saniye - alınma gecikmesi ölçümü için
+        self.enqueued_at = None
         self.started_at = None
         self.completed_at = None
 
@@ -45,8 +52,11 @@ class OCRJob:
             'searched_name': self.searched_name,
             'priority': self.priority.value,
             'user_info': self.user_info,
+            'file_fingerprint': self.file_fingerprint,
+            'candidate_names': self.candidate_names,
             'status': self.status.value,
             'created_at': self.created_at.isoformat(),
+            'enqueued_at': self.enqueued_at,
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'result': self.result,
@@ -70,9 +80,14 @@ class OCRJob:
         job.pdf_path = data['pdf_path']
         job.searched_name = data['searched_name']
         job.priority = JobPriority(data['priority'])
-        job.user_info = data.get('user_info', {})
+        # Eski sürümlerde claim blob'u Redis Lua (cjson) ile yeniden yazılıyordu; cjson boş obje /
+        # listeyi ayırt etmez: {} ve [] ikisi de boş kabul edilir
+        job.user_info = data.get('user_info') or {}
+        job.file_fingerprint = data.get('file_fingerprint')
+        job.candidate_names = data.get('candidate_names') or None
         job.status = JobStatus(data['status'])
         job.created_at = datetime.datetime.fromisoformat(data['created_at'])
+        job.enqueued_at = data.get('enqueued_at')
         job.started_at = datetime.datetime.fromisoformat(data['started_at']) if data['started_at'] else None
         job.completed_at = datetime.datetime.fromisoformat(data['completed_at']) if data['completed_at'] else None
         job.result = data.get('result')
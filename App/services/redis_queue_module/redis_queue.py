@@ -2,11 +2,119 @@
 DOSYA: queue/redis_queue.py
 AMAÇ: Redis ile queue işlemlerini yönetir
 Job'ları ekler, çeker, günceller
+- Job alma tek Lua script'i ile atomik: en yüksek priority'li job pending'den çıkar,
+  processing olarak işaretlenir ve lease kaydedilir (tek round trip, iki worker aynı job'ı alamaz)
+- Pending skoru = queue'ye giriş (ms) - priority × QUEUE_PRIORITY_AGING_SECONDS: aynı priority'de
+  kesin FIFO; bekleyen düşük priority'li job her aging süresinde bir seviye öne geçer (açlık olmaz)
+- Boş queue'de worker uyumaz, bildirim listesinde (BLPOP) bloklanır; job eklenince hemen uyanır
+- Alınma gecikmesi (queue'ye giriş → worker'ın alması) ölçülür, priority bazında da istatistiklerde döner
+- Lease (görünürlük süresi): worker işlediği job'ın lease'ini heartbeat ile uzatır; süresi dolan
+  job'lar (worker öldü / dondu) reaper tarafından max_retries'a göre pending'e döner veya failed olur
+- Kapanan worker elindeki job'ı retry sayısı artmadan geri bırakabilir (release_job)
+- Job sayıları durum geçişlerinde aynı transaction'da güncellenen sayaç hash'inden okunur;
+  istatistikler O(1), KEYS kullanılmaz
+- Biten job'lar QUEUE_JOB_TTL ile kendiliğinden silinir; temizlik kalanları (TTL'siz eski job'lar,
+  süresi dolmuş id'ler) SCAN / SSCAN ile parça parça bulur ve pipeline ile siler (Redis bloklanmaz)
+
+ÖLÇÜM:
+    python -m App.services.redis_queue_module.redis_queue --jobs 20
 """
 
+import threading
+import time
 import redis
 from datetime import datetime, timedelta
-from App.services.redis_queue_module.job_models import OCRJob, JobStatus
+from App.services.redis_queue_module.job_models import OCRJob, JobStatus, JobPriority
+from App.utils.config import Config
+from App.utils.startup_report import timed_step
+
+# Atomik job alma (pending → processing + lease); job verisi olduğu gibi döner.
+# Claim alanları (status, worker_id...) Python'da yazılır: cjson blob'u tekrar encode ederse
+# sayılar 14 haneli double olur (örn. file_fingerprint.mtime_ns bozulur)
+# KEYS: pending, processing, leases, notify, pickup istatistikleri, pickup örnekleri,
+#       priority başına pickup örnekleri...
+# ARGV: job key prefix, şimdi (unix), lease saniyesi, örnek sayısı,
+#       KEYS[7..] ile aynı sırada priority değerleri...
+CLAIM_SCRIPT = """
+local function record_wait(suffix, samples_key, wait)
+    redis.call('HINCRBY', KEYS[5], 'count' .. suffix, 1)
+    redis.call('HINCRBYFLOAT', KEYS[5], 'total_seconds' .. suffix, wait)
+    if wait > tonumber(redis.call('HGET', KEYS[5], 'max_seconds' .. suffix) or '0') then
+        redis.call('HSET', KEYS[5], 'max_seconds' .. suffix, wait)
+    end
+    redis.call('LPUSH', samples_key, wait)
+    redis.call('LTRIM', samples_key, 0, tonumber(ARGV[4]) - 1)
+end
+
+while true do
+    local head = redis.call('ZRANGE', KEYS[1], 0, 0)
+    if #head == 0 then
+        -- Kalan bildirimler zaten alınmış job'lara ait
+        redis.call('DEL', KEYS[4])
+        return false
+    end
+
+    local job_id = head[1]
+    redis.call('ZREM', KEYS[1], job_id)
+
+    local job_key = ARGV[1] .. job_id
+    local data = redis.call('GET', job_key)
+    if data then
+        -- Sadece okunur; blob yeniden encode edilmez
+        local job = cjson.decode(data)
+        local now = tonumber(ARGV[2])
+
+        redis.call('SADD', KEYS[2], job_id)
+        redis.call('ZADD', KEYS[3], now + tonumber(ARGV[3]), job_id)
+
+        local enqueued_at = tonumber(job['enqueued_at'])
+        if enqueued_at then
+            local wait = math.max(0, now - enqueued_at)
+            record_wait('', KEYS[6], wait)
+
+            local priority = tostring(job['priority'])
+            for i = 7, #KEYS do
+                if ARGV[i - 2] == priority then
+                    record_wait(':' .. priority, KEYS[i], wait)
+                end
+            end
+        end
+        return data
+    end
+    -- Verisi olmayan job id'si atlanır, sıradakine geçilir
+end
+"""
+
+# Lease uzatma (sadece job hâlâ bu worker'da processing ise)
+# KEYS: leases  ARGV: job key, job_id, worker_id, yeni lease bitişi (unix)
+HEARTBEAT_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[2]) then
+    return 0
+end
+local data = redis.call('GET', ARGV[1])
+if not data then
+    return 0
+end
+local job = cjson.decode(data)
+if job['status'] ~= 'processing' or job['worker_id'] ~= ARGV[3] then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[4], ARGV[2])
+return 1
+"""
+
+
+# QUEUE_PRIORITY_AGING_SECONDS=0 (yaşlandırma kapalı) iken priority seviyeleri arası skor farkı (ms):
+# herhangi bir bekleme süresinden büyük, kesin priority sırası
+STRICT_PRIORITY_SPAN_MS = 10 ** 13
+
+
+def percentile(sorted_values, ratio):
+    """Sıralı listeden yüzdelik (en yakın sıra)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
 
 
 class RedisQueueManager:
@@ -15,8 +123,9 @@ class RedisQueueManager:
     Job'ları priority'ye göre sıralar ve işler
     """
 
-    def __init__(self, redis_host='localhost', redis_port=6379, redis_db=0):
-        """Redis bağlantısını başlat"""
+    def __init__(self, redis_host='localhost', redis_port=6379, redis_db=0,
+                 queue_prefix='ocr_jobs', job_prefix='ocr_job:'):
+        """Redis bağlantısını başlat (prefix'ler ölçüm / test için ayrı anahtar alanı sağlar)"""
         try:
             self.redis_client = redis.Redis(
                 host=redis_host,
@@ -34,11 +143,49 @@ class RedisQueueManager:
             raise e
 
         # Queue isimleri
-        self.PENDING_QUEUE = "ocr_jobs:pending"
-        self.PROCESSING_QUEUE = "ocr_jobs:processing"
-        self.COMPLETED_SET = "ocr_jobs:completed"
-        self.FAILED_SET = "ocr_jobs:failed"
-        self.JOB_HASH_PREFIX = "ocr_job:"
+        self.PENDING_QUEUE = f"{queue_prefix}:pending"
+        self.PROCESSING_QUEUE = f"{queue_prefix}:processing"
+        self.COMPLETED_SET = f"{queue_prefix}:completed"
+        self.FAILED_SET = f"{queue_prefix}:failed"
+        self.JOB_HASH_PREFIX = job_prefix
+        # Processing job'ların lease bitiş zamanları (score = unix saniye)
+        self.LEASES = f"{queue_prefix}:leases"
+        # Job eklenince push edilir; boşta bekleyen worker'lar BLPOP ile uyanır
+        self.NOTIFY_LIST = f"{queue_prefix}:notify"
+        self.PICKUP_STATS = f"{queue_prefix}:pickup_stats"
+        self.PICKUP_SAMPLES = f"{queue_prefix}:pickup_samples"
+        self.PRIORITY_PICKUP_SAMPLES = {
+            priority: f"{self.PICKUP_SAMPLES}:{priority.value}" for priority in JobPriority
+        }
+        # Durum geçişlerinde güncellenen sayaçlar (jobs = sistemdeki job sayısı, diğerleri toplam geçiş)
+        self.COUNTERS = f"{queue_prefix}:counters"
+        # Reaper / temizliği fleet genelinde aralık başına bir kez çalıştırmak için kilitler
+        self.REAPER_LOCK = f"{queue_prefix}:reaper_lock"
+        self.CLEANUP_LOCK = f"{queue_prefix}:cleanup_lock"
+
+        self.lease_seconds = Config.QUEUE_LEASE_SECONDS
+        self.aging_seconds = Config.QUEUE_PRIORITY_AGING_SECONDS
+        self.job_ttl = Config.QUEUE_JOB_TTL or None  # biten job'ların saklanma süresi (None = süresiz)
+        self._claim_script = self.redis_client.register_script(CLAIM_SCRIPT)
+        self._heartbeat_script = self.redis_client.register_script(HEARTBEAT_SCRIPT)
+
+    def _pending_score(self, job):
+        """
+        Pending queue skoru (düşük skor önce alınır)
+
+        Queue'ye giriş zamanı (ms) - priority × aging süresi: aynı priority'de önce giren önce
+        alınır; bir priority seviyesi aging süresi kadar beklemeye eşittir (ör. 300 sn'de LOW,
+        3 seviye üstündeki NORMAL job'ların en fazla 15 dk gerisinde kalır).
+        """
+        enqueued_ms = (job.enqueued_at or time.time()) * 1000
+        if self.aging_seconds > 0:
+            return enqueued_ms - job.priority.value * self.aging_seconds * 1000
+        return enqueued_ms - job.priority.value * STRICT_PRIORITY_SPAN_MS
+
+    def _enqueue_commands(self, pipeline, job):
+        """Job'ı pending'e ekleyen komutlar: skor + bekleyen worker bildirimi"""
+        pipeline.zadd(self.PENDING_QUEUE, {job.job_id: self._pending_score(job)})
+        pipeline.lpush(self.NOTIFY_LIST, job.job_id)
 
     def add_job(self, job):
         """
@@ -48,15 +195,17 @@ class RedisQueueManager:
         try:
             # Job'ı Redis hash olarak kaydet
             job_key = f"{self.JOB_HASH_PREFIX}{job.job_id}"
+            job.enqueued_at = time.time()
             job_data = job.to_json()
 
-            # Job detaylarını kaydet
-            self.redis_client.set(job_key, job_data)
-
-            # Priority queue'ye ekle (ZADD - sorted set)
-            # Yüksek priority = düşük score (önce işlenir)
-            score = -job.priority.value  # Negative çünkü düşük score önce gelir
-            self.redis_client.zadd(self.PENDING_QUEUE, {job.job_id: score})
+            # Job detayları + priority queue (ZADD) + bildirim tek transaction'da
+            # (bildirim job'dan önce görünmez)
+            pipeline = self.redis_client.pipeline(transaction=True)
+            pipeline.set(job_key, job_data)
+            self._enqueue_commands(pipeline, job)
+            pipeline.hincrby(self.COUNTERS, 'jobs', 1)
+            pipeline.hincrby(self.COUNTERS, 'enqueued', 1)
+            pipeline.execute()
 
             print(f"✅ Job queue'ye eklendi: {job.job_id} (priority: {job.priority.name})")
             return True
@@ -65,92 +214,197 @@ class RedisQueueManager:
             print(f"❌ Job ekleme hatası: {e}")
             return False
 
-    def get_next_job(self, worker_id):
+    def add_jobs(self, jobs):
         """
-        En yüksek priority'li job'ı al ve processing'e taşı
-        Eski Redis versiyonları için uyumlu
+        Birden fazla job'ı tek transaction'da ekle (hepsi eklenir ya da hiçbiri)
+
+        Tüm SET / ZADD komutları ve tek bildirim LPUSH'u tek pipeline'da (MULTI/EXEC)
+        gönderilir: N job için tek round trip.
+
+        DÖNEN DEĞER:
+            list: Her index için {'index', 'job_id', 'queued', 'error'}
         """
+        if not jobs:
+            return []
+
         try:
-            # En düşük score'lu job'ı al (en yüksek priority)
-            result = self.redis_client.zrange(self.PENDING_QUEUE, 0, 0, withscores=True)
+            enqueued_at = time.time()
+            pipeline = self.redis_client.pipeline(transaction=True)
+            for job in jobs:
+                job.enqueued_at = enqueued_at
+                pipeline.set(f"{self.JOB_HASH_PREFIX}{job.job_id}", job.to_json())
+                pipeline.zadd(self.PENDING_QUEUE, {job.job_id: self._pending_score(job)})
+            pipeline.lpush(self.NOTIFY_LIST, *[job.job_id for job in jobs])
+            pipeline.hincrby(self.COUNTERS, 'jobs', len(jobs))
+            pipeline.hincrby(self.COUNTERS, 'enqueued', len(jobs))
+            pipeline.execute()
+
+            print(f"✅ {len(jobs)} job tek transaction'da queue'ye eklendi")
+            return [{'index': index, 'job_id': job.job_id, 'queued': True, 'error': None}
+                    for index, job in enumerate(jobs)]
 
-            if not result:
-                return None  # Queue boş
+        except Exception as e:
+            print(f"❌ Toplu job ekleme hatası (hiçbiri eklenmedi): {e}")
+            return [{'index': index, 'job_id': job.job_id, 'queued': False, 'error': str(e)}
+                    for index, job in enumerate(jobs)]
 
-            job_id, score = result[0]
+    def claim_job(self, worker_id):
+        """
+        En yüksek priority'li job'ı atomik olarak al (bloklamaz)
 
-            # Job'ı pending queue'den çıkar
-            removed = self.redis_client.zrem(self.PENDING_QUEUE, job_id)
-            if not removed:
-                # Başka worker almış olabilir, tekrar dene
-                return None
+        DÖNEN DEĞER:
+            OCRJob veya None (queue boş)
+        """
+        job_data = self._claim_script(
+            keys=[self.PENDING_QUEUE, self.PROCESSING_QUEUE, self.LEASES,
+                  self.NOTIFY_LIST, self.PICKUP_STATS, self.PICKUP_SAMPLES,
+                  *self.PRIORITY_PICKUP_SAMPLES.values()],
+            args=[self.JOB_HASH_PREFIX, time.time(), self.lease_seconds, Config.QUEUE_PICKUP_SAMPLES,
+                  *[priority.value for priority in self.PRIORITY_PICKUP_SAMPLES]]
+        )
+        if not job_data:
+            return None
 
-            # Job detaylarını Redis'ten al
-            job_key = f"{self.JOB_HASH_PREFIX}{job_id}"
-            job_data = self.redis_client.get(job_key)
+        job = OCRJob.from_json(job_data)
+        job.mark_processing(worker_id)
+        if not self._record_claim(job, job_data):
+            return None
+        return job
 
-            if not job_data:
-                print(f"⚠️ Job data bulunamadı: {job_id}")
-                return None
+    def _record_claim(self, job, claimed_data):
+        """
+        Alınan job'ın claim alanlarını yaz (status, worker_id, started_at)
 
-            # Job'ı deserialize et
-            job = OCRJob.from_json(job_data)
+        Job verisi claim'den beri değiştiyse (lease dolup reaper geri aldıysa) yazılmaz.
+        Bu yazmadan önce worker düşerse job lease dolunca reaper tarafından pending'e döner.
+
+        DÖNEN DEĞER:
+            bool: Claim alanları yazıldıysa True
+        """
+        job_key = f"{self.JOB_HASH_PREFIX}{job.job_id}"
+        with self.redis_client.pipeline() as pipeline:
+            while True:
+                try:
+                    pipeline.watch(job_key)
+                    if pipeline.get(job_key) != claimed_data:
+                        pipeline.unwatch()
+                        print(f"⚠️ Job alındıktan sonra değişti, bırakıldı: {job.job_id}")
+                        return False
+
+                    pipeline.multi()
+                    pipeline.set(job_key, job.to_json())
+                    pipeline.execute()
+                    return True
+                except redis.WatchError:
+                    continue  # Job bu arada değişti, tekrar kontrol et
+
+    def get_next_job(self, worker_id, block_timeout=0):
+        """
+        En yüksek priority'li job'ı al ve processing'e taşı
 
-            # Job'ı processing olarak işaretle
-            job.mark_processing(worker_id)
+        PARAMETRELER:
+            block_timeout: Queue boşsa yeni job bildirimi için en fazla bu kadar saniye
+                           Redis'te bekle (0 = hemen dön)
 
-            # Processing queue'ye ekle
-            self.redis_client.sadd(self.PROCESSING_QUEUE, job_id)
+        DÖNEN DEĞER:
+            OCRJob veya None (süre içinde job gelmedi / hata)
+        """
+        try:
+            job = self.claim_job(worker_id)
 
-            # Job'ı güncelle
-            self.redis_client.set(job_key, job.to_json())
+            if job is None and block_timeout:
+                # Boş queue'de claim bildirim listesini temizler; sonraki ilk job bizi uyandırır
+                if self.redis_client.blpop(self.NOTIFY_LIST, timeout=block_timeout):
+                    job = self.claim_job(worker_id)
 
-            print(f"🔄 Job alındı: {job_id} by worker {worker_id}")
+            if job:
+                print(f"🔄 Job alındı: {job.job_id} by worker {worker_id}")
             return job
 
         except Exception as e:
             print(f"❌ Job alma hatası: {e}")
             return None
 
-    def update_job_status(self, job_id, status, result=None, error_message=None):
+    def update_job_status(self, job_id, status, result=None, error_message=None, worker_id=None):
         """
         Job'ın durumunu güncelle
+
+        PARAMETRELER:
+            worker_id: Verilirse job hâlâ bu worker'da processing değilse (lease süresi dolup
+                       reaper geri aldıysa) güncelleme yapılmaz, False döner
         """
+        job_key = f"{self.JOB_HASH_PREFIX}{job_id}"
         try:
-            job_key = f"{self.JOB_HASH_PREFIX}{job_id}"
-            job_data = self.redis_client.get(job_key)
-
-            if not job_data:
-                print(f"⚠️ Job bulunamadı: {job_id}")
-                return False
-
-            # Job'ı deserialize et
-            job = OCRJob.from_json(job_data)
-
-            # Status'ü güncelle
-            if status == JobStatus.COMPLETED:
-                job.mark_completed(result)
-                # Processing'den çıkar, completed'a ekle
-                self.redis_client.srem(self.PROCESSING_QUEUE, job_id)
-                self.redis_client.sadd(self.COMPLETED_SET, job_id)
-
-            elif status == JobStatus.FAILED:
-                job.mark_failed(error_message)
-                # Processing'den çıkar
-                self.redis_client.srem(self.PROCESSING_QUEUE, job_id)
-
-                # Retry edebilir mi?
-                if job.can_retry():
+            # Kontrol ve yazma WATCH ile atomik: arada reaper job'ı geri alırsa transaction
+            # iptal olur, kontrol tekrarlanır (geri alınmış job'ın üzerine yazılmaz)
+            with self.redis_client.pipeline() as pipeline:
+                while True:
+                    try:
+                        pipeline.watch(job_key)
+                        job_data = pipeline.get(job_key)
+
+                        if not job_data:
+                            pipeline.unwatch()
+                            print(f"⚠️ Job bulunamadı: {job_id}")
+                            return False
+
+                        # Job'ı deserialize et
+                        job = OCRJob.from_json(job_data)
+                        requeue = False
+
+                        if worker_id and (job.status != JobStatus.PROCESSING or job.worker_id != worker_id):
+                            pipeline.unwatch()
+                            print(f"⚠️ Job artık {worker_id} worker'ında değil (lease süresi doldu), "
+                                  f"sonuç yazılmadı: {job_id}")
+                            return False
+
+                        # Job, set'ler ve sayaçlar tek transaction'da (worker yarım güncelleme görmez)
+                        pipeline.multi()
+                        ttl = None
+
+                        # Status'ü güncelle
+                        if status == JobStatus.COMPLETED:
+                            job.mark_completed(result)
+                            # Processing'den çıkar, completed'a ekle
+                            pipeline.srem(self.PROCESSING_QUEUE, job_id)
+                            pipeline.zrem(self.LEASES, job_id)
+                            pipeline.sadd(self.COMPLETED_SET, job_id)
+                            pipeline.hincrby(self.COUNTERS, 'completed', 1)
+                            ttl = self.job_ttl
+
+                        elif status == JobStatus.FAILED:
+                            job.mark_failed(error_message)
+                            # Processing'den çıkar
+                            pipeline.srem(self.PROCESSING_QUEUE, job_id)
+                            pipeline.zrem(self.LEASES, job_id)
+
+                            # Retry edebilir mi?
+                            if job.can_retry():
+                                job.enqueued_at = time.time()
+                                requeue = True
+                            else:
+                                pipeline.sadd(self.FAILED_SET, job_id)
+                                pipeline.hincrby(self.COUNTERS, 'failed', 1)
+                                ttl = self.job_ttl
+
+                        # Job'ı güncelle (biten job TTL ile kendiliğinden silinir)
+                        pipeline.set(job_key, job.to_json(), ex=ttl)
+
+                        if requeue:
+                            # Pending queue'ye geri ekle
+                            self._enqueue_commands(pipeline, job)
+                            pipeline.hincrby(self.COUNTERS, 'retried', 1)
+
+                        pipeline.execute()
+                        break
+                    except redis.WatchError:
+                        continue  # Job bu arada değişti (reaper geri aldı), tekrar kontrol et
+
+            if status == JobStatus.FAILED:
+                if requeue:
                     print(f"🔄 Job retry edilecek: {job_id} (attempt {job.retry_count})")
-                    # Pending queue'ye geri ekle
-                    score = -job.priority.value
-                    self.redis_client.zadd(self.PENDING_QUEUE, {job_id: score})
                 else:
                     print(f"❌ Job max retry'a ulaştı: {job_id}")
-                    self.redis_client.sadd(self.FAILED_SET, job_id)
-
-            # Job'ı güncelle
-            self.redis_client.set(job_key, job.to_json())
 
             print(f"📊 Job status güncellendi: {job_id} → {status.value}")
             return True
@@ -159,6 +413,165 @@ class RedisQueueManager:
             print(f"❌ Status güncelleme hatası: {e}")
             return False
 
+    # ============ LEASE ============
+    def extend_lease(self, job_id, worker_id):
+        """
+        Processing job'ın lease'ini uzat (worker heartbeat'i)
+
+        DÖNEN DEĞER:
+            bool: False ise job artık bu worker'da değil (lease süresi dolup geri alınmış)
+        """
+        return bool(self._heartbeat_script(
+            keys=[self.LEASES],
+            args=[f"{self.JOB_HASH_PREFIX}{job_id}", job_id, worker_id, time.time() + self.lease_seconds]
+        ))
+
+    def release_job(self, job_id, worker_id):
+        """
+        Worker'ın elindeki job'ı pending'e geri bırak (kapanırken; retry sayısı artmaz)
+
+        DÖNEN DEĞER:
+            bool: Job geri bırakıldıysa True (job bu worker'da processing değilse False)
+        """
+        job_key = f"{self.JOB_HASH_PREFIX}{job_id}"
+        try:
+            with self.redis_client.pipeline() as pipeline:
+                while True:
+                    try:
+                        pipeline.watch(job_key)
+                        job_data = pipeline.get(job_key)
+                        job = OCRJob.from_json(job_data) if job_data else None
+                        if job is None or job.status != JobStatus.PROCESSING or job.worker_id != worker_id:
+                            pipeline.unwatch()
+                            return False
+
+                        job.status = JobStatus.PENDING
+                        job.worker_id = None
+                        job.started_at = None
+                        job.progress = 0
+                        job.enqueued_at = time.time()
+
+                        pipeline.multi()
+                        pipeline.set(job_key, job.to_json())
+                        pipeline.srem(self.PROCESSING_QUEUE, job_id)
+                        pipeline.zrem(self.LEASES, job_id)
+                        self._enqueue_commands(pipeline, job)
+                        pipeline.hincrby(self.COUNTERS, 'released', 1)
+                        pipeline.execute()
+
+                        print(f"↩️ Job queue'ye geri bırakıldı: {job_id} (worker {worker_id})")
+                        return True
+                    except redis.WatchError:
+                        continue  # Job bu arada değişti, tekrar kontrol et
+
+        except Exception as e:
+            print(f"❌ Job geri bırakma hatası: {e}")
+            return False
+
+    def _lease_unleased_processing_jobs(self, now):
+        """Lease'i olmayan processing job'lara lease ver (lease öncesi sürümlerden kalanlar)"""
+        processing = self.redis_client.smembers(self.PROCESSING_QUEUE)
+        if processing:
+            self.redis_client.zadd(self.LEASES, {job_id: now + self.lease_seconds for job_id in processing},
+                                   nx=True)
+
+    def _reap_job(self, job_id):
+        """
+        Lease'i dolmuş tek job'ı geri al
+
+        DÖNEN DEĞER:
+            'requeued' / 'failed' / 'cleared' (job yok veya artık processing değil) /
+            None (lease bu arada uzatıldı veya başka reaper aldı)
+        """
+        job_key = f"{self.JOB_HASH_PREFIX}{job_id}"
+        with self.redis_client.pipeline() as pipeline:
+            while True:
+                try:
+                    # Heartbeat sadece LEASES'i değiştirir (job anahtarına dokunmaz); ikisi de
+                    # izlenmezse okumadan sonra gelen heartbeat fark edilmez, canlı job geri alınır
+                    pipeline.watch(job_key, self.LEASES)
+                    job_data = pipeline.get(job_key)
+                    lease_until = pipeline.zscore(self.LEASES, job_id)
+                    if lease_until is None or lease_until > time.time():
+                        pipeline.unwatch()
+                        return None
+
+                    job = OCRJob.from_json(job_data) if job_data else None
+
+                    pipeline.multi()
+                    pipeline.zrem(self.LEASES, job_id)
+                    pipeline.srem(self.PROCESSING_QUEUE, job_id)
+
+                    if job is not None and job.status == JobStatus.PENDING:
+                        # Alındı ama claim alanları yazılmadan worker düştü: deneme sayılmaz
+                        job.enqueued_at = time.time()
+                        pipeline.set(job_key, job.to_json())
+                        self._enqueue_commands(pipeline, job)
+                        action = 'requeued'
+                    elif job is None or job.status != JobStatus.PROCESSING:
+                        action = 'cleared'
+                    else:
+                        job.mark_failed(f"Lease süresi doldu: worker {job.worker_id} yanıt vermedi")
+                        pipeline.hincrby(self.COUNTERS, 'reaped', 1)
+                        if job.can_retry():
+                            job.enqueued_at = time.time()
+                            pipeline.set(job_key, job.to_json())
+                            self._enqueue_commands(pipeline, job)
+                            pipeline.hincrby(self.COUNTERS, 'retried', 1)
+                            action = 'requeued'
+                        else:
+                            pipeline.set(job_key, job.to_json(), ex=self.job_ttl)
+                            pipeline.sadd(self.FAILED_SET, job_id)
+                            pipeline.hincrby(self.COUNTERS, 'failed', 1)
+                            action = 'failed'
+
+                    pipeline.execute()
+                    return action
+                except redis.WatchError:
+                    # Job (worker bitirdi) veya lease'ler (heartbeat, başka job'ın alınması) değişti;
+                    # lease tekrar okunur, uzatıldıysa job bırakılır
+                    continue
+
+    def reap_expired_jobs(self, limit=100):
+        """
+        Lease süresi dolan processing job'ları geri al
+
+        Retry hakkı olan job pending'e döner (retry_count artar), kalmayan failed olur.
+        Birden fazla reaper aynı anda çalışabilir; her job WATCH ile tek kez geri alınır.
+
+        DÖNEN DEĞER:
+            list: [{'job_id', 'action'}]
+        """
+        try:
+            now = time.time()
+            self._lease_unleased_processing_jobs(now)
+
+            reaped = []
+            for job_id in self.redis_client.zrangebyscore(self.LEASES, '-inf', now, start=0, num=limit):
+                action = self._reap_job(job_id)
+                if action:
+                    reaped.append({'job_id': job_id, 'action': action})
+
+            if reaped:
+                summary = ', '.join(f"{item['job_id']} → {item['action']}" for item in reaped)
+                print(f"🪦 Lease süresi dolan {len(reaped)} job geri alındı: {summary}")
+            return reaped
+
+        except Exception as e:
+            print(f"❌ Reaper hatası: {e}")
+            return []
+
+    def reap_if_due(self, owner, interval):
+        """
+        Fleet genelinde interval saniyede en fazla bir kez reaper çalıştır
+
+        DÖNEN DEĞER:
+            list veya None (bu aralıkta başka bir worker çalıştırdı)
+        """
+        if not self.redis_client.set(self.REAPER_LOCK, owner, nx=True, ex=max(1, int(interval))):
+            return None
+        return self.reap_expired_jobs()
+
     def get_job_status(self, job_id):
         """
         Job'ın mevcut durumunu getir
@@ -180,19 +593,35 @@ class RedisQueueManager:
     def get_queue_stats(self):
         """
         Queue istatistiklerini getir
+
+        Tüm değerler O(1) komutlarla tek pipeline'da okunur (job anahtarları taranmaz).
+        total_jobs_in_system sayaçtan gelir; TTL ile silinen job'lar bir sonraki temizlikte düşülür.
         """
         try:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.zcard(self.PENDING_QUEUE)
+            pipeline.scard(self.PROCESSING_QUEUE)
+            pipeline.scard(self.COMPLETED_SET)
+            pipeline.scard(self.FAILED_SET)
+            pipeline.zcard(self.LEASES)
+            pipeline.zcount(self.LEASES, '-inf', time.time())
+            pipeline.hgetall(self.COUNTERS)
+            pending, processing, completed, failed, leased, expired_leases, counters = pipeline.execute()
+
+            counters = {field: int(value) for field, value in counters.items()}
             stats = {
-                'pending_jobs': self.redis_client.zcard(self.PENDING_QUEUE),
-                'processing_jobs': self.redis_client.scard(self.PROCESSING_QUEUE),
-                'completed_jobs': self.redis_client.scard(self.COMPLETED_SET),
-                'failed_jobs': self.redis_client.scard(self.FAILED_SET),
-                'total_jobs_in_system': 0
+                'pending_jobs': pending,
+                'processing_jobs': processing,
+                'completed_jobs': completed,
+                'failed_jobs': failed,
+                'leased_jobs': leased,
+                'expired_leases': expired_leases,
+                # Sayaç yoksa (ilk temizlikten önce, eski kurulum) queue yapılarından hesaplanır
+                'total_jobs_in_system': counters.get('jobs', pending + processing + completed + failed),
+                'counters': counters
             }
 
-            # Toplam job sayısı
-            all_job_keys = self.redis_client.keys(f"{self.JOB_HASH_PREFIX}*")
-            stats['total_jobs_in_system'] = len(all_job_keys)
+            stats['pickup_latency'] = self.get_pickup_stats()
 
             return stats
 
@@ -200,41 +629,235 @@ class RedisQueueManager:
             print(f"❌ Stats alma hatası: {e}")
             return {}
 
-    def cleanup_old_jobs(self, days=7):
+    def get_pickup_stats(self):
+        """
+        Alınma gecikmesi: job'ın queue'ye girişinden bir worker'ın almasına kadar geçen süre
+
+        Toplam / ortalama / en fazla tüm zamanlar için; yüzdelikler son QUEUE_PICKUP_SAMPLES job için.
+        Aynı değerler priority bazında 'by_priority' altında (SLA kontrolü için).
+        Zamanlar API ve worker saatlerinden alınır (makineler arası saat farkı sonuca eklenir).
+        """
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.hgetall(self.PICKUP_STATS)
+        pipeline.lrange(self.PICKUP_SAMPLES, 0, -1)
+        for samples_key in self.PRIORITY_PICKUP_SAMPLES.values():
+            pipeline.lrange(samples_key, 0, -1)
+        totals, samples, *priority_samples = pipeline.execute()
+
+        stats = self._summarize_waits(totals, samples, '')
+        stats['aging_seconds'] = self.aging_seconds
+        stats['by_priority'] = {
+            priority.name: self._summarize_waits(totals, values, f":{priority.value}")
+            for priority, values in zip(self.PRIORITY_PICKUP_SAMPLES, priority_samples)
+        }
+        return stats
+
+    @staticmethod
+    def _summarize_waits(totals, samples, suffix):
+        """Sayaçlar (count / total_seconds / max_seconds + suffix) ve örneklerden özet"""
+        samples = sorted(float(value) for value in samples)
+        count = int(totals.get(f'count{suffix}', 0))
+        return {
+            'count': count,
+            'avg_ms': round(float(totals.get(f'total_seconds{suffix}', 0)) / count * 1000, 1) if count else 0.0,
+            'max_ms': round(float(totals.get(f'max_seconds{suffix}', 0)) * 1000, 1),
+            'recent_samples': len(samples),
+            'p50_ms': round(percentile(samples, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(samples, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(samples, 0.99) * 1000, 1)
+        }
+
+    def cleanup_old_jobs(self, days=7, batch_size=500):
         """
-        Eski job'ları temizle
+        Eski job'ları temizle (TTL'in kapsamadığı kalanlar)
+
+        - Job anahtarları SCAN ile batch_size'lık parçalarla gezilir; TTL'i olmayan biten job'lar
+          (TTL öncesi sürümlerden kalanlar) days'ten eskiyse pipeline ile silinir, değilse
+          kalan süreleri kadar TTL alır
+        - completed / failed set'leri SSCAN ile gezilir; anahtarı TTL ile silinmiş id'ler çıkarılır
+        - Sayaçtaki job sayısı silinen / süresi dolan job'lar kadar düşürülür
+        Her adım küçük komutlardan oluşur; Redis hiçbir aşamada uzun süre bloklanmaz.
+
+        DÖNEN DEĞER:
+            int: Silinen job + çıkarılan süresi dolmuş id sayısı
         """
         try:
+            start_time = time.time()
             cutoff_date = datetime.now() - timedelta(days=days)
-
-            # Tüm job'ları kontrol et
-            all_job_keys = self.redis_client.keys(f"{self.JOB_HASH_PREFIX}*")
-            cleaned_count = 0
-
-            for job_key in all_job_keys:
-                job_data = self.redis_client.get(job_key)
-                if job_data:
-                    job = OCRJob.from_json(job_data)
-                    if job.created_at < cutoff_date and job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-                        # Job'ı sil
-                        self.redis_client.delete(job_key)
-                        # Set'lerden de çıkar
-                        self.redis_client.srem(self.COMPLETED_SET, job.job_id)
-                        self.redis_client.srem(self.FAILED_SET, job.job_id)
-                        cleaned_count += 1
-
-            print(f"🧹 {cleaned_count} eski job temizlendi")
-            return cleaned_count
+            terminal_statuses = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+            scanned = deleted = expiring = pruned = 0
+
+            # 1) TTL'siz biten job'lar
+            cursor = 0
+            while True:
+                cursor, job_keys = self.redis_client.scan(
+                    cursor, match=f"{self.JOB_HASH_PREFIX}*", count=batch_size
+                )
+                scanned += len(job_keys)
+
+                if job_keys:
+                    pipeline = self.redis_client.pipeline(transaction=False)
+                    for job_key in job_keys:
+                        pipeline.ttl(job_key)
+                    without_ttl = [job_key for job_key, ttl in zip(job_keys, pipeline.execute()) if ttl == -1]
+
+                    if without_ttl:
+                        pipeline = self.redis_client.pipeline(transaction=False)
+                        for job_key in without_ttl:
+                            pipeline.get(job_key)
+                        job_datas = pipeline.execute()
+
+                        pipeline = self.redis_client.pipeline(transaction=False)
+                        for job_key, job_data in zip(without_ttl, job_datas):
+                            try:
+                                job = OCRJob.from_json(job_data) if job_data else None
+                            except Exception:
+                                continue  # bozuk kayıt, dokunulmaz
+                            if job is None or job.status not in terminal_statuses or \
+                                    (job.status == JobStatus.FAILED and job.can_retry()):
+                                continue  # bekleyen / işlenen / retry bekleyen job
+
+                            age_limit = job.created_at - cutoff_date
+                            if age_limit.total_seconds() <= 0:
+                                pipeline.delete(job_key)
+                                pipeline.srem(self.COMPLETED_SET, job.job_id)
+                                pipeline.srem(self.FAILED_SET, job.job_id)
+                                deleted += 1
+                            else:
+                                pipeline.expire(job_key, max(1, int(age_limit.total_seconds())))
+                                expiring += 1
+                        pipeline.execute()
+
+                if cursor == 0:
+                    break
+
+            # 2) Anahtarı TTL ile silinmiş id'ler
+            for set_key in (self.COMPLETED_SET, self.FAILED_SET):
+                cursor = 0
+                while True:
+                    cursor, job_ids = self.redis_client.sscan(set_key, cursor, count=batch_size)
+                    if job_ids:
+                        pipeline = self.redis_client.pipeline(transaction=False)
+                        for job_id in job_ids:
+                            pipeline.exists(f"{self.JOB_HASH_PREFIX}{job_id}")
+                        missing = [job_id for job_id, exists in zip(job_ids, pipeline.execute()) if not exists]
+                        if missing:
+                            self.redis_client.srem(set_key, *missing)
+                            pruned += len(missing)
+                    if cursor == 0:
+                        break
+
+            pipeline = self.redis_client.pipeline(transaction=True)
+            pipeline.hincrby(self.COUNTERS, 'cleaned', deleted)
+            pipeline.hincrby(self.COUNTERS, 'expired', pruned)
+            pipeline.hincrby(self.COUNTERS, 'jobs', -(deleted + pruned))
+            pipeline.execute()
+            # Sayaçsız kurulumda ilk temizlik sayacı taranan anahtar sayısıyla başlatır
+            if self.redis_client.hsetnx(self.COUNTERS, 'calibrated_at', int(time.time())):
+                self.redis_client.hset(self.COUNTERS, 'jobs', scanned - deleted)
+
+            print(f"🧹 {deleted} eski job silindi, {pruned} süresi dolmuş id çıkarıldı, "
+                  f"{expiring} job'a TTL verildi ({scanned} anahtar, {time.time() - start_time:.2f}s)")
+            return deleted + pruned
 
         except Exception as e:
             print(f"❌ Cleanup hatası: {e}")
             return 0
 
+    def cleanup_if_due(self, owner, interval, days=7):
+        """
+        Fleet genelinde interval saniyede en fazla bir kez temizlik çalıştır
+
+        DÖNEN DEĞER:
+            int veya None (bu aralıkta başka bir worker çalıştırdı)
+        """
+        if not self.redis_client.set(self.CLEANUP_LOCK, owner, nx=True, ex=max(1, int(interval))):
+            return None
+        return self.cleanup_old_jobs(days)
 
-# Global instance
-queue_manager = RedisQueueManager()
+
+# Global instance (ilk çağrıda bağlanır; import anında Redis'e bağlantı açılmaz)
+queue_manager = None
+_queue_manager_lock = threading.Lock()
 
 
 def get_queue_manager():
-    """Global queue manager instance'ını döndür"""
-    return queue_manager
\ No newline at end of file
+    """
+    Global queue manager instance'ını döndür
+
+    HATA:
+        Redis'e bağlanılamazsa bağlantı hatası (sonraki çağrı tekrar dener)
+    """
+    global queue_manager
+
+    if queue_manager is None:
+        with _queue_manager_lock:
+            if queue_manager is None:
+                with timed_step('queue_manager'):
+                    queue_manager = RedisQueueManager()
+    return queue_manager
+
+# ============ ÖLÇÜM ============
+def run_pickup_benchmark(jobs=10, max_gap=2.0, poll_interval=5.0):
+    """
+    Boştaki worker'ın yeni job'ı alma gecikmesi: eski yöntem (boşsa poll_interval uyu)
+    ile bloklayan alma karşılaştırması. Ayrı anahtar alanında çalışır, sonunda temizler.
+    """
+    import random
+    from App.services.redis_queue_module.job_models import OCRJob as BenchJob
+
+    def consume(manager, mode, latencies):
+        while len(latencies) < jobs:
+            if mode == 'poll':
+                job = manager.claim_job('bench_worker')
+                if job is None:
+                    time.sleep(poll_interval)
+                    continue
+            else:
+                job = manager.get_next_job('bench_worker', block_timeout=Config.QUEUE_BLOCK_TIMEOUT)
+                if job is None:
+                    continue
+            latencies.append(time.time() - job.enqueued_at)
+
+    results = {}
+    for mode in ('poll', 'block'):
+        manager = RedisQueueManager(Config.REDIS_HOST, Config.REDIS_PORT, Config.REDIS_DB,
+                                    queue_prefix=f"ocr_bench_{mode}", job_prefix=f"ocr_bench_{mode}:job:")
+        latencies = []
+        consumer = threading.Thread(target=consume, args=(manager, mode, latencies), daemon=True)
+        consumer.start()
+
+        for _ in range(jobs):
+            time.sleep(random.uniform(0, max_gap))
+            manager.add_job(BenchJob('benchmark.pdf', 'Benchmark Job'))
+        consumer.join(timeout=poll_interval + Config.QUEUE_BLOCK_TIMEOUT + 5)
+
+        for key in manager.redis_client.scan_iter(match=f"ocr_bench_{mode}*"):
+            manager.redis_client.delete(key)
+
+        latencies.sort()
+        results[mode] = {
+            'jobs': len(latencies),
+            'avg_ms': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0
+        }
+
+    print(f"\n📊 Alınma gecikmesi ({jobs} job, job arası 0-{max_gap}s)")
+    for mode, label in (('poll', f'Eski (boşsa {poll_interval:.0f}s uyku)'), ('block', 'Bloklayan alma')):
+        result = results[mode]
+        print(f"   {label:<24} ort {result['avg_ms']:8.1f} ms | p95 {result['p95_ms']:8.1f} ms | "
+              f"max {result['max_ms']:8.1f} ms")
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Queue alınma gecikmesi ölçümü (Redis gerekir)')
+    parser.add_argument('--jobs', type=int, default=10, help='Mod başına job sayısı')
+    parser.add_argument('--max-gap', type=float, default=2.0, help='Job\'lar arası en fazla bekleme (s)')
+    parser.add_argument('--poll-interval', type=float, default=5.0, help='Eski yöntemin uyku süresi (s)')
+    args = parser.parse_args()
+
+    run_pickup_benchmark(args.jobs, args.max_gap, args.poll_interval)
@@ -0,0 +1,345 @@
+"""
+DOSYA: redis_queue_module/supervisor.py
+AMAÇ: Prefork worker supervisor
+- Modüller, Tesseract kontrolü / handle'ları, sigorta otomatı ve roster bir kez, ebeveyn
+  süreçte hazırlanır; N worker süreci fork ile bu hazır belleği (copy-on-write) paylaşır
+- Flask app, DB havuzu ve Redis bağlantıları fork'tan sonra her çocukta açılır
+- Çöken worker yeniden başlatılır (hızlı çökmelerde artan bekleme ile)
+- Worker WORKER_MAX_JOBS job sonra veya RSS WORKER_MAX_RSS_MB'yi aşınca kendini
+  kapatır ve yerine yenisi başlatılır (bellek büyümesi birikmez)
+- Worker durumları (pid, job sayısı, RSS, yeniden başlatmalar) periyodik olarak yazdırılır
+  ve Redis'e yazılır (/api/v1/ocr/workers)
+
+KULLANIM:
+    python App/run_worker.py --workers 4 --prefork
+"""
+import gc
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+
+import psutil
+
+from App.utils.config import Config
+from App.utils.redis_client import get_redis_client
+from App.utils.startup_report import timed_step, print_startup_report
+
+# Worker job / RSS sınırı nedeniyle çıktığında (crash değil)
+WORKER_RECYCLE_EXIT_CODE = 75
+
+SUPERVISOR_KEY_PREFIX = "ocr_workers:supervisor:"
+
+# İkinci SIGTERM'den sonra worker'ın job'ı geri bırakıp çıkması için beklenen süre (saniye)
+HAND_BACK_TIMEOUT = 5
+
+
+def get_start_method():
+    """fork varsa fork (hazır bellek paylaşılır), yoksa spawn (Windows)"""
+    return 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class SharedWorkerStatus:
+    """
+    Worker sürecinin yazdığı, supervisor'ın okuduğu durum alanları
+
+    Tek yazar (worker) olduğu için değerler kilitsizdir.
+    """
+
+    def __init__(self, context):
+        self.jobs = context.Value('i', 0, lock=False)
+        self.busy_since = context.Value('d', 0.0, lock=False)
+        self.last_heartbeat = context.Value('d', 0.0, lock=False)
+        self.rss_mb = context.Value('d', 0.0, lock=False)
+
+    def heartbeat(self):
+        self.last_heartbeat.value = time.time()
+
+    def job_started(self):
+        self.busy_since.value = time.time()
+        self.last_heartbeat.value = self.busy_since.value
+
+    def job_finished(self, jobs, rss_mb):
+        self.jobs.value = jobs
+        self.rss_mb.value = rss_mb
+        self.busy_since.value = 0.0
+        self.last_heartbeat.value = time.time()
+
+    def reset(self):
+        self.jobs.value = 0
+        self.busy_since.value = 0.0
+        self.last_heartbeat.value = 0.0
+        self.rss_mb.value = 0.0
+
+
+def warm_shared_state():
+    """
+    Fork öncesi ebeveynde hazırlanan durum
+
+    Çocuklar bu sayfaları kopyalamadan paylaşır. Thread havuzları, DB ve Redis
+    bağlantıları burada açılmaz (fork'tan sonra çocukta oluşturulur).
+    """
+    with timed_step('worker_modules_import'):
+        from App.services.redis_queue_module import worker  # noqa: F401 (app, API, servis modülleri)
+        from App.ocr.ocr_engine import warm_engine_pool
+
+    with timed_step('engine_pool_warm'):
+        warm_engine_pool()
+
+    with timed_step('insurer_table'):
+        from App.ocr.insurer_detector import get_insurer_detector
+        get_insurer_detector().reload(force=False)
+
+    with timed_step('roster_index'):
+        from App.ocr.roster_index import get_roster_index
+        get_roster_index()
+
+    # Hazır nesneler GC taramalarında dokunulup kopyalanmasın
+    if hasattr(gc, 'freeze'):
+        gc.collect()
+        gc.freeze()
+
+
+def run_worker_process(worker_id, max_jobs, max_rss_mb, shared_status):
+    """Çocuk süreç: worker'ı çalıştır, geri dönüşümde WORKER_RECYCLE_EXIT_CODE ile çık"""
+    # Supervisor'ın sinyal handler'ları çocuğa geçmesin (OCRWorker kendi handler'ını kurar)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    from App.services.redis_queue_module.worker import create_worker
+
+    worker = create_worker(worker_id, max_jobs=max_jobs, max_rss_mb=max_rss_mb, shared_status=shared_status)
+    worker.start()
+
+    if worker.recycle_reason:
+        sys.exit(WORKER_RECYCLE_EXIT_CODE)
+
+
+class WorkerSlot:
+    """Supervisor'daki bir worker yeri (süreç yeniden başlatılsa da aynı worker_id)"""
+
+    def __init__(self, worker_id, shared_status):
+        self.worker_id = worker_id
+        self.shared_status = shared_status
+        self.process = None
+        self.started_at = None
+        self.next_start_at = 0.0
+        self.backoff = 0.0
+        self.restarts = 0
+        self.crashes = 0
+        self.recycles = 0
+        self.last_exit_code = None
+
+    def get_status(self):
+        process = self.process
+        alive = process is not None and process.is_alive()
+
+        rss_mb = None
+        if alive:
+            try:
+                rss_mb = round(psutil.Process(process.pid).memory_info().rss / 1024 / 1024, 1)
+            except psutil.Error:
+                pass
+
+        busy_since = self.shared_status.busy_since.value
+        return {
+            'worker_id': self.worker_id,
+            'pid': process.pid if process else None,
+            'alive': alive,
+            'uptime_seconds': round(time.time() - self.started_at, 1) if alive else 0,
+            'jobs_processed': self.shared_status.jobs.value,
+            'busy_seconds': round(time.time() - busy_since, 1) if busy_since else None,
+            'last_heartbeat': self.shared_status.last_heartbeat.value or None,
+            'rss_mb': rss_mb,
+            'restarts': self.restarts,
+            'crashes': self.crashes,
+            'recycles': self.recycles,
+            'last_exit_code': self.last_exit_code
+        }
+
+
+class WorkerSupervisor:
+    """
+    N worker sürecini başlatır, izler ve gerektiğinde yeniden başlatır
+    """
+
+    def __init__(self, num_workers, worker_prefix='worker', max_jobs=None, max_rss_mb=None):
+        self.num_workers = num_workers
+        self.max_jobs = Config.WORKER_MAX_JOBS if max_jobs is None else max_jobs
+        self.max_rss_mb = Config.WORKER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.status_interval = Config.WORKER_STATUS_INTERVAL
+
+        self.start_method = get_start_method()
+        self.context = multiprocessing.get_context(self.start_method)
+        self.slots = [
+            WorkerSlot(f"{worker_prefix}_{index + 1}", SharedWorkerStatus(self.context))
+            for index in range(num_workers)
+        ]
+
+        self.running = False
+        self.started_at = None
+        self.status_key = f"{SUPERVISOR_KEY_PREFIX}{socket.gethostname()}:{os.getpid()}"
+
+    # ============ SÜREÇ YÖNETİMİ ============
+    def _start_slot(self, slot):
+        slot.shared_status.reset()
+        slot.process = self.context.Process(
+            target=run_worker_process,
+            args=(slot.worker_id, self.max_jobs, self.max_rss_mb, slot.shared_status),
+            name=slot.worker_id
+        )
+        slot.process.start()
+        slot.started_at = time.time()
+        print(f"✅ Worker süreci başlatıldı: {slot.worker_id} (pid {slot.process.pid})")
+
+    def _handle_exit(self, slot):
+        """Çıkan worker'ı değerlendir ve yeniden başlatma zamanını belirle"""
+        slot.process.join()
+        exit_code = slot.process.exitcode
+        uptime = time.time() - slot.started_at
+        slot.last_exit_code = exit_code
+        slot.process = None
+
+        if not self.running:
+            return
+
+        slot.restarts += 1
+        if exit_code == WORKER_RECYCLE_EXIT_CODE:
+            slot.recycles += 1
+            slot.backoff = 0.0
+            print(f"♻️ {slot.worker_id} geri dönüştürüldü ({slot.shared_status.jobs.value} job), yenisi başlatılıyor")
+        else:
+            slot.crashes += 1
+            if uptime < Config.WORKER_MIN_UPTIME:
+                slot.backoff = min(Config.WORKER_RESTART_BACKOFF_MAX, max(1.0, slot.backoff * 2))
+            else:
+                slot.backoff = 1.0
+            print(f"💥 {slot.worker_id} çıktı (kod {exit_code}, {uptime:.1f}s çalıştı), "
+                  f"{slot.backoff:.0f}s sonra yeniden başlatılacak")
+
+        slot.next_start_at = time.time() + slot.backoff
+
+    def _signal_handler(self, signum, frame):
+        print(f"\n📡 Supervisor signal aldı: {signum} - worker'lar durduruluyor...")
+        self.running = False
+
+    def run(self):
+        """Hazırla, worker'ları başlat ve izle (sinyal gelene kadar bloklar)"""
+        max_rss = f"{self.max_rss_mb} MB" if self.max_rss_mb else 'sınırsız'
+        print(f"🚀 Prefork supervisor: {self.num_workers} worker ({self.start_method}), "
+              f"max_jobs={self.max_jobs or 'sınırsız'}, max_rss={max_rss}")
+
+        if self.start_method == 'fork':
+            warm_shared_state()
+        else:
+            print("⚠️ fork desteklenmiyor - her worker kendi başlatmasını yapacak (spawn)")
+        print_startup_report('Supervisor')
+
+        self.running = True
+        self.started_at = time.time()
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+        last_report = time.time()
+        try:
+            while self.running:
+                for slot in self.slots:
+                    if slot.process is not None and not slot.process.is_alive():
+                        self._handle_exit(slot)
+                    if self.running and slot.process is None and time.time() >= slot.next_start_at:
+                        self._start_slot(slot)
+
+                if time.time() - last_report >= self.status_interval:
+                    self.report()
+                    last_report = time.time()
+
+                time.sleep(0.5)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """
+        Worker'ları durdur
+        - SIGTERM: worker elindeki job'ı bitirir (WORKER_SHUTDOWN_TIMEOUT kadar beklenir)
+        - Bitmezse ikinci SIGTERM: job queue'ye geri bırakılır ve worker çıkar
+        - Hâlâ çıkmayan süreç öldürülür (job'ı lease süresi dolunca reaper geri alır)
+        """
+        self.running = False
+        alive = [slot for slot in self.slots if slot.process is not None and slot.process.is_alive()]
+        for slot in alive:
+            slot.process.terminate()
+
+        deadline = time.time() + Config.WORKER_SHUTDOWN_TIMEOUT
+        for slot in alive:
+            slot.process.join(max(0.0, deadline - time.time()))
+            if slot.process.is_alive():
+                print(f"⚠️ {slot.worker_id} job'ı zamanında bitirmedi, job geri bırakılıyor")
+                slot.process.terminate()
+                slot.process.join(HAND_BACK_TIMEOUT)
+            if slot.process.is_alive():
+                print(f"⚠️ {slot.worker_id} zamanında durmadı, sonlandırılıyor")
+                slot.process.kill()
+                slot.process.join()
+            slot.last_exit_code = slot.process.exitcode
+
+        self._publish_status(self.get_status())
+        print(f"✅ Tüm worker süreçleri durduruldu")
+
+    # ============ DURUM ============
+    def get_status(self):
+        workers = [slot.get_status() for slot in self.slots]
+        return {
+            'supervisor_pid': os.getpid(),
+            'host': socket.gethostname(),
+            'start_method': self.start_method,
+            'running': self.running,
+            'started_at': self.started_at,
+            'max_jobs': self.max_jobs,
+            'max_rss_mb': self.max_rss_mb,
+            'alive_workers': sum(1 for worker in workers if worker['alive']),
+            'jobs_processed': sum(worker['jobs_processed'] for worker in workers),
+            'workers': workers,
+            'updated_at': time.time()
+        }
+
+    def _publish_status(self, status):
+        """Durumu Redis'e yaz (API'den okunur); Redis yoksa sadece yazdırılır"""
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.set(self.status_key, json.dumps(status), ex=self.status_interval * 3)
+        except Exception as e:
+            print(f"⚠️ Supervisor durumu Redis'e yazılamadı: {e}")
+
+    def report(self):
+        """Worker tablosunu yazdır ve yayınla"""
+        status = self.get_status()
+        self._publish_status(status)
+
+        print(f"\n👷 WORKER DURUMU ({status['alive_workers']}/{self.num_workers} canlı, "
+              f"toplam {status['jobs_processed']} job)")
+        for worker in status['workers']:
+            state = 'meşgul' if worker['busy_seconds'] is not None else ('boşta' if worker['alive'] else 'bekliyor')
+            rss = f"{worker['rss_mb']:.0f} MB" if worker['rss_mb'] is not None else '-'
+            print(f"   {worker['worker_id']:<14} pid={worker['pid'] or '-':<7} {state:<8} "
+                  f"job={worker['jobs_processed']:<5} rss={rss:<8} "
+                  f"restart={worker['restarts']} (crash {worker['crashes']}, recycle {worker['recycles']})")
+        return status
+
+
+def get_supervisor_statuses():
+    """Redis'teki tüm supervisor durumları (API için)"""
+    client = get_redis_client()
+    if client is None:
+        return []
+
+    statuses = []
+    for key in client.scan_iter(match=f"{SUPERVISOR_KEY_PREFIX}*", count=100):
+        data = client.get(key)
+        if data:
+            statuses.append(json.loads(data))
+    return statuses
@@ -6,48 +6,130 @@ DOSYA: redis_queue_module/worker.py
 import time
 import signal
 import sys
+import threading
 from datetime import datetime
 import uuid
+import psutil
 from App.main import create_app
 
 from App.services.redis_queue_module.job_models import JobStatus
 from App.services.redis_queue_module.redis_queue import get_queue_manager
-from App.services.ocr_service import OCRService
+from App.services.ocr_service import get_ocr_service
+from App.ocr.cascade_gate import get_cascade_gate
+from App.utils.config import Config
+from App.utils.startup_report import timed_step, print_startup_report
+
+# Bu süreçteki worker'lar (sinyal hepsine uygulanır; çoklu thread modunda birden fazla)
+_active_workers = []
+
+
+def _handle_shutdown_signal(signum, frame):
+    """
+    Graceful shutdown
+    - İlk sinyal: worker'lar yeni job almaz, ellerindeki job'ı bitirip döngüden çıkar
+    - İkinci sinyal: ellerindeki job'lar queue'ye geri bırakılır (retry sayılmaz) ve süreç çıkar
+    """
+    print(f"\n📡 Signal alındı: {signum}")
+    workers = list(_active_workers)
+
+    if any(worker.stop_requested for worker in workers):
+        for worker in workers:
+            worker.hand_back_current_job()
+        print(f"🛑 İkinci sinyal - job'lar geri bırakıldı, çıkılıyor")
+        sys.exit(0)
+
+    for worker in workers:
+        worker.stop()
 
 
 class OCRWorker:
 
-    def __init__(self, worker_id=None):
+    def __init__(self, worker_id=None, max_jobs=0, max_rss_mb=0, shared_status=None):
+        """
+        PARAMETRELER:
+            max_jobs: Bu kadar job sonra worker döngüden çıkar (0 = sınırsız, prefork geri dönüşümü)
+            max_rss_mb: Job sonrası RSS bu sınırı aşarsa döngüden çıkar (0 = sınırsız)
+            shared_status: Supervisor'ın okuduğu paylaşılan durum (prefork modunda)
+        """
         self.worker_id = worker_id or f"worker_{str(uuid.uuid4())[:8]}"
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.shared_status = shared_status
+        self.jobs_processed = 0
+        self.recycle_reason = None
+        self.stop_requested = False
+        self.lease_lost = False
+        self._lease_stop = threading.Event()
+        self._lease_thread = None
         self.queue_manager = get_queue_manager()
 
-        self.app = create_app()
+        with timed_step('create_app'):
+            self.app = create_app()
         self.app_context = self.app.app_context()
         self.app_context.push()
 
-        self.ocr_service = OCRService()
+        self.ocr_service = get_ocr_service()
+        self._warm_up()
         self.running = False
         self.current_job = None
 
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        _active_workers.append(self)
+        signal.signal(signal.SIGINT, _handle_shutdown_signal)
+        signal.signal(signal.SIGTERM, _handle_shutdown_signal)
 
         print(f"🔧 OCR Worker oluşturuldu: {self.worker_id}")
         print(f"✅ Flask app context aktif")
+        print_startup_report(f"Worker {self.worker_id}")
+
+    def _warm_up(self):
+        """
+        OCR motorunu job almadan önce hazırla
+
+        API'de ilk istekte yapılan başlatmalar (motor import'u, Tesseract kontrolü,
+        handle yükleme) worker'da açılışta yapılır; ilk job bu süreyi ödemez.
+        """
+        with timed_step('ocr_engine_import'):
+            from App.ocr.ocr_engine import warm_engine_pool
+
+        with timed_step('engine_pool_warm'):
+            warm_engine_pool()
 
     def start(self):
         """Worker'ı başlat - ana loop"""
         self.running = True
+        self.start_time = time.time()
         print(f"🚀 Worker başlatıldı: {self.worker_id}")
         print(f"⏱️ Zaman: {datetime.now()}")
         print(f"🔄 Queue'yi dinlemeye başlıyor...")
 
+        self._lease_thread = threading.Thread(
+            target=self._lease_loop, name=f"{self.worker_id}_lease", daemon=True
+        )
+        self._lease_thread.start()
+
+        try:
+            self._run_loop()
+        finally:
+            self._shutdown()
+
+        print(f"🛑 Worker durdu: {self.worker_id}")
+
+    def _run_loop(self):
         while self.running:
             try:
-                # Queue'den job al
-                job = self.queue_manager.get_next_job(self.worker_id)
+                if self.shared_status:
+                    self.shared_status.heartbeat()
+
+                # Queue'den job al (boşsa yeni job bildirimi için Redis'te bloklanır)
+                job = self.queue_manager.get_next_job(self.worker_id, block_timeout=Config.QUEUE_BLOCK_TIMEOUT)
+
+                if job and not self.running:
+                    # Durdurulurken alınan job işlenmeden geri bırakılır
+                    self.queue_manager.release_job(job.job_id, self.worker_id)
+                    break
 
                 if job:
+                    self.lease_lost = False
                     self.current_job = job
                     print(f"\n{'=' * 60}")
                     print(f"📋 YENİ JOB İŞLENİYOR")
@@ -60,19 +142,51 @@ class OCRWorker:
                     print(f"{'=' * 60}")
 
                     # Job'ı işle
+                    if self.shared_status:
+                        self.shared_status.job_started()
                     self._process_job(job)
                     self.current_job = None
+                    self._after_job()
 
                 else:
-                    # Queue boş, biraz bekle
+                    # Bloklama süresi içinde job gelmedi, döngü tekrar bekler
                     print(f"💤 Queue boş, {self.worker_id} bekliyor... ({datetime.now().strftime('%H:%M:%S')})")
-                    time.sleep(5)  # 5 saniye bekle
 
             except Exception as e:
                 print(f"❌ Worker loop hatası: {e}")
                 time.sleep(10)  # Hata durumunda biraz daha bekle
 
-        print(f"🛑 Worker durdu: {self.worker_id}")
+    def _lease_loop(self):
+        """
+        Arka plan thread'i: işlenen job'ın lease'ini QUEUE_HEARTBEAT_INTERVAL'da bir uzatır,
+        QUEUE_REAP_INTERVAL'da bir (fleet genelinde tek worker) süresi dolan job'ları geri alır,
+        QUEUE_CLEANUP_INTERVAL'da bir eski job temizliğini ayrı thread'de başlatır (heartbeat'i geciktirmez)
+        """
+        last_reap = 0.0
+        last_cleanup = time.time()
+        while not self._lease_stop.wait(Config.QUEUE_HEARTBEAT_INTERVAL):
+            try:
+                job = self.current_job
+                if job and not self.queue_manager.extend_lease(job.job_id, self.worker_id):
+                    if not self.lease_lost:
+                        print(f"⚠️ Lease kaybedildi, job başka worker'a verilmiş olabilir: {job.job_id}")
+                    self.lease_lost = True
+
+                if time.time() - last_reap >= Config.QUEUE_REAP_INTERVAL:
+                    last_reap = time.time()
+                    self.queue_manager.reap_if_due(self.worker_id, Config.QUEUE_REAP_INTERVAL)
+
+                if time.time() - last_cleanup >= Config.QUEUE_CLEANUP_INTERVAL:
+                    last_cleanup = time.time()
+                    threading.Thread(
+                        target=self.queue_manager.cleanup_if_due,
+                        args=(self.worker_id, Config.QUEUE_CLEANUP_INTERVAL),
+                        name=f"{self.worker_id}_cleanup",
+                        daemon=True
+                    ).start()
+
+            except Exception as e:
+                print(f"⚠️ Lease heartbeat hatası: {e}")
 
     def _process_job(self, job):
         """Tek bir job'ı işle"""
@@ -84,10 +198,19 @@ class OCRWorker:
             # YENİ: Her job için fresh app context
             with self.app.app_context():
                 # Mevcut OCR Service'i kullan
-                result = self.ocr_service.process_pdf(
-                    pdf_path=job.pdf_path,
-                    searched_name=job.searched_name
-                )
+                if job.candidate_names:
+                    # Aynı PDF için birden fazla aday isim - tek OCR geçişi
+                    result = self.ocr_service.process_pdf_multi(
+                        pdf_path=job.pdf_path,
+                        candidate_names=job.candidate_names,
+                        file_fingerprint=job.file_fingerprint
+                    )
+                else:
+                    result = self.ocr_service.process_pdf(
+                        pdf_path=job.pdf_path,
+                        searched_name=job.searched_name,
+                        file_fingerprint=job.file_fingerprint
+                    )
 
             processing_time = time.time() - start_time
             print(f"⏱️ İşlem süresi: {processing_time:.2f} saniye")
@@ -105,21 +228,44 @@ class OCRWorker:
                     'worker_id': self.worker_id,
                     'completed_at': datetime.now().isoformat()
                 }
+                if job.candidate_names:
+                    redis_result.update({
+                        'results': result.get('results'),
+                        'best_name': result.get('best_name'),
+                        'best_level': result.get('best_level'),
+                        'ambiguous': result.get('ambiguous', False),
+                        # Gruplanmış batch isteği kendi isminin sonucunu buradan okur
+                        'results_by_name': {
+                            name: {
+                                'task_id': name_result.get('task_id'),
+                                'ocr_result': name_result.get('ocr_result'),
+                                'duplicate': name_result.get('duplicate', False),
+                                'error': name_result.get('error')
+                            }
+                            for name, name_result in zip(job.candidate_names, result.get('results') or [])
+                        }
+                    })
 
                 # Redis'te job'ı completed olarak işaretle
                 self.queue_manager.update_job_status(
                     job.job_id,
                     JobStatus.COMPLETED,
-                    result=redis_result
+                    result=redis_result,
+                    worker_id=self.worker_id
                 )
 
                 print(f"📊 Sonuç:")
-                ocr_result = result.get('ocr_result', {})
-                print(f"   Expected: {ocr_result.get('expected_name')}")
-                print(f"   Detected: {ocr_result.get('detected_name')}")
-                print(f"   Match: {ocr_result.get('match_status')}")
-                print(f"   Insurance: {ocr_result.get('insurance_company', 'N/A')}")
-                print(f"   Duplicate: {result.get('duplicate', False)}")
+                if job.candidate_names:
+                    print(f"   Adaylar: {len(job.candidate_names)}")
+                    print(f"   En iyi: {result.get('best_name')} ({result.get('best_level')})")
+                    print(f"   Belirsiz: {result.get('ambiguous', False)}")
+                else:
+                    ocr_result = result.get('ocr_result', {})
+                    print(f"   Expected: {ocr_result.get('expected_name')}")
+                    print(f"   Detected: {ocr_result.get('detected_name')}")
+                    print(f"   Match: {ocr_result.get('match_status')}")
+                    print(f"   Insurance: {ocr_result.get('insurance_company', 'N/A')}")
+                    print(f"   Duplicate: {result.get('duplicate', False)}")
 
             else:
                 # Hata
@@ -130,7 +276,8 @@ class OCRWorker:
                 self.queue_manager.update_job_status(
                     job.job_id,
                     JobStatus.FAILED,
-                    error_message=error_msg
+                    error_message=error_msg,
+                    worker_id=self.worker_id
                 )
 
         except Exception as e:
@@ -142,32 +289,61 @@ class OCRWorker:
             self.queue_manager.update_job_status(
                 job.job_id,
                 JobStatus.FAILED,
-                error_message=error_msg
+                error_message=error_msg,
+                worker_id=self.worker_id
             )
 
         print(f"🏁 Job tamamlandı: {job.job_id}")
 
+    def _after_job(self):
+        """Job sayacını güncelle, job / RSS sınırı aşıldıysa geri dönüşüm için döngüden çık"""
+        self.jobs_processed += 1
+        rss_mb = psutil.Process().memory_info().rss / 1024 / 1024
+
+        if self.shared_status:
+            self.shared_status.job_finished(self.jobs_processed, rss_mb)
+
+        if self.max_jobs and self.jobs_processed >= self.max_jobs:
+            self.recycle_reason = f"max_jobs ({self.jobs_processed})"
+        elif self.max_rss_mb and rss_mb > self.max_rss_mb:
+            self.recycle_reason = f"max_rss ({rss_mb:.0f} MB > {self.max_rss_mb} MB)"
+
+        if self.recycle_reason:
+            print(f"♻️ Worker geri dönüşüme alınıyor: {self.worker_id} - {self.recycle_reason}")
+            self.running = False
+
     def stop(self):
-        """Worker'ı durdur"""
+        """Worker'ı durdur: yeni job alınmaz, işlenen job bitince döngü çıkar"""
         print(f"\n🛑 Worker durduruluyor: {self.worker_id}")
+        self.stop_requested = True
         self.running = False
 
-        # YENİ: Flask app context'i temizle
+        # Eğer şu anda bir job işleniyorsa bekle
+        if self.current_job:
+            print(f"⏳ Mevcut job tamamlanana kadar bekleniyor: {self.current_job.job_id} "
+                  f"(hemen durdurmak için tekrar sinyal gönderin)")
+
+    def hand_back_current_job(self):
+        """İşlenen job'ı bitirmeden queue'ye geri bırak (retry sayısı artmaz)"""
+        job = self.current_job
+        if job and self.queue_manager.release_job(job.job_id, self.worker_id):
+            self.current_job = None
+
+    def _shutdown(self):
+        """Döngü bittikten sonra: lease thread'ini durdur, Flask app context'i temizle"""
+        self._lease_stop.set()
+        if self._lease_thread:
+            self._lease_thread.join(timeout=5)
+
+        # Flask app context'i temizle
         try:
             self.app_context.pop()
             print(f"✅ Flask app context temizlendi")
         except:
             pass
 
-        # Eğer şu anda bir job işleniyorsa bekle
-        if self.current_job:
-            print(f"⏳ Mevcut job tamamlanana kadar bekleniyor: {self.current_job.job_id}")
-
-    def _signal_handler(self, signum, frame):
-        """Signal handler - Graceful shutdown"""
-        print(f"\n📡 Signal alındı: {signum}")
-        self.stop()
-        sys.exit(0)
+        if self in _active_workers:
+            _active_workers.remove(self)
 
     def get_status(self):
         """Worker durumunu getir"""
@@ -175,13 +351,18 @@ class OCRWorker:
             'worker_id': self.worker_id,
             'running': self.running,
             'current_job': self.current_job.job_id if self.current_job else None,
-            'uptime': time.time() - getattr(self, 'start_time', time.time())
+            'jobs_processed': self.jobs_processed,
+            'recycle_reason': self.recycle_reason,
+            'stop_requested': self.stop_requested,
+            'lease_lost': self.lease_lost,
+            'uptime': time.time() - getattr(self, 'start_time', time.time()),
+            'cascade_gate': get_cascade_gate().get_stats()
         }
 
 
-def create_worker(worker_id=None):
-    """Worker factory function"""
-    return OCRWorker(worker_id)
+def create_worker(worker_id=None, **options):
+    """Worker factory function (options: max_jobs, max_rss_mb, shared_status)"""
+    return OCRWorker(worker_id, **options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""
+DOSYA: services/result_cache.py
+AMAÇ: Tamamlanmış OCR sonuçları için katmanlı cache (OCRService.process_pdf önünde)
+- Anahtar: (doküman parmak izi, normalize edilmiş isim) - üç katmanda da aynı
+- L1: süreç içi LRU + TTL
+- L2: Redis (API ve worker node'ları arasında paylaşılan), süre CACHE_TTL
+- L3: Postgres (OCRResult, asıl kaynak); isimler normalize edilerek karşılaştırılır
+- Alt katmandan gelen sonuç üst katmanlara yazılır
+- Geçersiz kılma parmak izi üzerinden (o dokümanın tüm isim kayıtları); Postgres kayıtları
+  'invalidated' olarak işaretlenir, böylece L3 sonucu tekrar yukarı taşımaz
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from App.database.models import OCRResult
+from App.ocr.text_analysis import normalize_turkish_text
+from App.utils.config import Config
+from App.utils.redis_client import get_redis_client
+
+REDIS_KEY_PREFIX = "ocr_result:"
+REDIS_INDEX_PREFIX = "ocr_result_keys:"
+
+TIERS = ('l1', 'l2', 'l3')
+
+
+def make_result_key(document_key, searched_name):
+    """(doküman, normalize isim) anahtarı"""
+    name_hash = hashlib.sha1(normalize_turkish_text(searched_name).encode('utf-8')).hexdigest()
+    return f"{document_key}:{name_hash}"
+
+
+def find_l3_record(searched_name, file_fingerprint=None, file_path=None):
+    """Dokümanın tamamlanmış kayıtlarından normalize ismi aynı olan en yeni kayıt"""
+    normalized_name = normalize_turkish_text(searched_name)
+    for record in OCRResult.find_document_results(file_path, file_fingerprint=file_fingerprint):
+        if normalize_turkish_text(record.expected_name) == normalized_name:
+            return record
+    return None
+
+
+def entry_from_record(record):
+    """OCRResult kaydından cache girdisi oluştur"""
+    return {
+        'task_id': record.task_id,
+        'expected_name': record.expected_name,
+        'detected_name': record.detected_name,
+        'match_status': record.match_status,
+        'insurance_company': record.insurance_company,
+        'file_path': record.file_path,
+        'created_at': record.created_at.isoformat() if record.created_at else None
+    }
+
+
+class ResultCache:
+    """
+    Katmanlı sonuç cache'i
+
+    L1 diğer süreçlerdeki geçersiz kılmaları görmez; bu yüzden L1 TTL'i
+    RESULT_CACHE_L1_TTL ile CACHE_TTL'in küçüğüdür.
+    """
+
+    def __init__(self):
+        self.enabled = Config.RESULT_CACHE_ENABLED
+        self.ttl = Config.CACHE_TTL
+        self.l1_ttl = min(Config.RESULT_CACHE_L1_TTL, Config.CACHE_TTL)
+        self.l1_max_entries = Config.RESULT_CACHE_L1_MAX_ENTRIES
+
+        self._entries = OrderedDict()  # key -> (entry, expires_at)
+        self._document_keys = {}  # document_key -> {key, ...}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'lookups': 0,
+            'l1_hits': 0,
+            'l2_hits': 0,
+            'l3_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'invalidations': 0,
+            'l2_errors': 0
+        }
+
+    # ============ L1 ============
+    def _l1_get(self, key):
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+
+            entry, expires_at = cached
+            if expires_at < time.time():
+                self._l1_remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def _l1_put(self, document_key, key, entry):
+        with self._lock:
+            self._entries[key] = (entry, time.time() + self.l1_ttl)
+            self._entries.move_to_end(key)
+            self._document_keys.setdefault(document_key, set()).add(key)
+
+            while len(self._entries) > self.l1_max_entries:
+                oldest_key = next(iter(self._entries))
+                self._l1_remove(oldest_key)
+
+    def _l1_remove(self, key):
+        """Kilit altında çağrılır"""
+        self._entries.pop(key, None)
+        document_key = key.rsplit(':', 1)[0]
+        keys = self._document_keys.get(document_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._document_keys[document_key]
+
+    # ============ L2 ============
+    def _l2_get(self, key):
+        client = get_redis_client()
+        if client is None:
+            return None
+
+        try:
+            payload = client.get(f"{REDIS_KEY_PREFIX}{key}")
+        except Exception as e:
+            self._count('l2_errors')
+            print(f"⚠️ Sonuç cache L2 okuma hatası: {e}")
+            return None
+
+        return json.loads(payload) if payload else None
+
+    def _l2_put(self, document_key, key, entry):
+        client = get_redis_client()
+        if client is None:
+            return
+
+        index_key = f"{REDIS_INDEX_PREFIX}{document_key}"
+        try:
+            pipeline = client.pipeline(transaction=False)
+            pipeline.set(f"{REDIS_KEY_PREFIX}{key}", json.dumps(entry, ensure_ascii=False), ex=self.ttl)
+            pipeline.sadd(index_key, key)
+            pipeline.expire(index_key, self.ttl)
+            pipeline.execute()
+        except Exception as e:
+            self._count('l2_errors')
+            print(f"⚠️ Sonuç cache L2 yazma hatası: {e}")
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # ============ PUBLIC ============
+    def lookup(self, searched_name, file_fingerprint=None, file_path=None):
+        """
+        Tamamlanmış sonucu katman sırasıyla ara
+
+        DÖNEN DEĞER:
+            tuple: (girdi veya None, bulunduğu katman 'l1' / 'l2' / 'l3' veya None)
+        """
+        document_key = file_fingerprint or f"path:{file_path}"
+        key = make_result_key(document_key, searched_name)
+        self._count('lookups')
+
+        if self.enabled:
+            entry = self._l1_get(key)
+            if entry is not None:
+                self._count('l1_hits')
+                return entry, 'l1'
+
+            entry = self._l2_get(key)
+            if entry is not None:
+                self._count('l2_hits')
+                self._l1_put(document_key, key, entry)
+                return entry, 'l2'
+
+        record = find_l3_record(searched_name, file_fingerprint=file_fingerprint, file_path=file_path)
+        if record is None:
+            self._count('misses')
+            return None, None
+
+        entry = entry_from_record(record)
+        self._count('l3_hits')
+        if self.enabled:
+            self._l1_put(document_key, key, entry)
+            self._l2_put(document_key, key, entry)
+        return entry, 'l3'
+
+    def store(self, entry, file_fingerprint=None, file_path=None):
+        """Yeni tamamlanan sonucu L1 ve L2'ye yaz (L3'e OCRService yazar)"""
+        if not self.enabled:
+            return
+
+        document_key = file_fingerprint or f"path:{file_path}"
+        key = make_result_key(document_key, entry['expected_name'])
+        self._l1_put(document_key, key, entry)
+        self._l2_put(document_key, key, entry)
+        self._count('stores')
+
+    def invalidate(self, file_fingerprint):
+        """
+        Dokümanın tüm isim kayıtlarını L1 ve L2'den sil, Postgres kayıtlarını 'invalidated' yap
+
+        Postgres işaretlenmezse sonraki lookup L3'ten aynı sonucu bulup L1/L2'ye geri yazar.
+
+        DÖNEN DEĞER:
+            tuple: (silinen L1 + L2 kayıt sayısı, işaretlenen Postgres kayıt sayısı)
+        """
+        # Önce L3: arada gelen lookup eski kaydı L1/L2'ye geri taşıyamaz
+        invalidated_records = OCRResult.mark_invalidated(file_fingerprint)
+
+        removed = 0
+        with self._lock:
+            for key in list(self._document_keys.get(file_fingerprint, ())):
+                self._l1_remove(key)
+                removed += 1
+            self.stats['invalidations'] += 1
+
+        client = get_redis_client()
+        if client is not None:
+            index_key = f"{REDIS_INDEX_PREFIX}{file_fingerprint}"
+            try:
+                keys = client.smembers(index_key)
+                if keys:
+                    removed += client.delete(*[f"{REDIS_KEY_PREFIX}{key}" for key in keys])
+                client.delete(index_key)
+            except Exception as e:
+                self._count('l2_errors')
+                print(f"⚠️ Sonuç cache L2 silme hatası: {e}")
+
+        print(f"🧹 Sonuç cache geçersiz kılındı: {file_fingerprint[:40]}... "
+              f"({removed} cache kaydı, {invalidated_records} Postgres kaydı)")
+        return removed, invalidated_records
+
+    def get_stats(self):
+        """Katman bazında isabet oranları"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['l1_entries'] = len(self._entries)
+
+        lookups = stats['lookups']
+        for tier in TIERS:
+            stats[f'{tier}_hit_ratio'] = round(stats[f'{tier}_hits'] / lookups, 3) if lookups else 0.0
+        stats['overall_hit_ratio'] = round(
+            sum(stats[f'{tier}_hits'] for tier in TIERS) / lookups, 3
+        ) if lookups else 0.0
+
+        stats['enabled'] = self.enabled
+        stats['ttl_seconds'] = self.ttl
+        stats['l1_ttl_seconds'] = self.l1_ttl
+        return stats
+
+
+# Global instance
+result_cache = ResultCache()
+
+
+def get_result_cache():
+    """Global sonuç cache instance'ını döndür"""
+    return result_cache
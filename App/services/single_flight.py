@@ -0,0 +1,221 @@
+"""
+DOSYA: services/single_flight.py
+AMAÇ: Eşzamanlı aynı OCR isteklerinin tek işleme indirgenmesi (single-flight)
+- Anahtar: (doküman parmak izi, normalize isim) - sonuç cache'iyle aynı
+- Aynı süreçteki thread'ler yerel Event ile, farklı süreçler / node'lar Redis lease ile koordine olur
+- İlk gelen lider OCR'ı yapar; takipçiler liderin sonucunu sonuç cache'inden alır
+- Lider çalıştığı sürece lease'i arka planda yeniler (uzun OCR'da liderlik el değiştirmez)
+- Lider düşerse (lease biter, sonuç yok) veya bekleme süresi dolarsa takipçi normal işleme devam eder
+"""
+import threading
+import time
+import uuid
+
+from App.utils.config import Config
+from App.utils.redis_client import get_redis_client
+
+REDIS_KEY_PREFIX = "ocr_inflight:"
+
+# Lease'i sadece sahibi silebilir
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Lease'i sadece sahibi uzatabilir
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    In-flight tekilleştirme
+
+    Redis yoksa sadece süreç içi koordinasyon yapılır.
+    """
+
+    def __init__(self):
+        self.enabled = Config.SINGLE_FLIGHT_ENABLED
+        self.lease_seconds = Config.SINGLE_FLIGHT_LEASE_SECONDS
+        self.wait_seconds = Config.SINGLE_FLIGHT_WAIT_SECONDS
+        self.poll_interval = Config.SINGLE_FLIGHT_POLL_INTERVAL
+
+        self._local = {}  # key -> threading.Event (bu süreçteki lider)
+        self._renewals = {}  # key -> threading.Event (set edilince lease yenileme durur)
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'leaders': 0,
+            'followers': 0,
+            'coalesced': 0,
+            'follower_timeouts': 0,
+            'leader_failures': 0,
+            'lease_renewals': 0,
+            'lease_lost': 0
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def acquire(self, key):
+        """
+        Anahtar için liderliği almaya çalış
+
+        DÖNEN DEĞER:
+            tuple: (lider mi, lease token'ı veya None)
+        """
+        if not self.enabled:
+            return True, None
+
+        with self._lock:
+            if key in self._local:
+                self.stats['followers'] += 1
+                return False, None
+            self._local[key] = threading.Event()
+
+        token = uuid.uuid4().hex
+        client = get_redis_client()
+        if client is not None:
+            try:
+                acquired = client.set(f"{REDIS_KEY_PREFIX}{key}", token, nx=True, ex=self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️ Single-flight lease alınamadı, yerel moda düşülüyor: {e}")
+                acquired, token = True, None
+
+            if not acquired:
+                # Başka süreç lider - yerel kaydı geri al
+                with self._lock:
+                    self._local.pop(key).set()
+                    self.stats['followers'] += 1
+                return False, None
+
+            if token:
+                self._start_renewal(key, token)
+
+        self._count('leaders')
+        return True, token
+
+    def _start_renewal(self, key, token):
+        """Lider çalıştığı sürece Redis lease'ini lease süresinin üçte birinde bir yenile"""
+        stop_event = threading.Event()
+        with self._lock:
+            self._renewals[key] = stop_event
+
+        threading.Thread(
+            target=self._renew_loop,
+            args=(key, token, stop_event),
+            name=f"single-flight-renew-{key[-8:]}",
+            daemon=True
+        ).start()
+
+    def _renew_loop(self, key, token, stop_event):
+        interval = max(self.lease_seconds / 3, 1)
+        while not stop_event.wait(interval):
+            client = get_redis_client()
+            if client is None:
+                return
+            try:
+                renewed = client.eval(RENEW_SCRIPT, 1, f"{REDIS_KEY_PREFIX}{key}", token, self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️ Single-flight lease yenilenemedi (tekrar denenecek): {e}")
+                continue
+
+            if not renewed:
+                # Lease düşmüş ve başka lider almış olabilir - yenilemeye devam etmek onu ezer
+                self._count('lease_lost')
+                print(f"⚠️ Single-flight lease kaybedildi: {key[:40]}...")
+                return
+            self._count('lease_renewals')
+
+    def release(self, key, token):
+        """Liderliği bırak, bekleyen takipçileri uyandır"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            stop_event = self._renewals.pop(key, None)
+        if stop_event is not None:
+            stop_event.set()
+
+        client = get_redis_client()
+        if client is not None and token:
+            try:
+                client.eval(RELEASE_SCRIPT, 1, f"{REDIS_KEY_PREFIX}{key}", token)
+            except Exception as e:
+                print(f"⚠️ Single-flight lease bırakılamadı (TTL ile düşecek): {e}")
+
+        with self._lock:
+            event = self._local.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _lease_exists(self, key):
+        client = get_redis_client()
+        if client is None:
+            return False
+        try:
+            return bool(client.exists(f"{REDIS_KEY_PREFIX}{key}"))
+        except Exception:
+            return False
+
+    def wait_for_leader(self, key, fetch_result):
+        """
+        Liderin bitmesini bekle ve sonucunu getir
+
+        PARAMETRELER:
+            key: Single-flight anahtarı
+            fetch_result: Sonucu cache'ten okuyan fonksiyon, (girdi, katman) döndürür
+
+        DÖNEN DEĞER:
+            tuple: (girdi, katman) veya (None, None) - çağıran normal işleme devam eder
+        """
+        deadline = time.time() + self.wait_seconds
+        finished = False
+
+        while time.time() < deadline:
+            with self._lock:
+                local_event = self._local.get(key)
+
+            if local_event is not None:
+                # Lider bu süreçte - uyanınca Redis lease'i de kontrol edilir
+                local_event.wait(min(self.poll_interval, max(deadline - time.time(), 0)))
+                continue
+
+            if not self._lease_exists(key):
+                # Lider bitti veya lease düştü
+                finished = True
+                break
+
+            time.sleep(self.poll_interval)
+
+        entry, tier = fetch_result()
+        if entry is not None:
+            self._count('coalesced')
+            return entry, tier
+
+        self._count('leader_failures' if finished else 'follower_timeouts')
+        return None, None
+
+    def get_stats(self):
+        """Single-flight istatistiklerini getir"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight_local'] = len(self._local)
+        stats['enabled'] = self.enabled
+        return stats
+
+
+# Global instance
+single_flight = SingleFlight()
+
+
+def get_single_flight():
+    """Global single-flight instance'ını döndür"""
+    return single_flight
@@ -81,18 +81,112 @@ class Config:
     # ============ OCR AYARLARI ============
     # OCR motoru konfigürasyonları
     OCR_LANGUAGES = os.getenv('OCR_LANGUAGES', 'tr,en').split(',')
+    # Tesseract çalıştırılabilir dosyası (boş = PATH'teki 'tesseract')
+    TESSERACT_PATH = os.getenv('TESSERACT_PATH', '')
     OCR_GPU_ENABLED = os.getenv('OCR_GPU_ENABLED', 'True').lower() == 'true'
     OCR_OPTIMIZATION = os.getenv('OCR_OPTIMIZATION', 'True').lower() == 'true'
-    OCR_DPI = int(os.getenv('OCR_DPI', 100))
+    OCR_DPI = int(os.getenv('OCR_DPI', 300))
     OCR_CROP_RATIO = float(os.getenv('OCR_CROP_RATIO', 0.5))
+    # Hızlı aşamada sırayla denenen sayfa bantları (üstten yükseklik oranı)
+    OCR_ROI_BANDS = os.getenv('OCR_ROI_BANDS', f'{OCR_CROP_RATIO},1.0')
+    # Ölçülen yazı yüksekliğine göre DPI / upscale seçimi
+    OCR_ADAPTIVE_DPI = os.getenv('OCR_ADAPTIVE_DPI', 'True').lower() == 'true'
+    OCR_ADAPTIVE_PREVIEW_DPI = int(os.getenv('OCR_ADAPTIVE_PREVIEW_DPI', 75))
+    OCR_TARGET_TEXT_HEIGHT_PX = int(os.getenv('OCR_TARGET_TEXT_HEIGHT_PX', 24))
+    OCR_TEXT_HEIGHT_MIN_PX = int(os.getenv('OCR_TEXT_HEIGHT_MIN_PX', 18))
+    OCR_TEXT_HEIGHT_MAX_PX = int(os.getenv('OCR_TEXT_HEIGHT_MAX_PX', 36))
+    OCR_TEXT_HEIGHT_MIN_GLYPHS = int(os.getenv('OCR_TEXT_HEIGHT_MIN_GLYPHS', 30))
+    OCR_MIN_DPI = int(os.getenv('OCR_MIN_DPI', 150))
+    OCR_MAX_DPI = int(os.getenv('OCR_MAX_DPI', 400))
     OCR_CONFIDENCE_THRESHOLD = float(os.getenv('OCR_CONFIDENCE_THRESHOLD', 0.5))
+    # Advanced aşamada eşzamanlı PSM denemesi (1 = sıralı). Aynı host'ta birden
+    # fazla worker varsa toplam çekirdek sayısını aşmayacak şekilde ayarlayın;
+    # paralel modda OMP_THREAD_LIMIT=1 önerilir.
+    OCR_PSM_PARALLELISM = int(os.getenv('OCR_PSM_PARALLELISM', 1))
+    # Paralel PSM denemesi başına üst süre (sn, 0 = sınırsız): eşleşme bulununca çalışmakta olan
+    # denemeler kesilemez, en fazla bu süre kadar CPU / handle tutarlar
+    OCR_PSM_ATTEMPT_TIMEOUT = float(os.getenv('OCR_PSM_ATTEMPT_TIMEOUT', 30))
+    # Dijital PDF'lerde gömülü metin katmanı varsa OCR atlanır
+    OCR_TEXT_LAYER_ENABLED = os.getenv('OCR_TEXT_LAYER_ENABLED', 'True').lower() == 'true'
+    OCR_TEXT_LAYER_MIN_CHARS = int(os.getenv('OCR_TEXT_LAYER_MIN_CHARS', 50))
+    OCR_TEXT_LAYER_MIN_LETTER_RATIO = float(os.getenv('OCR_TEXT_LAYER_MIN_LETTER_RATIO', 0.5))
+    # Hızlı aşama isim bulamazsa advanced aşamaya geçiş kararı (off / shadow / enforce)
+    # shadow: kararlar sayılır ama advanced yine çalışır (eşikleri ayarlamak için)
+    OCR_GATE_MODE = os.getenv('OCR_GATE_MODE', 'shadow')
+    OCR_GATE_MIN_CONFIDENCE = float(os.getenv('OCR_GATE_MIN_CONFIDENCE', 85))
+    OCR_GATE_MIN_TEXT_LENGTH = int(os.getenv('OCR_GATE_MIN_TEXT_LENGTH', 300))
+    OCR_GATE_MIN_DICTIONARY_RATIO = float(os.getenv('OCR_GATE_MIN_DICTIONARY_RATIO', 0.7))
+    OCR_GATE_REQUIRE_INSURER = os.getenv('OCR_GATE_REQUIRE_INSURER', 'True').lower() == 'true'
+    # Hızlı aşamada birebir bulunamayan isim için sınırlı düzenleme mesafeli eşleşme
+    # (tüm parçalar ardışık token'larda, parça başına en fazla OCR_FUZZY_MAX_DISTANCE hata).
+    # Eşleşen kelimelerin OCR güveni yeterliyse advanced aşamaya geçilmez.
+    OCR_FUZZY_ENABLED = os.getenv('OCR_FUZZY_ENABLED', 'True').lower() == 'true'
+    OCR_FUZZY_MAX_DISTANCE = int(os.getenv('OCR_FUZZY_MAX_DISTANCE', 1))
+    OCR_FUZZY_MIN_PART_LENGTH = int(os.getenv('OCR_FUZZY_MIN_PART_LENGTH', 4))
+    OCR_FUZZY_MIN_CONFIDENCE = float(os.getenv('OCR_FUZZY_MIN_CONFIDENCE', 60))
+    # Sayfa hash'i + motor ayarlarıyla anahtarlanan OCR metin cache'i
+    # L2: memory (yok), redis veya disk
+    OCR_TEXT_CACHE_ENABLED = os.getenv('OCR_TEXT_CACHE_ENABLED', 'True').lower() == 'true'
+    OCR_TEXT_CACHE_MEMORY_MB = int(os.getenv('OCR_TEXT_CACHE_MEMORY_MB', 64))
+    OCR_TEXT_CACHE_BACKEND = os.getenv('OCR_TEXT_CACHE_BACKEND', 'memory')
+    OCR_TEXT_CACHE_TTL = int(os.getenv('OCR_TEXT_CACHE_TTL', 604800))  # 7 gün
+    OCR_TEXT_CACHE_DIR = os.getenv('OCR_TEXT_CACHE_DIR', os.path.join(TEMP_FOLDER, 'ocr_text_cache'))
+    OCR_TEXT_CACHE_DISK_MB = int(os.getenv('OCR_TEXT_CACHE_DISK_MB', 512))
+    # Tek doküman + N aday isim işinde izin verilen en fazla aday sayısı
+    OCR_MULTI_NAME_MAX_CANDIDATES = int(os.getenv('OCR_MULTI_NAME_MAX_CANDIDATES', 50))
+    # Batch submit'te aynı PDF'i paylaşan işleri tek çoklu isim işine grupla (isteğe bağlı;
+    # istekte group_by_pdf ile ezilebilir). Kapalıyken her istek kendi job'ını alır
+    OCR_BATCH_GROUP_BY_PDF = os.getenv('OCR_BATCH_GROUP_BY_PDF', 'False').lower() == 'true'
+    # İsim verilmeden hasta tespiti için roster (UTF-8, satır başına bir isim)
+    OCR_ROSTER_PATH = os.getenv('OCR_ROSTER_PATH', '')
+    OCR_ROSTER_MAX_RESULTS = int(os.getenv('OCR_ROSTER_MAX_RESULTS', 20))
+    OCR_ROSTER_MIN_LEVEL = os.getenv('OCR_ROSTER_MIN_LEVEL', 'pair')  # full / n-1 / pair / single
+    # Sigorta şirketi tespit tablosu: builtin, file (JSON) veya database (insurance_company_alias)
+    # Kaynak OCR_INSURER_RELOAD_INTERVAL saniyede bir kontrol edilir, değiştiyse yeniden derlenir
+    OCR_INSURER_SOURCE = os.getenv('OCR_INSURER_SOURCE', 'builtin')
+    OCR_INSURER_TABLE_PATH = os.getenv('OCR_INSURER_TABLE_PATH', './config/insurers.json')
+    OCR_INSURER_RELOAD_INTERVAL = int(os.getenv('OCR_INSURER_RELOAD_INTERVAL', 60))
+    # Şirket adı ile 'sigorta' kelimesi arasındaki en fazla karakter (puan uzaklıkla azalır)
+    OCR_INSURER_PROXIMITY_WINDOW = int(os.getenv('OCR_INSURER_PROXIMITY_WINDOW', 50))
+    OCR_INSURER_MIN_SCORE = float(os.getenv('OCR_INSURER_MIN_SCORE', 0.5))
 
     # ============ PERFORMANS AYARLARI ============
     # Sistem performans parametreleri
     WORKER_THREADS = int(os.getenv('WORKER_THREADS', 4))
     WORKER_TIMEOUT = int(os.getenv('WORKER_TIMEOUT', 300))
+    # Prefork supervisor: worker N job sonra / RSS sınırını aşınca yeniden başlatılır (0 = sınırsız)
+    WORKER_MAX_JOBS = int(os.getenv('WORKER_MAX_JOBS', 500))
+    WORKER_MAX_RSS_MB = int(os.getenv('WORKER_MAX_RSS_MB', 1536))
+    WORKER_RESTART_BACKOFF_MAX = float(os.getenv('WORKER_RESTART_BACKOFF_MAX', 30))
+    WORKER_MIN_UPTIME = float(os.getenv('WORKER_MIN_UPTIME', 10))  # daha kısa ömür = crash loop, backoff artar
+    WORKER_STATUS_INTERVAL = int(os.getenv('WORKER_STATUS_INTERVAL', 30))
+    WORKER_SHUTDOWN_TIMEOUT = int(os.getenv('WORKER_SHUTDOWN_TIMEOUT', 60))
     QUEUE_MAX_SIZE = int(os.getenv('QUEUE_MAX_SIZE', 300))
+    BATCH_VALIDATION_WORKERS = int(os.getenv('BATCH_VALIDATION_WORKERS', 16))  # submit-batch dosya doğrulama thread'leri
+    # Boş queue'de worker Redis'te bu kadar saniye bloklanır (yeni job bildirimiyle hemen uyanır)
+    QUEUE_BLOCK_TIMEOUT = int(os.getenv('QUEUE_BLOCK_TIMEOUT', 5))
+    # Processing job lease'i: worker QUEUE_HEARTBEAT_INTERVAL'da bir uzatır; uzatılmayan (ölü / donmuş
+    # worker) job'lar QUEUE_REAP_INTERVAL'da bir çalışan reaper ile pending'e döner
+    QUEUE_LEASE_SECONDS = int(os.getenv('QUEUE_LEASE_SECONDS', 60))
+    QUEUE_HEARTBEAT_INTERVAL = float(os.getenv('QUEUE_HEARTBEAT_INTERVAL', 15))
+    QUEUE_REAP_INTERVAL = float(os.getenv('QUEUE_REAP_INTERVAL', 30))
+    # Biten (completed / failed) job'lar bu kadar saniye sonra Redis'ten kendiliğinden silinir (0 = süresiz)
+    QUEUE_JOB_TTL = int(os.getenv('QUEUE_JOB_TTL', 604800))  # 7 gün
+    QUEUE_CLEANUP_INTERVAL = float(os.getenv('QUEUE_CLEANUP_INTERVAL', 3600))  # kalan temizliği (SCAN)
+    QUEUE_PICKUP_SAMPLES = int(os.getenv('QUEUE_PICKUP_SAMPLES', 1000))  # bekleme yüzdelikleri için son N örnek
+    # Bekleyen job bu kadar saniyede bir priority seviyesi öne geçer (0 = yaşlandırma yok, kesin priority)
+    QUEUE_PRIORITY_AGING_SECONDS = float(os.getenv('QUEUE_PRIORITY_AGING_SECONDS', 300))
     CACHE_TTL = int(os.getenv('CACHE_TTL', 86400))  # 24 saat
+    # Tamamlanmış sonuç cache'i (L1 süreç içi, L2 Redis CACHE_TTL ile, L3 Postgres)
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'True').lower() == 'true'
+    RESULT_CACHE_L1_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_L1_MAX_ENTRIES', 2048))
+    RESULT_CACHE_L1_TTL = int(os.getenv('RESULT_CACHE_L1_TTL', 300))
+    # Eşzamanlı aynı (doküman, isim) isteklerinde tek OCR (lider), diğerleri sonucu bekler
+    SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'True').lower() == 'true'
+    # Lider çalışırken lease süresinin üçte birinde bir yenilenir; bu süre düşen liderin fark edilme süresidir
+    SINGLE_FLIGHT_LEASE_SECONDS = int(os.getenv('SINGLE_FLIGHT_LEASE_SECONDS', 180))
+    SINGLE_FLIGHT_WAIT_SECONDS = int(os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', 120))
+    SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv('SINGLE_FLIGHT_POLL_INTERVAL', 0.5))
 
     # ============ GÜVENLİK AYARLARI ============
     # Güvenlik ve CORS konfigürasyonları
@@ -143,6 +237,31 @@ class Config:
         else:
             return f"storage://{cls.REDIS_HOST}:{cls.REDIS_PORT}/{cls.REDIS_DB}"
 
+    @classmethod
+    def get_ocr_roi_bands(cls) -> list:
+        """
+        ROI bant oranlarını listeye çevir
+
+        DÖNEN DEĞER:
+            list: Sırayla denenecek bant oranları, her zaman 1.0 (tam sayfa) ile biter
+
+        ÖRNEK:
+            OCR_ROI_BANDS=0.3,0.6  ->  [0.3, 0.6, 1.0]
+        """
+        bands = []
+        for part in cls.OCR_ROI_BANDS.split(','):
+            try:
+                ratio = float(part)
+            except ValueError:
+                continue
+            if 0 < ratio <= 1.0 and ratio not in bands:
+                bands.append(ratio)
+
+        if not bands or bands[-1] != 1.0:
+            bands = [ratio for ratio in bands if ratio != 1.0] + [1.0]
+
+        return bands
+
     @classmethod
     def validate_config(cls) -> bool:
         """
@@ -0,0 +1,102 @@
+"""
+DOSYA: utils/file_fingerprint.py
+AMAÇ: PDF dosyalarının içerik parmak izi (duplicate tespiti için)
+
+AÇIKLAMA:
+- Dosya içeriği parça parça (tek tampon, kopyasız) BLAKE2b ile hash'lenir
+- Parmak izi = boyut + hash; aynı tarama farklı klasöre kopyalansa da aynı kalır,
+  yerinde üzerine yazılırsa değişir
+- Aynı süreçte (yol, boyut, mtime) değişmediyse hash tekrar hesaplanmaz
+- Submit anında hesaplanan parmak izi, dosya değişmediyse worker'da tekrar kullanılır
+
+KULLANIM:
+    from App.utils.file_fingerprint import get_file_fingerprint
+    info = get_file_fingerprint('/path/file.pdf')
+    info['fingerprint']  # 'b2-<boyut>-<hash>'
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+MEMO_MAX_ENTRIES = 4096
+
+_memo = OrderedDict()  # ((cihaz, inode) / realpath, size, mtime_ns) -> fingerprint
+_memo_lock = threading.Lock()
+
+
+def compute_file_fingerprint(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Dosya içeriğinin parmak izini hesapla (stat'a bakmadan)
+
+    DÖNEN DEĞER:
+        str: 'b2-<boyut>-<blake2b hex>'
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+
+    with open(file_path, 'rb', buffering=0) as pdf_file:
+        while True:
+            read_count = pdf_file.readinto(buffer)
+            if not read_count:
+                break
+            digest.update(view[:read_count])
+            size += read_count
+
+    return f"b2-{size}-{digest.hexdigest()}"
+
+
+def get_file_fingerprint(file_path, known=None, stat_result=None):
+    """
+    Dosyanın parmak izini getir (değişmediyse hesaplamadan)
+
+    PARAMETRELER:
+        file_path: Dosya yolu
+        known: Daha önce hesaplanmış bilgi ({'fingerprint', 'size', 'mtime_ns'}),
+               örn. submit anında job'a yazılan. Boyut ve mtime tutuyorsa kullanılır.
+        stat_result: Çağıranın az önce aldığı os.stat sonucu (tekrar stat edilmez)
+
+    DÖNEN DEĞER:
+        dict: fingerprint, size, mtime_ns, seconds (hash süresi), source ('computed' / 'memo' / 'known')
+    """
+    start_time = time.time()
+    stat = stat_result or os.stat(file_path)
+    # Dosya kimliği (cihaz, inode); inode vermeyen dosya sistemlerinde gerçek yol (ek syscall)
+    file_identity = (stat.st_dev, stat.st_ino) if stat.st_ino else os.path.realpath(file_path)
+    memo_key = (file_identity, stat.st_size, stat.st_mtime_ns)
+
+    info = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns
+    }
+
+    if known and known.get('fingerprint') and \
+            known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns:
+        info['fingerprint'] = known['fingerprint']
+        info['source'] = 'known'
+    else:
+        with _memo_lock:
+            fingerprint = _memo.get(memo_key)
+            if fingerprint is not None:
+                _memo.move_to_end(memo_key)
+
+        if fingerprint is not None:
+            info['fingerprint'] = fingerprint
+            info['source'] = 'memo'
+        else:
+            info['fingerprint'] = compute_file_fingerprint(file_path)
+            info['source'] = 'computed'
+
+    with _memo_lock:
+        _memo[memo_key] = info['fingerprint']
+        _memo.move_to_end(memo_key)
+        while len(_memo) > MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+
+    info['seconds'] = round(time.time() - start_time, 4)
+    return info
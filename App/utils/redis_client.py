@@ -0,0 +1,98 @@
+"""
+DOSYA: utils/redis_client.py
+AMAÇ: Config'teki Redis ayarlarıyla paylaşılan Redis bağlantısı
+
+AÇIKLAMA:
+- Cache katmanları aynı bağlantı havuzunu kullanır (süreç başına tek client)
+- İlk kullanımda bağlanır; Redis yoksa None döner, çağıran taraf Redis'siz devam eder
+- Başarısız bağlantı denemesi kısa süre tekrarlanmaz (her istekte timeout beklenmez)
+- fork sonrası çocuk süreç ebeveynin soketlerini kullanmaz, kendi client'ını açar
+
+KULLANIM:
+    from App.utils.redis_client import get_redis_client
+    client = get_redis_client()
+    if client is not None:
+        client.get('anahtar')
+"""
+
+import os
+import threading
+import time
+
+from App.utils.config import Config
+
+# ============ OPTIONAL IMPORTS ============
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Başarısız bağlantıdan sonra yeniden deneme aralığı (saniye)
+RECONNECT_INTERVAL = 30
+
+_clients = {}
+_last_failure = {}
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """Çocuk süreçte paylaşılan client'ları bırak (prefork worker'lar)"""
+    global _lock
+    _lock = threading.Lock()
+    _clients.clear()
+    _last_failure.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def create_redis_client(decode_responses=True):
+    """
+    Yeni Redis client oluştur ve bağlantıyı test et
+
+    HATA:
+        Bağlanılamazsa redis.exceptions.ConnectionError
+    """
+    client = redis.Redis(
+        host=Config.REDIS_HOST,
+        port=Config.REDIS_PORT,
+        db=Config.REDIS_DB,
+        password=Config.REDIS_PASSWORD,
+        max_connections=Config.REDIS_MAX_CONNECTIONS,
+        decode_responses=decode_responses,
+        socket_connect_timeout=2
+    )
+    client.ping()
+    return client
+
+
+def get_redis_client(decode_responses=True):
+    """
+    Paylaşılan Redis client'ı getir
+
+    DÖNEN DEĞER:
+        redis.Redis veya None (redis paketi yoksa / sunucuya ulaşılamıyorsa)
+    """
+    if not REDIS_AVAILABLE:
+        return None
+
+    with _lock:
+        client = _clients.get(decode_responses)
+        if client is not None:
+            return client
+
+        if time.time() - _last_failure.get(decode_responses, 0) < RECONNECT_INTERVAL:
+            return None
+
+        try:
+            client = create_redis_client(decode_responses)
+        except Exception as e:
+            _last_failure[decode_responses] = time.time()
+            print(f"⚠️ Redis bağlantısı kurulamadı ({Config.REDIS_HOST}:{Config.REDIS_PORT}): {e}")
+            return None
+
+        _clients[decode_responses] = client
+        print(f"✅ Paylaşılan Redis bağlantısı hazır: {Config.REDIS_HOST}:{Config.REDIS_PORT}")
+        return client
@@ -0,0 +1,82 @@
+"""
+DOSYA: utils/startup_report.py
+AMAÇ: Başlatma adımlarının süre raporu
+- create_app / worker adımları ve ilk kullanımda yapılan ağır başlatmalar
+  (Tesseract kontrolü, GPU kontrolü, OCRService, queue manager) süreleriyle kaydedilir
+- Hangi bileşenin ne zaman (açılışta mı, ilk istekte mi) hazırlandığı görülür
+
+KULLANIM:
+    from App.utils.startup_report import timed_step, print_startup_report
+    with timed_step('database'):
+        setup_database(app)
+    print_startup_report('API')
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Sürecin (bu modülün ilk import'unun) başlangıcı
+PROCESS_STARTED_AT = time.time()
+_process_started_perf = time.perf_counter()
+
+_steps = []
+_lock = threading.Lock()
+
+
+def record_step(name, seconds, status='ok', detail=None):
+    """Başlatma adımını kaydet"""
+    step = {
+        'name': name,
+        'seconds': round(seconds, 4),
+        'status': status,
+        'since_start_seconds': round(time.perf_counter() - _process_started_perf, 4),
+        'thread': threading.current_thread().name
+    }
+    if detail:
+        step['detail'] = detail
+
+    with _lock:
+        _steps.append(step)
+    return step
+
+
+@contextmanager
+def timed_step(name):
+    """
+    Bloğun süresini başlatma adımı olarak kaydet
+
+    Blok hata verirse adım 'error' olarak kaydedilir ve hata yeniden fırlatılır.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_step(name, time.perf_counter() - start, 'error', str(e))
+        raise
+    record_step(name, time.perf_counter() - start)
+
+
+def get_startup_report():
+    """Kaydedilmiş adımlar ve toplam süre"""
+    with _lock:
+        steps = [dict(step) for step in _steps]
+
+    return {
+        'pid': os.getpid(),
+        'process_started_at': PROCESS_STARTED_AT,
+        'uptime_seconds': round(time.perf_counter() - _process_started_perf, 3),
+        'steps': steps,
+        'total_step_seconds': round(sum(step['seconds'] for step in steps), 4)
+    }
+
+
+def print_startup_report(title):
+    """Başlatma raporunu yazdır"""
+    report = get_startup_report()
+
+    print(f"\n⏱️ BAŞLATMA RAPORU - {title} (pid {report['pid']})")
+    for step in report['steps']:
+        icon = '✅' if step['status'] == 'ok' else '❌'
+        print(f"   {icon} {step['name']:<28} {step['seconds'] * 1000:9.1f} ms  (t+{step['since_start_seconds']:.2f}s)")
+    print(f"   Toplam: {report['total_step_seconds']:.3f}s, süreç başlangıcından beri {report['uptime_seconds']:.3f}s")
@@ -0,0 +1,62 @@
+"""
+DOSYA: tests/test_queue_claim.py
+AMAÇ: Queue claim'inin job verisini bozmadan almasını doğrula
+
+Redis gerekmez: fakeredis (+ Lua için lupa) ile çalışır, yoksa test atlanır.
+
+KULLANIM:
+    pytest tests/test_queue_claim.py
+"""
+
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+pytest.importorskip('lupa')
+
+from App.services.redis_queue_module import redis_queue
+from App.services.redis_queue_module.job_models import OCRJob, JobStatus
+
+
+@pytest.fixture
+def queue_manager(monkeypatch):
+    server = fakeredis.FakeServer()
+
+    def fake_redis(host=None, port=None, db=None, **kwargs):
+        return fakeredis.FakeRedis(server=server, **kwargs)
+
+    monkeypatch.setattr(redis_queue.redis, 'Redis', fake_redis)
+    return redis_queue.RedisQueueManager(queue_prefix='test_ocr', job_prefix='test_ocr:job:')
+
+
+def test_claim_keeps_file_fingerprint_byte_identical(queue_manager):
+    # mtime_ns double'a sığmaz (~1.7e18): blob Lua cjson ile yeniden yazılırsa yuvarlanır
+    file_fingerprint = {'fingerprint': 'b2-11-abc', 'size': 11, 'mtime_ns': 1760658765123456789}
+    queue_manager.add_job(OCRJob('a.pdf', 'Ahmet Yılmaz', file_fingerprint=file_fingerprint))
+
+    job = queue_manager.claim_job('worker_1')
+    stored = queue_manager.get_job_status(job.job_id)
+
+    assert json.dumps(job.file_fingerprint) == json.dumps(file_fingerprint)
+    assert json.dumps(stored.file_fingerprint) == json.dumps(file_fingerprint)
+    assert stored.status == JobStatus.PROCESSING
+    assert stored.worker_id == 'worker_1'
+    assert queue_manager.extend_lease(job.job_id, 'worker_1')
+
+
+def test_claim_without_recorded_fields_is_requeued_by_reaper(queue_manager, monkeypatch):
+    queue_manager.lease_seconds = 0
+    queue_manager.add_job(OCRJob('b.pdf', 'Ayşe Demir'))
+
+    # Worker Lua claim'inden sonra, claim alanlarını yazmadan düşer
+    monkeypatch.setattr(queue_manager, '_record_claim', lambda job, claimed_data: True)
+    job = queue_manager.claim_job('worker_1')
+
+    reaped = queue_manager.reap_expired_jobs()
+    stored = queue_manager.get_job_status(job.job_id)
+
+    assert reaped == [{'job_id': job.job_id, 'action': 'requeued'}]
+    assert stored.status == JobStatus.PENDING
+    assert stored.retry_count == 0
+    assert queue_manager.redis_client.zcard(queue_manager.PENDING_QUEUE) == 1